@@ -1,16 +1,37 @@
 import secrets
+from contextlib import asynccontextmanager
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
-from app.routers import users, organisers, health, oauth
+from app.routers import users, organisers, health, oauth, metrics
+from app.middleware.compression import CompressionMiddleware
 from app.middleware.logging import LoggingMiddleware
+from app.middleware.metrics import MetricsMiddleware, mark_worker_dead
 
-from app.routers.usergql import schema  # Import GraphQL schema
-from strawberry.fastapi import GraphQLRouter
-app = FastAPI()
+from app.routers.usergql import schema, get_context  # Import GraphQL schema
+from app.utils.persisted_queries import PersistedQueryRouter
+from app.utils.responses import JSONResponse
+
+from app.services.service_factory import ServiceFactory
+from framework.services.executor import ExecutorSaturatedError
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pools, executors and resources are created once here and closed on shutdown.
+    await ServiceFactory.startup()
+    yield
+    await ServiceFactory.shutdown()
+    mark_worker_dead()
+
+# Responses are rendered with orjson unless a route says otherwise.
+app = FastAPI(lifespan=lifespan, default_response_class=JSONResponse)
+
+#Compression Middleware, added first so that the logged and measured latency includes compressing
+app.add_middleware(CompressionMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -27,6 +48,9 @@ app.add_middleware(LoggingMiddleware)
 secret_key = secrets.token_urlsafe(32)
 app.add_middleware(SessionMiddleware, secret_key=secret_key)
 
+#Metrics Middleware, added last so that it measures the whole middleware stack
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(users.user_router, prefix='/user')
 
 app.include_router(organisers.organiser_router, prefix='/organiser')
@@ -35,11 +59,18 @@ app.include_router(health.health_router, prefix='/health')
 
 app.include_router(oauth.oauth_router, prefix='/login')
 
-# Creates GraphQL Router
-graphql_app = GraphQLRouter(schema)
+app.include_router(metrics.metrics_router, prefix='/metrics')
+
+# Creates GraphQL Router, accepting persisted queries sent by hash
+graphql_app = PersistedQueryRouter(schema, context_getter=get_context,
+                                   persisted_queries=lambda: ServiceFactory.get_service("PersistedQueryStore"))
 # Include the GraphQL endpoint
 app.include_router(graphql_app, prefix="/GQL/getuser", tags=["GraphQL"])
 
+@app.exception_handler(ExecutorSaturatedError)
+async def executor_saturated_handler(request: Request, exc: ExecutorSaturatedError):
+    return JSONResponse(content={'status': 'service unavailable', 'error': str(exc)}, status_code=503)
+
 @app.get("/")
 async def root():
     return {"message": "Hello from the User Management Microservice!"}
@@ -0,0 +1,275 @@
+import hashlib
+import os
+import zlib
+from collections import OrderedDict
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+class _Stream:
+    """
+    Incremental compressor for a streamed body. Every chunk is flushed, so the client
+    can decode each one as it arrives instead of waiting for the end of the stream.
+    """
+
+    def __init__(self, process, flush, finish):
+        self._process = process
+        self._flush = flush
+        self.finish = finish
+
+    def compress(self, data: bytes) -> bytes:
+        return self._process(data) + self._flush()
+
+
+def _gzip_stream(level: int) -> _Stream:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return _Stream(compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush)
+
+
+def _brotli_stream(quality: int) -> _Stream:
+    compressor = brotli.Compressor(quality=quality)
+    return _Stream(compressor.process, compressor.flush, compressor.finish)
+
+
+def _zstd_stream(level: int) -> _Stream:
+    compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    return _Stream(compressor.compress, lambda: compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+                   compressor.flush)
+
+
+def negotiate(accept_encoding: str, encodings) -> str:
+    """
+    Picks the content coding for a response from an Accept-Encoding header value.
+    :param encodings: Supported codings, most preferred first; ties in the client's
+        q-values are broken by this order.
+    :return: The chosen coding, or None to send the body as it is.
+    """
+    weights = {}
+    for entry in accept_encoding.split(","):
+        name, _, params = entry.strip().partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in encodings:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    return media_type.startswith("text/") or media_type.endswith(("json", "xml", "javascript"))
+
+
+class CompressedBodyCache:
+    """
+    An LRU cache of compressed response bodies, bounded by their total size. The
+    middleware keys bodies by what identifies a representation without reading it:
+    URL, strong ETag, content coding and the request headers the response varies on.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        # One body may take at most a quarter of the cache, so one export cannot evict everything else.
+        self.max_entry_bytes = max_bytes // 4
+        self._entries = OrderedDict()
+        self._size = 0
+        self._stats = {"hits": 0, "misses": 0}
+
+    def get(self, key: tuple) -> bytes:
+        body = self._entries.get(key)
+        if body is None:
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return body
+
+    def put(self, key: tuple, body: bytes):
+        if len(body) > self.max_entry_bytes or key in self._entries:
+            return
+        self._entries[key] = body
+        self._size += len(body)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def stats(self) -> dict:
+        snapshot = dict(self._stats, entries=len(self._entries), bytes=self._size)
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_ratio"] = round(snapshot["hits"] / lookups, 4) if lookups else 0.0
+        return snapshot
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware that compresses response bodies with zstd, brotli or gzip,
+    whichever the client's Accept-Encoding prefers; zstd and brotli are offered only
+    when the optional `zstandard` and `brotli` packages are installed.
+
+    Only text, JSON and XML bodies are compressed, and only
+    when they are at least `minimum_size` bytes (COMPRESSION_MINIMUM_SIZE). Streamed
+    responses, such as the exports, are compressed chunk by chunk as they are sent.
+    Complete bodies are compressed in one go. Those of GET responses with a strong
+    ETag, and without `Cache-Control: no-store`, are kept compressed in a
+    CompressedBodyCache of `cache_bytes` (COMPRESSION_CACHE_BYTES, 0 disables it);
+    other responses are unlikely to repeat and are never hashed or cached.
+
+    A compressed response gets `Vary: Accept-Encoding`, and a strong ETag on it is
+    made weak: the bytes differ from the identity representation, but the route's
+    If-None-Match check still matches the tag, since it uses weak comparison.
+    """
+
+    def __init__(self, app, minimum_size: int = None, cache_bytes: int = None,
+                 gzip_level: int = None, brotli_quality: int = None, zstd_level: int = None):
+        self.app = app
+        self.minimum_size = int(os.getenv("COMPRESSION_MINIMUM_SIZE", 1024)) if minimum_size is None \
+            else minimum_size
+        cache_bytes = int(os.getenv("COMPRESSION_CACHE_BYTES", 16 * 1024 * 1024)) if cache_bytes is None \
+            else cache_bytes
+        self.cache = CompressedBodyCache(cache_bytes) if cache_bytes > 0 else None
+
+        gzip_level = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6)) if gzip_level is None else gzip_level
+        # Brotli's default quality (11) is meant for static assets and far too slow per request.
+        brotli_quality = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4)) if brotli_quality is None \
+            else brotli_quality
+        zstd_level = int(os.getenv("COMPRESSION_ZSTD_LEVEL", 3)) if zstd_level is None else zstd_level
+
+        # {coding: (compress(body) -> bytes, stream() -> _Stream)}, most preferred first.
+        self.codecs = {}
+        if zstandard is not None:
+            compressor = zstandard.ZstdCompressor(level=zstd_level)
+            self.codecs["zstd"] = (compressor.compress, lambda: _zstd_stream(zstd_level))
+        if brotli is not None:
+            self.codecs["br"] = (lambda body: brotli.compress(body, quality=brotli_quality),
+                                 lambda: _brotli_stream(brotli_quality))
+        self.codecs["gzip"] = (lambda body: zlib.compress(body, gzip_level, wbits=31),
+                               lambda: _gzip_stream(gzip_level))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        accept_encoding = request_headers.get("accept-encoding")
+        encoding = negotiate(accept_encoding, self.codecs) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        compress, stream_factory = self.codecs[encoding]
+        start = None
+        stream = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, stream, passthrough
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows whether to compress.
+                start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                if start is not None and not passthrough:
+                    passthrough = True
+                    await send(start)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if stream is not None:
+                body = stream.compress(body)
+                if not more_body:
+                    body += stream.finish()
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            if not self._should_compress(start["status"], headers) or \
+                    (not more_body and len(body) < self.minimum_size):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            # Taken before the ETag and Vary headers are changed for the compressed body.
+            cache_key = self._cache_key(scope, request_headers, encoding, start["status"], headers) \
+                if self.cache is not None and not more_body else None
+
+            headers["Content-Encoding"] = encoding
+            vary = headers.get("Vary")
+            if not vary:
+                headers["Vary"] = "Accept-Encoding"
+            elif "accept-encoding" not in vary.lower():
+                headers["Vary"] = f"{vary}, Accept-Encoding"
+            etag = headers.get("ETag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+
+            if more_body:
+                del headers["Content-Length"]
+                stream = stream_factory()
+                await send(start)
+                await send({"type": "http.response.body", "body": stream.compress(body), "more_body": True})
+                return
+
+            compressed = self.cache.get(cache_key) if cache_key is not None else None
+            if compressed is None:
+                compressed = compress(body)
+                if cache_key is not None:
+                    self.cache.put(cache_key, compressed)
+
+            headers["Content-Length"] = str(len(compressed))
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _cache_key(scope, request_headers: Headers, encoding: str, status: int, headers: MutableHeaders):
+        """
+        :return: The cache key of a response's compressed body, or None if it must not be cached.
+        """
+        etag = headers.get("etag")
+        if scope.get("method") != "GET" or status != 200 or not etag or etag.startswith("W/"):
+            return None
+        if "no-store" in headers.get("cache-control", "").lower():
+            return None
+        # A version ETag such as "3" is only unique per URL and caller, so the request
+        # headers the response varies on (e.g. Authorization) are part of the key. Only
+        # their digest is kept, so that bearer tokens do not linger in the cache.
+        varies = [name.strip().lower() for name in headers.get("vary", "").split(",") if name.strip()]
+        if "*" in varies:
+            return None
+        varied = repr(tuple(request_headers.get(name) for name in varies if name != "accept-encoding"))
+        return (encoding, scope["path"], scope.get("query_string", b""), etag,
+                hashlib.sha256(varied.encode()).digest())
+
+    @staticmethod
+    def _should_compress(status: int, headers: MutableHeaders) -> bool:
+        if status < 200 or status in (204, 206, 304) or "content-encoding" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", "").lower():
+            return False
+        return is_compressible(headers.get("content-type", ""))
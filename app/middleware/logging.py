@@ -1,48 +1,128 @@
+import atexit
+import json
 import logging
+import os
+import queue
+import random
+import sys
 import time
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 
-#Configuring the logger
+# Attributes every LogRecord has; anything else on a record was passed through `extra`.
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a record as one JSON object per line. Fields passed with `extra=` are
+    added to the object as they are.
+    """
+
+    def format(self, record):
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+#Configuring the logger. Records are put on a queue and written by a listener
+#thread, so the event loop never blocks on the output stream.
 logger = logging.getLogger("microservice_logger")
 logger.setLevel(logging.INFO)
+logger.propagate = False
 
-#Creating handlers
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
+if not logger.handlers:
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(JsonFormatter())
 
-#Creating formatters and adding them to handlers
-formatter = logging.Formatter(
-    "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
-console_handler.setFormatter(formatter)
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
 
-#Adding handlers to the logger
-if not logger.handlers:
-    logger.addHandler(console_handler)
+    listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        method = request.method
-        url = request.url.path
-        client_host = request.client.host
 
-        logger.info(f"Incoming request: {method} {url} from {client_host}")
+class LoggingMiddleware:
+    """
+    Pure ASGI middleware that writes one structured record per request, with the
+    method, route, status, duration and a request ID. The request ID is taken from
+    the X-Request-ID header when the client sends one, echoed in the response and
+    stored in `request.state.request_id`.
 
-        try:
-            response: Response = await call_next(request)
-        except Exception as e:
-            logger.error(f"Error processing request: {e}")
-            raise e
+    Successful requests are sampled at `sample_rate` (LOG_SAMPLE_RATE); client
+    errors, server errors and requests slower than `slow_request_ms`
+    (LOG_SLOW_REQUEST_MS) are always logged.
+    """
+
+    def __init__(self, app, sample_rate: float = None, slow_request_ms: float = None):
+        self.app = app
+        self.sample_rate = float(os.getenv("LOG_SAMPLE_RATE", 1.0)) if sample_rate is None else sample_rate
+        self.slow_request_ms = float(os.getenv("LOG_SLOW_REQUEST_MS", 1000)) \
+            if slow_request_ms is None else slow_request_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        process_time = (time.time() - start_time) * 1000 
-        status_code = response.status_code
+        started = time.perf_counter()
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:128]
+                break
+        if not request_id:
+            request_id = uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
 
-        logger.info(
-            f"Response: {status_code} for {method} {url} in {process_time:.2f}ms"
-        )
+        status_code = 500
 
-        return response
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        error = None
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if error is not None or status_code >= 400 or duration_ms >= self.slow_request_ms \
+                    or self.sample_rate >= 1 or random.random() < self.sample_rate:
+                self._log(scope, request_id, status_code, duration_ms, error)
 
+    @staticmethod
+    def _log(scope, request_id, status_code, duration_ms, error):
+        route = scope.get("route")
+        client = scope.get("client")
+        fields = {
+            "request_id": request_id,
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": getattr(route, "path", None),
+            "status": status_code,
+            "duration_ms": round(duration_ms, 2),
+            "client": client[0] if client else None,
+        }
+        if error is not None:
+            logger.error(f"Error processing request: {error}", extra=fields)
+        elif status_code >= 500:
+            logger.error("request", extra=fields)
+        else:
+            logger.info("request", extra=fields)
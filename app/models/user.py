@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from pydantic import BaseModel, constr, EmailStr
 
 
@@ -25,3 +27,18 @@ class User(BaseModel):
             }
         }
         orm_mode = True
+
+
+class UserPatch(BaseModel):
+    """
+    The fields of a user that a PATCH may change. UID and Email identify the user
+    and cannot be patched. Only the fields that are sent are written.
+    """
+    Name: Optional[str] = None
+    Pic_URL: Optional[str] = None
+    PhoneNo: Optional[str] = None
+    Address: Optional[str] = None
+    Age: Optional[int] = None
+
+    class Config:
+        extra = "forbid"
@@ -1,8 +1,12 @@
+import os
 from typing import Any
 
 from app.models.organiser import Organiser
 from app.services.service_factory import ServiceFactory
-from framework.resources.base_resource import BaseResource
+from framework.resources.base_resource import BaseResource, AsyncBaseResource, order_by_keys, \
+    decode_cursor, paginate
+from framework.resources.cached_resource import CachedResource
+from framework.resources.executor_resource import ExecutorResource
 
 
 class OrganiserResource(BaseResource):
@@ -14,6 +18,8 @@ class OrganiserResource(BaseResource):
         self.database = "ORGANISER"
         self.collection = "org_tab"
         self.key_field="OID"
+        self.version_field = os.getenv("VERSION_FIELD") or None
+        self.data_service.tag_resource(self.database, self.collection, "OrganiserResource")
 
     def get_by_key(self, key: str) -> Organiser:
 
@@ -35,6 +41,37 @@ class OrganiserResource(BaseResource):
 
         return result
 
+    def get_by_keys(self, keys: list) -> dict:
+
+        d_service = self.data_service
+
+        result = d_service.get_data_objects(
+            self.database, self.collection, key_field=self.key_field, key_values=list(dict.fromkeys(keys))
+        )
+
+        return order_by_keys(result, self.key_field, keys)
+
+    def list_data(self, limit: int, cursor: str = None) -> dict:
+
+        d_service = self.data_service
+
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            return {"status": "bad request", "error": str(e)}
+
+        result = d_service.list_data_objects(
+            self.database, self.collection, key_field=self.key_field, limit=limit, after=after
+        )
+
+        return paginate(result)
+
+    def stream_data(self):
+
+        d_service = self.data_service
+
+        return d_service.stream_data_objects(self.database, self.collection, key_field=self.key_field)
+
     def insert_data(self, organiser: Organiser):
 
         d_service = self.data_service
@@ -45,11 +82,35 @@ class OrganiserResource(BaseResource):
 
         return result
 
-    def modify_data(self, organiser: Organiser):
+    def bulk_insert_data(self, organisers: list):
+
         d_service = self.data_service
 
-        result = d_service.modify_data_object(
-            self.database, self.collection, organiser, self.key_field, organiser.OID
+        result = d_service.insert_data_objects(
+            self.database, self.collection, organisers
+        )
+
+        return result
+
+    def modify_data(self, organiser: Organiser, expected_version: int = None):
+
+        d_service = self.data_service
+
+        result = d_service.update_data_object(
+            self.database, self.collection, self.key_field, organiser.OID, organiser.model_dump(),
+            self.version_field, expected_version
+        )
+
+        return result
+
+    def patch_data_by_custom_key(self, custom_key: str, value: Any, changes: dict,
+                                expected_version: int = None):
+
+        d_service = self.data_service
+
+        result = d_service.update_data_object(
+            self.database, self.collection, custom_key, value, changes,
+            self.version_field, expected_version
         )
 
         return result
@@ -72,3 +133,152 @@ class OrganiserResource(BaseResource):
         )
 
         return result
+
+
+class AsyncOrganiserResource(AsyncBaseResource):
+
+    def __init__(self, config):
+        super().__init__(config)
+
+        self.data_service = ServiceFactory.get_service("AsyncUserResourceDataService") # We are using the same service for users and organisers
+        self.database = "ORGANISER"
+        self.collection = "org_tab"
+        self.key_field="OID"
+        self.version_field = os.getenv("VERSION_FIELD") or None
+        self.data_service.tag_resource(self.database, self.collection, "OrganiserResource")
+
+    async def get_by_key(self, key: str) -> Organiser:
+
+        d_service = self.data_service
+
+        result = await d_service.get_data_object(
+            self.database, self.collection, key_field=self.key_field, key_value=key
+        )
+
+        return result
+
+    async def get_by_custom_key(self, custom_key: str, value: Any) -> Organiser:
+
+        d_service = self.data_service
+
+        result = await d_service.get_data_object(
+            self.database, self.collection, key_field=custom_key, key_value=value
+        )
+
+        return result
+
+    async def get_by_keys(self, keys: list) -> dict:
+
+        d_service = self.data_service
+
+        result = await d_service.get_data_objects(
+            self.database, self.collection, key_field=self.key_field, key_values=list(dict.fromkeys(keys))
+        )
+
+        return order_by_keys(result, self.key_field, keys)
+
+    async def list_data(self, limit: int, cursor: str = None) -> dict:
+
+        d_service = self.data_service
+
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            return {"status": "bad request", "error": str(e)}
+
+        result = await d_service.list_data_objects(
+            self.database, self.collection, key_field=self.key_field, limit=limit, after=after
+        )
+
+        return paginate(result)
+
+    def stream_data(self):
+
+        d_service = self.data_service
+
+        return d_service.stream_data_objects(self.database, self.collection, key_field=self.key_field)
+
+    async def insert_data(self, organiser: Organiser):
+
+        d_service = self.data_service
+
+        result = await d_service.insert_data_object(
+            self.database, self.collection, organiser
+        )
+
+        return result
+
+    async def bulk_insert_data(self, organisers: list):
+
+        d_service = self.data_service
+
+        result = await d_service.insert_data_objects(
+            self.database, self.collection, organisers
+        )
+
+        return result
+
+    async def modify_data(self, organiser: Organiser, expected_version: int = None):
+
+        d_service = self.data_service
+
+        result = await d_service.update_data_object(
+            self.database, self.collection, self.key_field, organiser.OID, organiser.model_dump(),
+            self.version_field, expected_version
+        )
+
+        return result
+
+    async def patch_data_by_custom_key(self, custom_key: str, value: Any, changes: dict,
+                                      expected_version: int = None):
+
+        d_service = self.data_service
+
+        result = await d_service.update_data_object(
+            self.database, self.collection, custom_key, value, changes,
+            self.version_field, expected_version
+        )
+
+        return result
+
+    async def delete_data_by_key(self, organiser_id: str):
+
+        d_service = self.data_service
+
+        result = await d_service.delete_data_object(
+            self.database, self.collection, self.key_field, organiser_id
+        )
+
+        return result
+
+    async def delete_data_by_custom_key(self, custom_key: str, value: Any) -> Organiser:
+
+        d_service = self.data_service
+
+        result = await d_service.delete_data_object(
+            self.database, self.collection, key_field=custom_key, key_value=value
+        )
+
+        return result
+
+
+def create_organiser_resource(config=None) -> AsyncBaseResource:
+    """
+    Builds the organiser resource for the configured data access mode. "async" (default)
+    uses the aiomysql backend, "threadpool" runs the synchronous resource on the
+    bounded data access executor. Unless PROFILE_CACHE_BACKEND is "none", lookups by
+    key and Email are served through the shared profile cache. Writes invalidate it
+    only in this process: with several workers, set PROFILE_CACHE_BACKEND to "redis",
+    or keep PROFILE_CACHE_TTL short, or other workers serve stale profiles until expiry.
+    """
+    if os.getenv("DATA_ACCESS_MODE", "async").lower() == "threadpool":
+        resource = ExecutorResource(OrganiserResource(config), ServiceFactory.get_service("DataAccessExecutor"))
+    else:
+        resource = AsyncOrganiserResource(config)
+
+    if os.getenv("PROFILE_CACHE_BACKEND", "memory").lower() == "none":
+        return resource
+    return CachedResource(resource, ServiceFactory.get_service("ProfileCache"),
+                          indexed_fields=("Email",),
+                          ttl=float(os.getenv("PROFILE_CACHE_TTL", 300)),
+                          negative_ttl=float(os.getenv("PROFILE_CACHE_NEGATIVE_TTL", 0)))
@@ -1,6 +1,10 @@
+import os
 from typing import Any
 
-from framework.resources.base_resource import BaseResource
+from framework.resources.base_resource import BaseResource, AsyncBaseResource, order_by_keys, \
+    decode_cursor, paginate
+from framework.resources.cached_resource import CachedResource
+from framework.resources.executor_resource import ExecutorResource
 
 from app.models.user import User
 from app.services.service_factory import ServiceFactory
@@ -14,6 +18,8 @@ class UserResource(BaseResource):
         self.database = "USER"
         self.collection = "user_tab"
         self.key_field="UID"
+        self.version_field = os.getenv("VERSION_FIELD") or None
+        self.data_service.tag_resource(self.database, self.collection, "UserResource")
 
     def get_by_key(self, key: str) -> User:
 
@@ -35,6 +41,37 @@ class UserResource(BaseResource):
 
         return result
 
+    def get_by_keys(self, keys: list) -> dict:
+
+        d_service = self.data_service
+
+        result = d_service.get_data_objects(
+            self.database, self.collection, key_field=self.key_field, key_values=list(dict.fromkeys(keys))
+        )
+
+        return order_by_keys(result, self.key_field, keys)
+
+    def list_data(self, limit: int, cursor: str = None) -> dict:
+
+        d_service = self.data_service
+
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            return {"status": "bad request", "error": str(e)}
+
+        result = d_service.list_data_objects(
+            self.database, self.collection, key_field=self.key_field, limit=limit, after=after
+        )
+
+        return paginate(result)
+
+    def stream_data(self):
+
+        d_service = self.data_service
+
+        return d_service.stream_data_objects(self.database, self.collection, key_field=self.key_field)
+
     def insert_data(self, user: User):
 
         d_service = self.data_service
@@ -45,12 +82,35 @@ class UserResource(BaseResource):
 
         return result
 
-    def modify_data(self, user: User):
+    def bulk_insert_data(self, users: list):
+
+        d_service = self.data_service
+
+        result = d_service.insert_data_objects(
+            self.database, self.collection, users
+        )
+
+        return result
+
+    def modify_data(self, user: User, expected_version: int = None):
+
+        d_service = self.data_service
+
+        result = d_service.update_data_object(
+            self.database, self.collection, self.key_field, user.UID, user.model_dump(),
+            self.version_field, expected_version
+        )
+
+        return result
+
+    def patch_data_by_custom_key(self, custom_key: str, value: Any, changes: dict,
+                                expected_version: int = None):
 
         d_service = self.data_service
 
-        result = d_service.modify_data_object(
-            self.database, self.collection, user, self.key_field, user.UID
+        result = d_service.update_data_object(
+            self.database, self.collection, custom_key, value, changes,
+            self.version_field, expected_version
         )
 
         return result
@@ -74,3 +134,152 @@ class UserResource(BaseResource):
         )
 
         return result
+
+
+class AsyncUserResource(AsyncBaseResource):
+
+    def __init__(self, config):
+        super().__init__(config)
+
+        self.data_service = ServiceFactory.get_service("AsyncUserResourceDataService")
+        self.database = "USER"
+        self.collection = "user_tab"
+        self.key_field="UID"
+        self.version_field = os.getenv("VERSION_FIELD") or None
+        self.data_service.tag_resource(self.database, self.collection, "UserResource")
+
+    async def get_by_key(self, key: str) -> User:
+
+        d_service = self.data_service
+
+        result = await d_service.get_data_object(
+            self.database, self.collection, key_field=self.key_field, key_value=key
+        )
+
+        return result
+
+    async def get_by_custom_key(self, custom_key: str, value: Any) -> User:
+
+        d_service = self.data_service
+
+        result = await d_service.get_data_object(
+            self.database, self.collection, key_field=custom_key, key_value=value
+        )
+
+        return result
+
+    async def get_by_keys(self, keys: list) -> dict:
+
+        d_service = self.data_service
+
+        result = await d_service.get_data_objects(
+            self.database, self.collection, key_field=self.key_field, key_values=list(dict.fromkeys(keys))
+        )
+
+        return order_by_keys(result, self.key_field, keys)
+
+    async def list_data(self, limit: int, cursor: str = None) -> dict:
+
+        d_service = self.data_service
+
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            return {"status": "bad request", "error": str(e)}
+
+        result = await d_service.list_data_objects(
+            self.database, self.collection, key_field=self.key_field, limit=limit, after=after
+        )
+
+        return paginate(result)
+
+    def stream_data(self):
+
+        d_service = self.data_service
+
+        return d_service.stream_data_objects(self.database, self.collection, key_field=self.key_field)
+
+    async def insert_data(self, user: User):
+
+        d_service = self.data_service
+
+        result = await d_service.insert_data_object(
+            self.database, self.collection, user
+        )
+
+        return result
+
+    async def bulk_insert_data(self, users: list):
+
+        d_service = self.data_service
+
+        result = await d_service.insert_data_objects(
+            self.database, self.collection, users
+        )
+
+        return result
+
+    async def modify_data(self, user: User, expected_version: int = None):
+
+        d_service = self.data_service
+
+        result = await d_service.update_data_object(
+            self.database, self.collection, self.key_field, user.UID, user.model_dump(),
+            self.version_field, expected_version
+        )
+
+        return result
+
+    async def patch_data_by_custom_key(self, custom_key: str, value: Any, changes: dict,
+                                      expected_version: int = None):
+
+        d_service = self.data_service
+
+        result = await d_service.update_data_object(
+            self.database, self.collection, custom_key, value, changes,
+            self.version_field, expected_version
+        )
+
+        return result
+
+    async def delete_data_by_key(self, user_id: str):
+
+        d_service = self.data_service
+
+        result = await d_service.delete_data_object(
+            self.database, self.collection, self.key_field, user_id
+        )
+
+        return result
+
+    async def delete_data_by_custom_key(self, custom_key: str, value: Any) -> User:
+
+        d_service = self.data_service
+
+        result = await d_service.delete_data_object(
+            self.database, self.collection, key_field=custom_key, key_value=value
+        )
+
+        return result
+
+
+def create_user_resource(config=None) -> AsyncBaseResource:
+    """
+    Builds the user resource for the configured data access mode. "async" (default)
+    uses the aiomysql backend, "threadpool" runs the synchronous resource on the
+    bounded data access executor. Unless PROFILE_CACHE_BACKEND is "none", lookups by
+    key and Email are served through the shared profile cache. Writes invalidate it
+    only in this process: with several workers, set PROFILE_CACHE_BACKEND to "redis",
+    or keep PROFILE_CACHE_TTL short, or other workers serve stale profiles until expiry.
+    """
+    if os.getenv("DATA_ACCESS_MODE", "async").lower() == "threadpool":
+        resource = ExecutorResource(UserResource(config), ServiceFactory.get_service("DataAccessExecutor"))
+    else:
+        resource = AsyncUserResource(config)
+
+    if os.getenv("PROFILE_CACHE_BACKEND", "memory").lower() == "none":
+        return resource
+    return CachedResource(resource, ServiceFactory.get_service("ProfileCache"),
+                          indexed_fields=("Email",),
+                          ttl=float(os.getenv("PROFILE_CACHE_TTL", 300)),
+                          negative_ttl=float(os.getenv("PROFILE_CACHE_NEGATIVE_TTL", 0)))
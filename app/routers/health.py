@@ -1,24 +1,36 @@
-from fastapi import APIRouter
-from starlette.responses import JSONResponse
+from fastapi import APIRouter, Depends
 
-from app.resources.organiser_resource import OrganiserResource
-from app.resources.user_resource import UserResource
-from app.services.service_factory import ServiceFactory
+from app.services.dependencies import get_connection_check, get_data_access_executor, \
+    get_user_resource, get_organiser_resource, get_readiness_probe
+from app.utils.responses import JSONResponse
+from framework.resources.base_resource import AsyncBaseResource
 
 
 health_router = APIRouter()
 
+@health_router.get("/live", tags=["health"],
+                   description="Liveness probe. Answers without touching any dependency.")
+async def liveness():
+    return JSONResponse(content={'status': 'alive'}, status_code=200)
+
+
+@health_router.get("/ready", tags=["health"],
+                   description="Readiness probe. Checks a pooled database connection with SELECT 1 and reports "
+                               "pool saturation and dependency latency. Results are cached for a short interval.")
+async def readiness(probe = Depends(get_readiness_probe)):
+    result = await probe.check()
+    return JSONResponse(content=result, status_code=200 if result['status'] == 'ready' else 503)
+
+
 @health_router.get("/users", tags=["health"],
                    description="This endpoint checks the health and connectivity of the User Resource database.")
-async def health_check_users():
-    # Get the database service
-    data_service = ServiceFactory.get_service("UserResourceDataService")
-    user_resource = UserResource(config = None)
+async def health_check_users(check_connection = Depends(get_connection_check),
+                             user_resource: AsyncBaseResource = Depends(get_user_resource)):
 
     # Test database connection
     try:
-        result = data_service.check_connection(user_resource.database, user_resource.collection)
-        if result['status'] == 'failed':
+        result = await check_connection(user_resource.database, user_resource.collection)
+        if result['status'] != 'connection is live':
             return JSONResponse(content=result, status_code=500)
         else:
             return JSONResponse(content=result, status_code=200)
@@ -28,17 +40,31 @@ async def health_check_users():
 
 @health_router.get("/organisers", tags=["health"],
                    description="This endpoint checks the health and connectivity of the Organiser Resource database.")
-async def health_check_organisers():
-    # Get the database service
-    data_service = ServiceFactory.get_service("UserResourceDataService")
-    organiser_resource = OrganiserResource(config = None)
+async def health_check_organisers(check_connection = Depends(get_connection_check),
+                                  organiser_resource: AsyncBaseResource = Depends(get_organiser_resource)):
 
     # Test database connection
     try:
-        result = data_service.check_connection(organiser_resource.database, organiser_resource.collection)
-        if result['status'] == 'failed':
+        result = await check_connection(organiser_resource.database, organiser_resource.collection)
+        if result['status'] != 'connection is live':
             return JSONResponse(content=result, status_code=500)
         else:
             return JSONResponse(content=result, status_code=200)
     except Exception as e:
         return JSONResponse(content = {'status': 'connection failed', 'message': str(e)}, status_code=500)
+
+
+@health_router.get("/executor", tags=["health"],
+                   description="This endpoint reports queue depth, rejections and per-call latency of the data access executor.")
+async def health_check_executor(executor = Depends(get_data_access_executor)):
+    return JSONResponse(content=executor.stats(), status_code=200)
+
+
+@health_router.get("/cache", tags=["health"],
+                   description="This endpoint reports hit ratio and invalidations of the user and organiser profile caches.")
+async def health_check_cache(user_resource: AsyncBaseResource = Depends(get_user_resource),
+                             organiser_resource: AsyncBaseResource = Depends(get_organiser_resource)):
+    content = {}
+    for name, resource in (("users", user_resource), ("organisers", organiser_resource)):
+        content[name] = resource.stats() if hasattr(resource, "stats") else {"status": "cache disabled"}
+    return JSONResponse(content=content, status_code=200)
@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from prometheus_client import CONTENT_TYPE_LATEST
+from starlette.responses import Response
+
+from app.middleware.metrics import collect_metrics
+
+metrics_router = APIRouter()
+
+@metrics_router.get("", tags=["metrics"],
+                    description="Prometheus metrics: per-route request counts, latency and in-flight requests, "
+                                "and data access latency.")
+async def metrics():
+    return Response(content=collect_metrics(), media_type=CONTENT_TYPE_LATEST)
@@ -2,16 +2,19 @@ import os
 from http import HTTPStatus
 from typing import Annotated
 
-import requests
+import httpx
 from authlib.integrations.starlette_client import OAuth
 from dotenv import load_dotenv
-from fastapi import Request, APIRouter, HTTPException
+from fastapi import Request, APIRouter, HTTPException, Depends
 from fastapi.params import Form
-from starlette.responses import JSONResponse, RedirectResponse
+from starlette.responses import RedirectResponse
 
-from app.resources import user_resource, organiser_resource
+from app.services.dependencies import get_user_resource, get_organiser_resource, get_google_http_client
 from app.utils.constants import GOOGLE_AUTH_URL, GOOGLE_TOKEN_URL, GOOGLE_CERTS_URL
+from app.utils.responses import JSONResponse
 from app.utils.utils import verify_google_access_token, generate_custom_jwt
+from framework.resources.base_resource import AsyncBaseResource
+from framework.services.http_client import CircuitOpenError, ResilientHttpClient
 
 load_dotenv()
 
@@ -73,7 +76,10 @@ async def auth_callback(request: Request):
 
 
 @oauth_router.post("/refreshToken", description="This endpoint refreshes the access token using the provided Google refresh token and generates a new custom JWT")
-async def refresh_access_token(refresh_token: Annotated[str, Form()], request: Request):
+async def refresh_access_token(refresh_token: Annotated[str, Form()], request: Request,
+        user_resource: AsyncBaseResource = Depends(get_user_resource),
+        organiser_resource: AsyncBaseResource = Depends(get_organiser_resource),
+        http_client: ResilientHttpClient = Depends(get_google_http_client)):
     url = GOOGLE_TOKEN_URL
     data = {
         'client_id': os.getenv('OAUTH_CLIENT_ID'),
@@ -85,21 +91,23 @@ async def refresh_access_token(refresh_token: Annotated[str, Form()], request: R
     if not profile or (profile.lower() != 'user' and profile.lower() != 'organiser'):
         return JSONResponse(status_code=400, content={'error': 'Missing or invalid query params'})
 
-    response = requests.post(url, data=data)
+    try:
+        response = await http_client.post(url, data=data)
+    except (CircuitOpenError, httpx.TransportError) as e:
+        return JSONResponse(status_code=503, content={'error': f"Google token endpoint unavailable: {e}"})
+
     if response.status_code == 200:
-        user_info = verify_google_access_token(response.json().get('id_token'))
+        user_info = await verify_google_access_token(response.json().get('id_token'))
 
         # Verifying the user profile
         if profile == 'user':
-            resource = user_resource.UserResource(config=None)
-            result = resource.get_by_custom_key("Email", user_info.get('email'))
+            result = await user_resource.get_by_custom_key("Email", user_info.get('email'))
             if not result or not result.get('details'):
                 jwt_token = generate_custom_jwt(user_info, 'organiser')
             else:
                 jwt_token = generate_custom_jwt(user_info, 'user')
         else:
-            resource = organiser_resource.OrganiserResource(config=None)
-            result = resource.get_by_custom_key("Email", user_info.get('email'))
+            result = await organiser_resource.get_by_custom_key("Email", user_info.get('email'))
             if not result or not result.get('details'):
                 jwt_token = generate_custom_jwt(user_info, 'user')
             else:
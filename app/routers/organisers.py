@@ -1,11 +1,18 @@
+import os
 import uuid
+from typing import List
 
-from fastapi import APIRouter, Request
-from starlette.responses import JSONResponse
+from fastapi import APIRouter, Depends, Query, Request
+from pydantic import ValidationError
+from starlette.responses import Response, StreamingResponse
 
-from app.models.organiser import Organiser
-from app.resources import organiser_resource
-from app.utils.utils import extract_access_token_from_header, verify_custom_jwt
+from app.models.organiser import Organiser, OrganiserPatch
+from app.services.dependencies import get_organiser_resource
+from app.utils.export import export_csv, export_ndjson
+from app.utils.responses import JSONResponse
+from app.utils.utils import (conditional_response, extract_access_token_from_header, parse_if_match,
+                             verify_admin_jwt, verify_custom_jwt)
+from framework.resources.base_resource import AsyncBaseResource
 
 organiser_router = APIRouter()
 
@@ -17,7 +24,8 @@ organiser_router = APIRouter()
     },
     description="This endpoint creates a new organiser in the system."
 )
-async def create_organiser(organiser: dict, request: Request):
+async def create_organiser(organiser: dict, request: Request,
+        resource: AsyncBaseResource = Depends(get_organiser_resource)):
     access_token = extract_access_token_from_header(request)
     organiser_info = verify_custom_jwt(access_token, profile='organiser')
 
@@ -26,8 +34,7 @@ async def create_organiser(organiser: dict, request: Request):
     organiser['Name'] = organiser_info['name']
     organiser['Pic_URL'] = organiser_info['picture']
 
-    resource = organiser_resource.OrganiserResource(config = None)
-    result = resource.insert_data(Organiser.model_validate(organiser))
+    result = await resource.insert_data(Organiser.model_validate(organiser))
     if result['error'] is not None:
         if result['status'] == 'bad request':
             return JSONResponse(content=result, status_code=400)
@@ -40,71 +47,193 @@ async def create_organiser(organiser: dict, request: Request):
 @organiser_router.get(path="", tags=["organisers"],
     responses={
         200: {"description": "Organiser fetched successfully"},
+        304: {"description": "Organiser unchanged since the ETag in If-None-Match"},
         404: {"description": "Organiser does not exist"},
         500: {"description": "Database not live"},
     },
     description="This endpoint retrieves the details of the organiser associated with the logged-in organiser."
 )
-async def get_organiser(request: Request):
+async def get_organiser(request: Request,
+        resource: AsyncBaseResource = Depends(get_organiser_resource)):
     access_token = extract_access_token_from_header(request)
     organiser_info = verify_custom_jwt(access_token, profile='organiser')
 
-    resource = organiser_resource.OrganiserResource(config = None)
-    result = resource.get_by_custom_key('Email', organiser_info['email'])
+    result = await resource.get_by_custom_key('Email', organiser_info['email'])
 
     if result['error'] is not None:
         if result['status'] == 'bad request':
             return JSONResponse(content=result, status_code=404)
         else:
             return JSONResponse(content=result, status_code=500)
+    else:
+        return conditional_response(request, result, getattr(resource, 'version_field', None))
+
+
+@organiser_router.get(path="/list", tags=["organisers"],
+    responses={
+        200: {"description": "A page of organisers and the cursor for the next page"},
+        400: {"description": "Invalid cursor"},
+        500: {"description": "Database not live"},
+    },
+    description="This endpoint lists organisers ordered by OID, one page at a time. Pass the returned next_cursor to get the next page."
+)
+async def list_organisers(request: Request,
+        limit: int = Query(default=50, ge=1, le=500),
+        cursor: str = None,
+        resource: AsyncBaseResource = Depends(get_organiser_resource)):
+    access_token = extract_access_token_from_header(request)
+    verify_custom_jwt(access_token, profile='user')
+
+    result = await resource.list_data(limit, cursor)
+
+    if result['error'] is not None:
+        if result['status'] == 'bad request':
+            return JSONResponse(content=result, status_code=400)
+        else:
+            return JSONResponse(content=result, status_code=500)
     else:
         return JSONResponse(content=result, status_code=200)
 
 
+@organiser_router.get(path="/export", tags=["organisers"],
+    responses={
+        200: {"description": "Every organiser, streamed as NDJSON or CSV"},
+        403: {"description": "Caller is not an admin"},
+    },
+    description="This admin endpoint streams every organiser as NDJSON (default) or CSV without buffering the table in memory. "
+                "It takes the token of a user or organiser whose email is listed in ADMIN_EMAILS."
+)
+async def export_organisers(request: Request,
+        format: str = Query(default="ndjson", pattern="^(ndjson|csv)$"),
+        resource: AsyncBaseResource = Depends(get_organiser_resource)):
+    access_token = extract_access_token_from_header(request)
+    verify_admin_jwt(access_token)
+
+    if format == "csv":
+        return StreamingResponse(export_csv(resource.stream_data()), media_type="text/csv",
+                                 headers={"Content-Disposition": 'attachment; filename="organisers.csv"'})
+    return StreamingResponse(export_ndjson(resource.stream_data()), media_type="application/x-ndjson")
+
+
 @organiser_router.get(path="/{oid}", tags=["organisers"],
     responses={
         200: {"description": "Organiser fetched successfully"},
+        304: {"description": "Organiser unchanged since the ETag in If-None-Match"},
         404: {"description": "Organiser does not exist"},
         500: {"description": "Database not live"},
     },
     description="This endpoint fetches organiser details using their unique ID (OID)."
 )
-async def get_organiser_by_id(oid: str, request: Request):
+async def get_organiser_by_id(oid: str, request: Request,
+        resource: AsyncBaseResource = Depends(get_organiser_resource)):
     access_token = extract_access_token_from_header(request)
     verify_custom_jwt(access_token, profile='user')
 
-    resource = organiser_resource.OrganiserResource(config = None)
-    result = resource.get_by_key(oid)
+    result = await resource.get_by_key(oid)
 
     if result['error'] is not None:
         if result['status'] == 'bad request':
             return JSONResponse(content=result, status_code=404)
         else:
             return JSONResponse(content=result, status_code=500)
+    else:
+        return conditional_response(request, result, getattr(resource, 'version_field', None))
+
+
+@organiser_router.post(path="/batch", tags=["organisers"],
+    responses={
+        200: {"description": "Organisers fetched, in request order, with a not-found marker per missing OID"},
+        400: {"description": "Too many keys requested"},
+        500: {"description": "Database not live"},
+    },
+    description="This endpoint fetches many organisers by their OID in a single database round trip."
+)
+async def get_organisers_by_ids(oids: List[str], request: Request,
+        resource: AsyncBaseResource = Depends(get_organiser_resource)):
+    access_token = extract_access_token_from_header(request)
+    verify_custom_jwt(access_token, profile='user')
+
+    max_keys = int(os.getenv("BATCH_MAX_KEYS", 1000))
+    if len(oids) > max_keys:
+        return JSONResponse(content={'status': 'bad request', 'error': f'At most {max_keys} keys per request'},
+                            status_code=400)
+
+    result = await resource.get_by_keys(oids)
+
+    if result['error'] is not None:
+        return JSONResponse(content=result, status_code=500)
     else:
         return JSONResponse(content=result, status_code=200)
 
 
+@organiser_router.post(path="/bulk", tags=["organisers"],
+    responses={
+        200: {"description": "Bulk import processed, with a result per row in input order"},
+        400: {"description": "Too many rows passed"},
+        403: {"description": "Caller is not an admin"},
+        500: {"description": "Database not live"},
+    },
+    description="This admin endpoint imports many organisers at once using batched multi-row inserts. "
+                "It takes the token of a user or organiser whose email is listed in ADMIN_EMAILS."
+)
+async def bulk_create_organisers(organisers: List[dict], request: Request,
+        resource: AsyncBaseResource = Depends(get_organiser_resource)):
+    access_token = extract_access_token_from_header(request)
+    verify_admin_jwt(access_token)
+
+    max_rows = int(os.getenv("BULK_MAX_ROWS", 10000))
+    if len(organisers) > max_rows:
+        return JSONResponse(content={'status': 'bad request', 'error': f'At most {max_rows} rows per request'},
+                            status_code=400)
+
+    details = [None] * len(organisers)
+    models, positions = [], []
+    for index, organiser in enumerate(organisers):
+        organiser.setdefault('OID', str(uuid.uuid4()))
+        try:
+            models.append(Organiser.model_validate(organiser))
+            positions.append(index)
+        except ValidationError as e:
+            details[index] = {"index": index, "status": "bad request", "error": str(e)}
+
+    if models:
+        result = await resource.bulk_insert_data(models)
+        if result['error'] is not None:
+            return JSONResponse(content=result, status_code=500)
+        for position, detail in zip(positions, result['details']):
+            details[position] = {**detail, "index": position}
+
+    for index, detail in enumerate(details):
+        detail['OID'] = organisers[index].get('OID')
+
+    failed = sum(1 for detail in details if detail['error'] is not None)
+    return JSONResponse(content={'status': 'bulk import processed', 'inserted': len(details) - failed,
+                                 'failed': failed, 'details': details, 'error': None}, status_code=200)
+
+
 @organiser_router.put(path="", tags=["organisers"],
     responses={
         200: {"description": "Organiser modification successful"},
         400: {"description": "Corrupt organiser object passed"},
+        412: {"description": "If-Match does not match the stored version"},
         500: {"description": "Database not live"}
     },
     description="This endpoint updates organiser details."
 )
-async def modify_organiser(organiser: Organiser, request: Request):
+async def modify_organiser(organiser: Organiser, request: Request,
+        resource: AsyncBaseResource = Depends(get_organiser_resource)):
     access_token = extract_access_token_from_header(request)
     organiser_info = verify_custom_jwt(access_token, profile='organiser')
 
     if not organiser_info or organiser_info.get('email') != organiser.Email:
         return JSONResponse(content={'error': 'Access denied'}, status_code=403)
 
-    resource = organiser_resource.OrganiserResource(config = None)
-    result = resource.modify_data(organiser)
+    result = await resource.modify_data(organiser, parse_if_match(request))
     if result['error'] is not None:
         if result['status'] == 'bad request':
             return JSONResponse(content=result, status_code=400)
+        elif result['status'] == 'precondition failed':
+            return JSONResponse(content=result, status_code=412)
         else:
             return JSONResponse(content=result, status_code=500)
     else:
@@ -112,6 +241,37 @@ async def modify_organiser(organiser: Organiser, request: Request):
         return JSONResponse(content=result, status_code=200)
 
 
+@organiser_router.patch(path="", tags=["organisers"],
+    responses={
+        200: {"description": "Organiser modification successful"},
+        400: {"description": "Unknown field, no field to change or organiser not found"},
+        412: {"description": "If-Match does not match the stored version"},
+        500: {"description": "Database not live"}
+    },
+    description="This endpoint changes only the given fields of the caller's organiser profile. "
+                "Send If-Match with the version last read to reject concurrent edits."
+)
+async def patch_organiser(changes: OrganiserPatch, request: Request,
+        resource: AsyncBaseResource = Depends(get_organiser_resource)):
+    access_token = extract_access_token_from_header(request)
+    organiser_info = verify_custom_jwt(access_token, profile='organiser')
+
+    changes = changes.model_dump(exclude_none=True)
+    if not changes:
+        return JSONResponse(content={'status': 'bad request', 'error': 'No fields to change'}, status_code=400)
+
+    result = await resource.patch_data_by_custom_key('Email', organiser_info['email'], changes, parse_if_match(request))
+    if result['error'] is not None:
+        if result['status'] == 'bad request':
+            return JSONResponse(content=result, status_code=400)
+        elif result['status'] == 'precondition failed':
+            return JSONResponse(content=result, status_code=412)
+        else:
+            return JSONResponse(content=result, status_code=500)
+    else:
+        return JSONResponse(content=result, status_code=200)
+
+
 @organiser_router.delete(path="", tags=["organisers"],
     responses={
         204: {"description": "Organiser deletion successful"},
@@ -120,12 +280,12 @@ async def modify_organiser(organiser: Organiser, request: Request):
     },
     description="This endpoint deletes the organiser's account from the system."
 )
-async def delete_organiser(request: Request):
+async def delete_organiser(request: Request,
+        resource: AsyncBaseResource = Depends(get_organiser_resource)):
     access_token = extract_access_token_from_header(request)
     organiser_info = verify_custom_jwt(access_token, profile='organiser')
 
-    resource = organiser_resource.OrganiserResource(config = None)
-    result = resource.delete_data_by_custom_key('Email', organiser_info['email'])
+    result = await resource.delete_data_by_custom_key('Email', organiser_info['email'])
 
     if result['error'] is not None:
         if result['status'] == 'bad request':
@@ -133,4 +293,5 @@ async def delete_organiser(request: Request):
         else:
             return JSONResponse(content=result, status_code=500)
     else:
-        return JSONResponse(content=result, status_code=204)
\ No newline at end of file
+        # A 204 response has no body.
+        return Response(status_code=204)
\ No newline at end of file
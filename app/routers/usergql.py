@@ -1,7 +1,15 @@
+import dataclasses
+import os
+
 import strawberry
+from fastapi import Depends
+from strawberry.dataloader import DataLoader
+from strawberry.extensions import MaxAliasesLimiter, MaxTokensLimiter, ParserCache, ValidationCache
+from app.middleware.metrics import GRAPHQL_COST
+from app.utils.query_cost import QueryCostLimiter
 from app.utils.utils import extract_access_token_from_header, verify_custom_jwt
-from app.resources import user_resource
-from app.resources import organiser_resource
+from app.services.dependencies import get_user_resource, get_organiser_resource
+from framework.resources.base_resource import AsyncBaseResource
 from typing import Union
 
 @strawberry.type
@@ -39,24 +47,51 @@ class OrganiserType:
     def pic_url(self) -> str:
         return self.Pic_URL
 
-def get_resource_by_key(resource_class, key: str, entity_name: str) -> Union[dict, ErrorResponse]:
+def build_type(type_cls, details: dict):
+    """
+    Builds a GraphQL object from a database row, leaving out columns the type does not
+    expose (e.g. a Version column).
+    """
+    names = {field.name for field in dataclasses.fields(type_cls)}
+    return type_cls(**{key: value for key, value in details.items() if key in names})
+
+def create_resource_loader(resource: AsyncBaseResource) -> DataLoader:
+    """
+    Builds a per-request DataLoader for a resource. All keys requested in the same
+    execution tick are deduplicated and fetched with a single get_by_keys() call.
+    """
+    async def load(keys):
+        result = await resource.get_by_keys(list(keys))
+        if result.get("error") is not None:
+            return [result] * len(keys)
+        return result["details"]
+
+    return DataLoader(load_fn=load)
+
+async def get_resource_by_key(loader: DataLoader, key: str, entity_name: str) -> Union[dict, ErrorResponse]:
     """
     Helper function to fetch resource details by key and handle errors consistently.
     """
-    resource = resource_class(config=None)
-    result = resource.get_by_key(key)
+    result = await loader.load(key)
 
-    if result.get("error") is not None:
-        status = result.get("status", "unknown error")
-        if status == "bad request":
-            return ErrorResponse(code=404, message=f"{entity_name} does not exist")
-        return ErrorResponse(code=500, message="Database not live")
+    if result.get("found"):
+        return result["details"]
 
-    details = result.get("details")
-    if details:
-        return details
+    if result.get("status", "bad request") == "bad request":
+        return ErrorResponse(code=404, message=f"{entity_name} does not exist")
+    return ErrorResponse(code=500, message="Database not live")
 
-    return ErrorResponse(code=404, message=f"{entity_name} details not found")
+async def get_context(user_resource: AsyncBaseResource = Depends(get_user_resource),
+                      organiser_resource: AsyncBaseResource = Depends(get_organiser_resource)):
+    """
+    Context getter for the GraphQL router. Resolvers receive per-request loaders
+    over the shared resources, so a document with many lookups issues one batched
+    query per entity type.
+    """
+    return {
+        "user_loader": create_resource_loader(user_resource),
+        "organiser_loader": create_resource_loader(organiser_resource),
+    }
 
 @strawberry.type
 class Query:
@@ -70,8 +105,8 @@ class Query:
         except Exception as e:
             return ErrorResponse(code=401, message="Not Authorized")
 
-        user_data = get_resource_by_key(user_resource.UserResource, uid, "User")
-        return UserType(**user_data) if isinstance(user_data, dict) else user_data
+        user_data = await get_resource_by_key(info.context["user_loader"], uid, "User")
+        return build_type(UserType, user_data) if isinstance(user_data, dict) else user_data
 
     @strawberry.field
     async def get_organiser_by_id(self, info, oid: str) -> Union[OrganiserType, ErrorResponse]:
@@ -83,7 +118,27 @@ class Query:
         except Exception as e:
             return ErrorResponse(code=401, message="Not Authorized")
 
-        organiser_data = get_resource_by_key(organiser_resource.OrganiserResource, oid, "Organiser")
-        return OrganiserType(**organiser_data) if isinstance(organiser_data, dict) else organiser_data
-
-schema = strawberry.Schema(query=Query)
+        organiser_data = await get_resource_by_key(info.context["organiser_loader"], oid, "Organiser")
+        return build_type(OrganiserType, organiser_data) if isinstance(organiser_data, dict) else organiser_data
+
+def record_cost(root_fields: str, cost: int, rejected: bool):
+    GRAPHQL_COST.labels(root_fields, "rejected" if rejected else "admitted").observe(cost)
+
+# Clients send the same few documents over and over; parse and validate each once.
+_document_cache_size = int(os.getenv("GRAPHQL_DOCUMENT_CACHE_SIZE", 256))
+
+# Every lookup field is one resource read. The limits are validation rules, so they
+# run before any resolver and their verdict is cached with the document.
+schema = strawberry.Schema(query=Query, extensions=[
+    MaxTokensLimiter(max_token_count=int(os.getenv("GRAPHQL_MAX_TOKENS", 2000))),
+    MaxAliasesLimiter(max_alias_count=int(os.getenv("GRAPHQL_MAX_ALIASES", 25))),
+    # Also limits the depth: strawberry's QueryDepthLimiter re-walks a fragment for
+    # every spread, which takes exponential time on nested spreads.
+    QueryCostLimiter(max_cost=int(os.getenv("GRAPHQL_MAX_COST", 50)),
+                     max_depth=int(os.getenv("GRAPHQL_MAX_DEPTH", 8)),
+                     field_costs={"getUserById": 1, "getOrganiserById": 1},
+                     on_cost=record_cost,
+                     cache_size=_document_cache_size),
+    ParserCache(maxsize=_document_cache_size),
+    ValidationCache(maxsize=_document_cache_size),
+])
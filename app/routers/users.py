@@ -1,11 +1,18 @@
+import os
 import uuid
+from typing import List
 
-from fastapi import APIRouter, Request
-from starlette.responses import JSONResponse
+from fastapi import APIRouter, Depends, Query, Request
+from pydantic import ValidationError
+from starlette.responses import Response, StreamingResponse
 
-from app.models.user import User
-from app.resources import user_resource
-from app.utils.utils import extract_access_token_from_header, verify_custom_jwt
+from app.models.user import User, UserPatch
+from app.services.dependencies import get_user_resource
+from app.utils.export import export_csv, export_ndjson
+from app.utils.responses import JSONResponse
+from app.utils.utils import (conditional_response, extract_access_token_from_header, parse_if_match,
+                             verify_admin_jwt, verify_custom_jwt)
+from framework.resources.base_resource import AsyncBaseResource
 
 user_router = APIRouter()
 
@@ -17,7 +24,8 @@ user_router = APIRouter()
     },
     description="This endpoint creates a new user with the given details."
 )
-async def create_user(user: dict, request: Request):
+async def create_user(user: dict, request: Request,
+        resource: AsyncBaseResource = Depends(get_user_resource)):
     access_token = extract_access_token_from_header(request)
     user_info = verify_custom_jwt(access_token, profile='user')
 
@@ -26,8 +34,7 @@ async def create_user(user: dict, request: Request):
     user['Name'] = user_info['name']
     user['Pic_URL'] = user_info['picture']
 
-    resource = user_resource.UserResource(config = None)
-    result = resource.insert_data(User.model_validate(user))
+    result = await resource.insert_data(User.model_validate(user))
     if result['error'] is not None:
         if result['status'] == 'bad request':
             return JSONResponse(content=result, status_code=400)
@@ -41,71 +48,193 @@ async def create_user(user: dict, request: Request):
 @user_router.get(path="", tags=["users"],
     responses={
         200: {"description": "User fetched successfully"},
+        304: {"description": "User unchanged since the ETag in If-None-Match"},
         404: {"description": "User does not exist"},
         500: {"description": "Database not live"},
     },
     description="This endpoint fetches the user details using their email address."
 )
-async def get_user(request: Request):
+async def get_user(request: Request,
+        resource: AsyncBaseResource = Depends(get_user_resource)):
     access_token = extract_access_token_from_header(request)
     user_info = verify_custom_jwt(access_token, profile='user')
 
-    resource = user_resource.UserResource(config = None)
-    result = resource.get_by_custom_key('Email', user_info['email'])
+    result = await resource.get_by_custom_key('Email', user_info['email'])
 
     if result['error'] is not None:
         if result['status'] == 'bad request':
             return JSONResponse(content=result, status_code=404)
         else:
             return JSONResponse(content=result, status_code=500)
+    else:
+        return conditional_response(request, result, getattr(resource, 'version_field', None))
+
+
+@user_router.get(path="/list", tags=["users"],
+    responses={
+        200: {"description": "A page of users and the cursor for the next page"},
+        400: {"description": "Invalid cursor"},
+        500: {"description": "Database not live"},
+    },
+    description="This endpoint lists users ordered by UID, one page at a time. Pass the returned next_cursor to get the next page."
+)
+async def list_users(request: Request,
+        limit: int = Query(default=50, ge=1, le=500),
+        cursor: str = None,
+        resource: AsyncBaseResource = Depends(get_user_resource)):
+    access_token = extract_access_token_from_header(request)
+    verify_custom_jwt(access_token, profile='organiser')
+
+    result = await resource.list_data(limit, cursor)
+
+    if result['error'] is not None:
+        if result['status'] == 'bad request':
+            return JSONResponse(content=result, status_code=400)
+        else:
+            return JSONResponse(content=result, status_code=500)
     else:
         return JSONResponse(content=result, status_code=200)
 
 
+@user_router.get(path="/export", tags=["users"],
+    responses={
+        200: {"description": "Every user, streamed as NDJSON or CSV"},
+        403: {"description": "Caller is not an admin"},
+    },
+    description="This admin endpoint streams every user as NDJSON (default) or CSV without buffering the table in memory. "
+                "It takes the token of a user or organiser whose email is listed in ADMIN_EMAILS."
+)
+async def export_users(request: Request,
+        format: str = Query(default="ndjson", pattern="^(ndjson|csv)$"),
+        resource: AsyncBaseResource = Depends(get_user_resource)):
+    access_token = extract_access_token_from_header(request)
+    verify_admin_jwt(access_token)
+
+    if format == "csv":
+        return StreamingResponse(export_csv(resource.stream_data()), media_type="text/csv",
+                                 headers={"Content-Disposition": 'attachment; filename="users.csv"'})
+    return StreamingResponse(export_ndjson(resource.stream_data()), media_type="application/x-ndjson")
+
+
 @user_router.get(path="/{uid}", tags=["users"],
     responses={
         200: {"description": "User fetched successfully"},
+        304: {"description": "User unchanged since the ETag in If-None-Match"},
         404: {"description": "User does not exist"},
         500: {"description": "Database not live"},
     },
     description="This endpoint fetches a user by their unique UID."
 )
-async def get_user_by_id(uid: str, request: Request):
+async def get_user_by_id(uid: str, request: Request,
+        resource: AsyncBaseResource = Depends(get_user_resource)):
     access_token = extract_access_token_from_header(request)
     verify_custom_jwt(access_token, profile='organiser')
 
-    resource = user_resource.UserResource(config = None)
-    result = resource.get_by_key(uid)
+    result = await resource.get_by_key(uid)
 
     if result['error'] is not None:
         if result['status'] == 'bad request':
             return JSONResponse(content=result, status_code=404)
         else:
             return JSONResponse(content=result, status_code=500)
+    else:
+        return conditional_response(request, result, getattr(resource, 'version_field', None))
+
+
+@user_router.post(path="/batch", tags=["users"],
+    responses={
+        200: {"description": "Users fetched, in request order, with a not-found marker per missing UID"},
+        400: {"description": "Too many keys requested"},
+        500: {"description": "Database not live"},
+    },
+    description="This endpoint fetches many users by their UID in a single database round trip."
+)
+async def get_users_by_ids(uids: List[str], request: Request,
+        resource: AsyncBaseResource = Depends(get_user_resource)):
+    access_token = extract_access_token_from_header(request)
+    verify_custom_jwt(access_token, profile='organiser')
+
+    max_keys = int(os.getenv("BATCH_MAX_KEYS", 1000))
+    if len(uids) > max_keys:
+        return JSONResponse(content={'status': 'bad request', 'error': f'At most {max_keys} keys per request'},
+                            status_code=400)
+
+    result = await resource.get_by_keys(uids)
+
+    if result['error'] is not None:
+        return JSONResponse(content=result, status_code=500)
     else:
         return JSONResponse(content=result, status_code=200)
 
 
+@user_router.post(path="/bulk", tags=["users"],
+    responses={
+        200: {"description": "Bulk import processed, with a result per row in input order"},
+        400: {"description": "Too many rows passed"},
+        403: {"description": "Caller is not an admin"},
+        500: {"description": "Database not live"},
+    },
+    description="This admin endpoint imports many users at once using batched multi-row inserts. "
+                "It takes the token of a user or organiser whose email is listed in ADMIN_EMAILS."
+)
+async def bulk_create_users(users: List[dict], request: Request,
+        resource: AsyncBaseResource = Depends(get_user_resource)):
+    access_token = extract_access_token_from_header(request)
+    verify_admin_jwt(access_token)
+
+    max_rows = int(os.getenv("BULK_MAX_ROWS", 10000))
+    if len(users) > max_rows:
+        return JSONResponse(content={'status': 'bad request', 'error': f'At most {max_rows} rows per request'},
+                            status_code=400)
+
+    details = [None] * len(users)
+    models, positions = [], []
+    for index, user in enumerate(users):
+        user.setdefault('UID', str(uuid.uuid4()))
+        try:
+            models.append(User.model_validate(user))
+            positions.append(index)
+        except ValidationError as e:
+            details[index] = {"index": index, "status": "bad request", "error": str(e)}
+
+    if models:
+        result = await resource.bulk_insert_data(models)
+        if result['error'] is not None:
+            return JSONResponse(content=result, status_code=500)
+        for position, detail in zip(positions, result['details']):
+            details[position] = {**detail, "index": position}
+
+    for index, detail in enumerate(details):
+        detail['UID'] = users[index].get('UID')
+
+    failed = sum(1 for detail in details if detail['error'] is not None)
+    return JSONResponse(content={'status': 'bulk import processed', 'inserted': len(details) - failed,
+                                 'failed': failed, 'details': details, 'error': None}, status_code=200)
+
+
 @user_router.put(path="", tags=["users"],
     responses={
         200: {"description": "User modification successful"},
         400: {"description": "Corrupt user object passed"},
+        412: {"description": "If-Match does not match the stored version"},
         500: {"description": "Database not live"}
     },
     description="This endpoint modifies the details of an existing user."
 )
-async def modify_user(user: User, request: Request):
+async def modify_user(user: User, request: Request,
+        resource: AsyncBaseResource = Depends(get_user_resource)):
     access_token = extract_access_token_from_header(request)
     user_info = verify_custom_jwt(access_token, profile='user')
 
     if not user_info or user_info.get('email') != user.Email:
         return JSONResponse(content={'error': 'Access denied'}, status_code=403)
 
-    resource = user_resource.UserResource(config = None)
-    result = resource.modify_data(user)
+    result = await resource.modify_data(user, parse_if_match(request))
     if result['error'] is not None:
         if result['status'] == 'bad request':
             return JSONResponse(content=result, status_code=400)
+        elif result['status'] == 'precondition failed':
+            return JSONResponse(content=result, status_code=412)
         else:
             return JSONResponse(content=result, status_code=500)
     else:
@@ -113,6 +242,37 @@ async def modify_user(user: User, request: Request):
         return JSONResponse(content=result, status_code=200)
 
 
+@user_router.patch(path="", tags=["users"],
+    responses={
+        200: {"description": "User modification successful"},
+        400: {"description": "Unknown field, no field to change or user not found"},
+        412: {"description": "If-Match does not match the stored version"},
+        500: {"description": "Database not live"}
+    },
+    description="This endpoint changes only the given fields of the caller's user profile. "
+                "Send If-Match with the version last read to reject concurrent edits."
+)
+async def patch_user(changes: UserPatch, request: Request,
+        resource: AsyncBaseResource = Depends(get_user_resource)):
+    access_token = extract_access_token_from_header(request)
+    user_info = verify_custom_jwt(access_token, profile='user')
+
+    changes = changes.model_dump(exclude_none=True)
+    if not changes:
+        return JSONResponse(content={'status': 'bad request', 'error': 'No fields to change'}, status_code=400)
+
+    result = await resource.patch_data_by_custom_key('Email', user_info['email'], changes, parse_if_match(request))
+    if result['error'] is not None:
+        if result['status'] == 'bad request':
+            return JSONResponse(content=result, status_code=400)
+        elif result['status'] == 'precondition failed':
+            return JSONResponse(content=result, status_code=412)
+        else:
+            return JSONResponse(content=result, status_code=500)
+    else:
+        return JSONResponse(content=result, status_code=200)
+
+
 @user_router.delete(path="", tags=["users"],
     responses={
         204: {"description": "User deletion successful"},
@@ -121,12 +281,12 @@ async def modify_user(user: User, request: Request):
     },
     description="This endpoint deletes a user by their email address."
 )
-async def delete_user(request: Request):
+async def delete_user(request: Request,
+        resource: AsyncBaseResource = Depends(get_user_resource)):
     access_token = extract_access_token_from_header(request)
     user_info = verify_custom_jwt(access_token, profile='user')
 
-    resource = user_resource.UserResource(config = None)
-    result = resource.delete_data_by_custom_key('Email', user_info['email'])
+    result = await resource.delete_data_by_custom_key('Email', user_info['email'])
 
     if result['error'] is not None:
         if result['status'] == 'bad request':
@@ -134,4 +294,5 @@ async def delete_user(request: Request):
         else:
             return JSONResponse(content=result, status_code=500)
     else:
-        return JSONResponse(content=result, status_code=204)
\ No newline at end of file
+        # A 204 response has no body.
+        return Response(status_code=204)
\ No newline at end of file
@@ -0,0 +1,32 @@
+from framework.resources.base_resource import AsyncBaseResource
+from framework.services.http_client import ResilientHttpClient
+
+from app.services.service_factory import ServiceFactory
+
+
+# FastAPI dependencies that hand the shared services to route handlers. They are
+# coroutines so that FastAPI resolves them on the loop instead of a worker thread.
+
+
+async def get_user_resource() -> AsyncBaseResource:
+    return ServiceFactory.get_service("UserResource")
+
+
+async def get_organiser_resource() -> AsyncBaseResource:
+    return ServiceFactory.get_service("OrganiserResource")
+
+
+async def get_connection_check():
+    return ServiceFactory.get_service("ConnectionCheck")
+
+
+async def get_data_access_executor():
+    return ServiceFactory.get_service("DataAccessExecutor")
+
+
+async def get_readiness_probe():
+    return ServiceFactory.get_service("ReadinessProbe")
+
+
+async def get_google_http_client() -> ResilientHttpClient:
+    return ServiceFactory.get_service("GoogleHttpClient")
@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+
+class ReadinessProbe:
+    """
+    Runs the readiness checks of the service's dependencies and caches the outcome
+    for a short interval, so that frequent probes from several kubelets do not turn
+    into a stream of database round trips. Concurrent probes share one evaluation.
+
+    Each check is an async callable returning a dict with at least a "status" of
+    "up" or "down".
+    """
+
+    def __init__(self, checks: dict, cache_ttl: float = 2.0, timeout: float = 2.0, saturation_threshold: float = None):
+        """
+        :param checks: Mapping of dependency name to async check callable.
+        :param cache_ttl: Seconds a result is reused before the checks run again.
+        :param timeout: Seconds a single check may take before it is reported down.
+        :param saturation_threshold: Pool usage (in_use / max_size) at or above which the service
+            reports not ready. None only reports the saturation.
+        """
+        self.checks = checks
+        self.cache_ttl = cache_ttl
+        self.timeout = timeout
+        self.saturation_threshold = saturation_threshold
+
+        self._lock = asyncio.Lock()
+        self._result = None
+        self._checked_at = 0.0
+
+    async def check(self) -> dict:
+        if self._result is not None and time.monotonic() - self._checked_at < self.cache_ttl:
+            return self._result
+
+        async with self._lock:
+            if self._result is not None and time.monotonic() - self._checked_at < self.cache_ttl:
+                return self._result
+
+            names = list(self.checks)
+            reports = await asyncio.gather(*(self._run(self.checks[name]) for name in names))
+            dependencies = dict(zip(names, reports))
+
+            ready = all(report["status"] == "up" for report in dependencies.values())
+            self._result = {"status": "ready" if ready else "not ready", "dependencies": dependencies}
+            self._checked_at = time.monotonic()
+            return self._result
+
+    async def _run(self, check) -> dict:
+        started = time.perf_counter()
+        try:
+            report = await asyncio.wait_for(check(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            report = {"status": "down", "error": f"check timed out after {self.timeout}s"}
+        except Exception as e:
+            report = {"status": "down", "error": str(e)}
+        report.setdefault("latency_ms", round((time.perf_counter() - started) * 1000, 3))
+
+        pool = report.get("pool")
+        if pool and pool.get("max_size"):
+            report["saturation"] = round(pool["in_use"] / pool["max_size"], 3)
+            if (self.saturation_threshold is not None and report["status"] == "up"
+                    and report["saturation"] >= self.saturation_threshold):
+                report["status"] = "down"
+                report["error"] = "connection pool saturated"
+        return report
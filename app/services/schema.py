@@ -0,0 +1,165 @@
+import asyncio
+import logging
+
+from pymysql import MySQLError
+
+from framework.services.data_access.ConnectionPool import PoolTimeoutError
+
+logger = logging.getLogger("microservice_logger")
+
+
+# The tables behind UserResource and OrganiserResource. Email is unique and indexed
+# because the profile, refresh-token and delete flows all look accounts up by Email.
+# Version backs optimistic concurrency (see VERSION_FIELD).
+TABLES = [
+    {
+        "database": "USER",
+        "collection": "user_tab",
+        "key_field": "UID",
+        "lookup_fields": ("UID", "Email"),
+        "create": """
+            CREATE TABLE IF NOT EXISTS USER.user_tab (
+                UID VARCHAR(36) NOT NULL,
+                Name VARCHAR(255) NOT NULL,
+                Email VARCHAR(255) NOT NULL,
+                Pic_URL VARCHAR(1024) NOT NULL,
+                PhoneNo VARCHAR(32) NOT NULL,
+                Address VARCHAR(512) NOT NULL,
+                Age INT NOT NULL,
+                Version INT NOT NULL DEFAULT 1,
+                PRIMARY KEY (UID),
+                UNIQUE INDEX uq_user_tab_email (Email)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+        "columns": {"Version": "INT NOT NULL DEFAULT 1"},
+        "indexes": {"Email": "UNIQUE INDEX uq_user_tab_email (Email)"},
+    },
+    {
+        "database": "ORGANISER",
+        "collection": "org_tab",
+        "key_field": "OID",
+        "lookup_fields": ("OID", "Email"),
+        "create": """
+            CREATE TABLE IF NOT EXISTS ORGANISER.org_tab (
+                OID VARCHAR(36) NOT NULL,
+                Name VARCHAR(255) NOT NULL,
+                Email VARCHAR(255) NOT NULL,
+                Pic_URL VARCHAR(1024) NOT NULL,
+                PhoneNo VARCHAR(32) NOT NULL,
+                Address VARCHAR(512) NOT NULL,
+                Age INT NOT NULL,
+                Version INT NOT NULL DEFAULT 1,
+                PRIMARY KEY (OID),
+                UNIQUE INDEX uq_org_tab_email (Email)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+        "columns": {"Version": "INT NOT NULL DEFAULT 1"},
+        "indexes": {"Email": "UNIQUE INDEX uq_org_tab_email (Email)"},
+    },
+]
+
+
+class SchemaVerificationError(RuntimeError):
+    pass
+
+
+class SchemaManager:
+    """
+    Creates and migrates the service's tables, and checks with EXPLAIN that every
+    lookup the resources issue is served by an index rather than a table scan.
+
+    Runs once at startup on the synchronous data service. Bootstrapping is opt-in;
+    verification either logs a warning or, with the "fail" policy, stops the startup
+    when a lookup would scan. A database that cannot be reached is only logged, so the
+    service still starts and reports itself through the readiness probe.
+    """
+
+    def __init__(self, data_service, tables: list = None, bootstrap: bool = False, policy: str = "warn"):
+        """
+        :param data_service: A MySqlRdbDataService.
+        :param tables: Table definitions, see TABLES.
+        :param bootstrap: Create missing databases, tables, columns and indexes.
+        :param policy: "warn", "fail" or "off" for the EXPLAIN verification.
+        """
+        self.data_service = data_service
+        self.tables = TABLES if tables is None else tables
+        self.bootstrap = bootstrap
+        self.policy = policy
+        self.report = []
+
+    def _execute(self, sql_statement: str, args=None):
+        return self.data_service.execute_statement(sql_statement, args)
+
+    def migrate(self) -> list:
+        """
+        Brings the tables up to date. Returns the list of changes applied.
+        """
+        applied = []
+        for table in self.tables:
+            database, collection = table["database"], table["collection"]
+            self._execute(f"CREATE DATABASE IF NOT EXISTS {database}")
+            self._execute(table["create"])
+
+            columns = {row["COLUMN_NAME"].lower() for row in self._execute(
+                "SELECT COLUMN_NAME FROM information_schema.COLUMNS WHERE TABLE_SCHEMA=%s AND TABLE_NAME=%s",
+                [database, collection])}
+            for column, definition in table["columns"].items():
+                if column.lower() not in columns:
+                    self._execute(f"ALTER TABLE {database}.{collection} ADD COLUMN {column} {definition}")
+                    applied.append(f"{database}.{collection}: added column {column}")
+
+            # Any index that leads with the column will do, whatever its name.
+            indexed = {row["COLUMN_NAME"].lower() for row in self._execute(
+                "SELECT COLUMN_NAME FROM information_schema.STATISTICS "
+                "WHERE TABLE_SCHEMA=%s AND TABLE_NAME=%s AND SEQ_IN_INDEX=1",
+                [database, collection])}
+            for column, definition in table["indexes"].items():
+                if column.lower() not in indexed:
+                    self._execute(f"ALTER TABLE {database}.{collection} ADD {definition}")
+                    applied.append(f"{database}.{collection}: added index on {column}")
+
+        return applied
+
+    def _lookups(self, table: dict):
+        statements = self.data_service.statements
+        database, collection, key_field = table["database"], table["collection"], table["key_field"]
+        for field in table["lookup_fields"]:
+            yield statements.select_by_key(database, collection, field), ["probe"]
+        yield statements.select_in(database, collection, key_field, ["probe-1", "probe-2"])
+        yield statements.select_page(database, collection, key_field, True), ["probe", 1]
+
+    def verify(self) -> list:
+        """
+        EXPLAINs the statements the resources run for lookups by key, by Email, by many
+        keys and for keyset pages. Returns one entry per statement; "scan" is True when
+        MySQL would read the whole table.
+        """
+        report = []
+        for table in self.tables:
+            for sql_statement, args in self._lookups(table):
+                plan = self._execute("EXPLAIN " + sql_statement, args)
+                row = plan[0] if plan else {}
+                report.append({"statement": sql_statement, "type": row.get("type"), "key": row.get("key"),
+                               "scan": row.get("type") == "ALL"})
+        return report
+
+    def run(self):
+        try:
+            if self.bootstrap:
+                for change in self.migrate():
+                    logger.info(f"Schema migration: {change}")
+            if self.policy == "off":
+                return
+            self.report = self.verify()
+        except (MySQLError, PoolTimeoutError) as e:
+            logger.warning(f"Schema check skipped: {e}")
+            return
+
+        scans = [entry["statement"] for entry in self.report if entry["scan"]]
+        for statement in scans:
+            logger.warning(f"Lookup is not served by an index and scans the table: {statement}")
+        if scans and self.policy == "fail":
+            raise SchemaVerificationError(f"{len(scans)} lookup(s) would scan a table: {scans}")
+
+    async def startup(self):
+        await asyncio.to_thread(self.run)
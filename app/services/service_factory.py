@@ -1,18 +1,181 @@
+import functools
+import os
+
+from app.services.readiness import ReadinessProbe
+from app.services.schema import SchemaManager
+from app.utils.constants import GOOGLE_CERTS_URL
+from app.utils.jwks import JWKSCache, fetch_jwks
+from app.utils.persisted_queries import PersistedQueryStore
+from app.utils.token_cache import VerifiedTokenCache
+from framework.services.cache.memory_cache import InMemoryTTLCache
+from framework.services.cache.redis_cache import RedisCache
+from framework.services.data_access.AsyncMySqlRdbDataService import AsyncMySqlRdbDataService
+from framework.services.data_access.Instrumentation import PrometheusQueryInstrument, SlowQueryLogger, Histogram
 from framework.services.data_access.MySqlRdbDataService import MySqlRdbDataService
+from framework.services.executor import BoundedExecutor
+from framework.services.http_client import ResilientHttpClient
 from framework.services.service_factory import BaseServiceFactory
 
 
+def _database_context():
+    return dict(user="root", password="dbuserdbuser",
+                host="localhost", port=3306,
+                pool_min_size=int(os.getenv("DB_POOL_MIN_SIZE", 0)),
+                pool_max_size=int(os.getenv("DB_POOL_MAX_SIZE", 10)),
+                pool_checkout_timeout=float(os.getenv("DB_POOL_CHECKOUT_TIMEOUT", 10)),
+                pool_idle_timeout=float(os.getenv("DB_POOL_IDLE_TIMEOUT", 300)),
+                pool_max_lifetime=float(os.getenv("DB_POOL_MAX_LIFETIME", 3600)))
+
+
+def _build_query_instruments():
+    instruments = []
+    if os.getenv("DB_METRICS", "true").lower() == "true" and Histogram is not None:
+        instruments.append(PrometheusQueryInstrument())
+    slow_query_ms = float(os.getenv("DB_SLOW_QUERY_MS", 500))
+    if slow_query_ms > 0:
+        instruments.append(SlowQueryLogger(
+            threshold_ms=slow_query_ms,
+            # Exports read the whole table by design.
+            thresholds={"stream_data_objects": float(os.getenv("DB_SLOW_STREAM_MS", 600000))}
+        ))
+    return instruments
+
+
+def _build_data_service(service_class):
+    service = service_class(context=_database_context())
+    for instrument in ServiceFactory.get_service("QueryInstruments"):
+        service.add_instrument(instrument)
+    return service
+
+
+def _build_data_access_executor():
+    # One worker per pooled connection, so a worker never waits on the pool.
+    return BoundedExecutor(max_workers=int(os.getenv("DB_POOL_MAX_SIZE", 10)),
+                           max_queue=int(os.getenv("DB_EXECUTOR_MAX_QUEUE", 100)))
+
+
+def _build_profile_cache():
+    backend = os.getenv("PROFILE_CACHE_BACKEND", "memory").lower()
+    context = dict(ttl=float(os.getenv("PROFILE_CACHE_TTL", 300)),
+                   maxsize=int(os.getenv("PROFILE_CACHE_MAXSIZE", 10000)),
+                   url=os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    if backend == "redis":
+        return RedisCache(context=context)
+    return InMemoryTTLCache(context=context)
+
+
+def _build_readiness_probe():
+    if os.getenv("DATA_ACCESS_MODE", "async").lower() == "threadpool":
+        data_service = ServiceFactory.get_service("UserResourceDataService")
+        executor = ServiceFactory.get_service("DataAccessExecutor")
+
+        async def database():
+            return await executor.run(data_service.ping)
+
+        async def data_access_executor():
+            return {"status": "up", **executor.stats()}
+
+        checks = {"database": database, "executor": data_access_executor}
+    else:
+        checks = {"database": ServiceFactory.get_service("AsyncUserResourceDataService").ping}
+
+    threshold = os.getenv("READINESS_SATURATION_THRESHOLD")
+    return ReadinessProbe(checks,
+                          cache_ttl=float(os.getenv("READINESS_CACHE_TTL", 2)),
+                          timeout=float(os.getenv("READINESS_TIMEOUT", 2)),
+                          saturation_threshold=float(threshold) if threshold else None)
+
+
+def _build_connection_check():
+    # The health endpoints check the data service the resources actually use.
+    if os.getenv("DATA_ACCESS_MODE", "async").lower() == "threadpool":
+        data_service = ServiceFactory.get_service("UserResourceDataService")
+        executor = ServiceFactory.get_service("DataAccessExecutor")
+
+        async def check_connection(database_name: str, table_name: str):
+            return await executor.run(data_service.check_connection, database_name, table_name)
+
+        return check_connection
+    return ServiceFactory.get_service("AsyncUserResourceDataService").check_connection
+
+
+def _build_google_http_client():
+    return ResilientHttpClient(timeout=float(os.getenv("GOOGLE_HTTP_TIMEOUT", 5)),
+                               retries=int(os.getenv("GOOGLE_HTTP_RETRIES", 2)),
+                               failure_threshold=int(os.getenv("GOOGLE_HTTP_BREAKER_THRESHOLD", 5)),
+                               reset_timeout=float(os.getenv("GOOGLE_HTTP_BREAKER_RESET", 30)))
+
+
+def _build_persisted_query_store():
+    context = dict(maxsize=int(os.getenv("GRAPHQL_APQ_MAXSIZE", 1000)),
+                   allow_registration=os.getenv("GRAPHQL_PERSISTED_ONLY", "false").lower() != "true")
+    manifest = os.getenv("GRAPHQL_PERSISTED_QUERIES_FILE")
+    if manifest:
+        return PersistedQueryStore.from_file(manifest, **context)
+    return PersistedQueryStore(**context)
+
+
+def _build_user_resource():
+    # Imported here because the resources look their data services up through this factory.
+    from app.resources.user_resource import create_user_resource
+    return create_user_resource()
+
+
+def _build_organiser_resource():
+    from app.resources.organiser_resource import create_organiser_resource
+    return create_organiser_resource()
+
+
 class ServiceFactory(BaseServiceFactory):
 
     def __init__(self):
         super().__init__()
 
-    @classmethod
-    def get_service(cls, service_name):
-        if service_name == "UserResourceDataService":
-            context = dict(user="root", password="dbuserdbuser",
-                           host="localhost", port=3306)
-            data_service = MySqlRdbDataService(context=context)
-            return data_service
-        else:
-            return None
\ No newline at end of file
+
+ServiceFactory.register("QueryInstruments", _build_query_instruments)
+
+ServiceFactory.register("UserResourceDataService",
+                        lambda: _build_data_service(MySqlRdbDataService),
+                        on_shutdown=lambda service: service.close())
+
+ServiceFactory.register("AsyncUserResourceDataService",
+                        lambda: _build_data_service(AsyncMySqlRdbDataService),
+                        on_shutdown=lambda service: service.close())
+
+ServiceFactory.register("DataAccessExecutor",
+                        _build_data_access_executor,
+                        on_shutdown=lambda executor: executor.shutdown(wait=True))
+
+ServiceFactory.register("ProfileCache",
+                        _build_profile_cache,
+                        on_shutdown=lambda cache: cache.close())
+
+ServiceFactory.register("ReadinessProbe", _build_readiness_probe)
+
+ServiceFactory.register("ConnectionCheck", _build_connection_check)
+
+ServiceFactory.register("SchemaManager",
+                        lambda: SchemaManager(ServiceFactory.get_service("UserResourceDataService"),
+                                              bootstrap=os.getenv("SCHEMA_BOOTSTRAP", "false").lower() == "true",
+                                              policy=os.getenv("SCHEMA_INDEX_POLICY", "warn").lower()),
+                        on_startup=lambda manager: manager.startup(),
+                        eager=True)
+
+ServiceFactory.register("UserResource", _build_user_resource, eager=True)
+
+ServiceFactory.register("OrganiserResource", _build_organiser_resource, eager=True)
+
+ServiceFactory.register("GoogleHttpClient",
+                        _build_google_http_client,
+                        on_shutdown=lambda client: client.close())
+
+ServiceFactory.register("GoogleJWKSCache",
+                        lambda: JWKSCache(GOOGLE_CERTS_URL,
+                                          functools.partial(fetch_jwks,
+                                                            client=ServiceFactory.get_service("GoogleHttpClient")),
+                                          refresh_ahead=float(os.getenv("JWKS_REFRESH_AHEAD", 300))))
+
+ServiceFactory.register("PersistedQueryStore", _build_persisted_query_store)
+
+ServiceFactory.register("VerifiedTokenCache",
+                        lambda: VerifiedTokenCache(maxsize=int(os.getenv("JWT_VERIFY_CACHE_SIZE", 10000))))
@@ -0,0 +1,36 @@
+import csv
+import io
+
+from app.utils.responses import dumps
+
+# Rows are written out in groups so that a large export is not one tiny chunk per row.
+EXPORT_ROWS_PER_CHUNK = 500
+
+
+async def export_ndjson(rows):
+    lines = []
+    async for row in rows:
+        lines.append(dumps(row))
+        if len(lines) >= EXPORT_ROWS_PER_CHUNK:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+async def export_csv(rows):
+    buffer = io.StringIO()
+    writer = None
+    count = 0
+    async for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(row.keys()))
+            writer.writeheader()
+        writer.writerow(row)
+        count += 1
+        if count % EXPORT_ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import re
+import time
+
+logger = logging.getLogger("microservice_logger")
+
+_MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+
+async def fetch_jwks(url: str, client):
+    """
+    Fetches a JWKS document.
+    :param client: The ResilientHttpClient to send the request with.
+    :return: A tuple of (jwks dict, max-age in seconds or None).
+    """
+    response = await client.get(url)
+    response.raise_for_status()
+    return response.json(), parse_max_age(response.headers.get("Cache-Control"))
+
+
+def parse_max_age(cache_control):
+    if not cache_control:
+        return None
+    match = _MAX_AGE_PATTERN.search(cache_control)
+    return int(match.group(1)) if match else None
+
+
+class JWKSCache:
+    """
+    In-process cache of a JSON Web Key Set, indexed by key id (kid).
+
+    - Keys are kept for the max-age advertised by the endpoint's Cache-Control header.
+    - Shortly before expiry the key set is refreshed in a background task, so callers
+      never wait for the endpoint on the happy path.
+    - An unknown kid triggers one inline refetch; concurrent misses share that fetch.
+    - If the endpoint fails, the previous (stale) keys keep being served. A failed
+      fetch is shared like a successful one: callers queued behind it reuse its
+      outcome, and with no keys at all it is re-raised for `negative_ttl` seconds
+      instead of refetching on every call.
+    """
+
+    def __init__(self,
+                 url: str,
+                 fetcher,
+                 default_max_age: float = 3600,
+                 refresh_ahead: float = 300,
+                 min_refetch_interval: float = 30,
+                 negative_ttl: float = 5):
+        """
+        :param url: The JWKS endpoint.
+        :param fetcher: An async callable(url) returning (jwks dict, max-age or None).
+        :param default_max_age: Lifetime used when the endpoint sends no max-age.
+        :param refresh_ahead: Seconds before expiry at which a background refresh starts.
+        :param min_refetch_interval: Minimum seconds between refetches caused by unknown kids.
+        :param negative_ttl: Seconds a failed fetch is re-raised for while no keys are cached.
+        """
+        self.url = url
+        self._fetcher = fetcher
+        self.default_max_age = default_max_age
+        self.refresh_ahead = refresh_ahead
+        self.min_refetch_interval = min_refetch_interval
+        self.negative_ttl = negative_ttl
+
+        self._keys = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._generation = 0
+        self._retry_at = 0.0
+        self._last_error = None
+
+        self._fetch_lock = asyncio.Lock()
+        self._background_refresh = None
+
+        self._stats = {"hits": 0, "misses": 0, "fetches": 0, "fetch_errors": 0, "stale_served": 0}
+
+    async def get_key(self, kid: str):
+        """
+        Returns the JWK for `kid`, or None if the endpoint does not know it.
+        :raises Exception: If no key set could ever be fetched.
+        """
+        now = time.monotonic()
+
+        if now >= self._expires_at:
+            if not self._keys and now < self._retry_at:
+                # The last fetch failed moments ago; do not hammer the endpoint.
+                raise self._last_error
+            # Nothing usable (or fully expired): refresh inline, fall back to stale keys.
+            await self._refresh(self._generation, raise_if_empty=True)
+        elif now >= self._expires_at - self.refresh_ahead and now >= self._retry_at:
+            self._start_background_refresh()
+
+        key = self._keys.get(kid)
+        if key is not None:
+            self._stats["hits"] += 1
+            return key
+
+        self._stats["misses"] += 1
+        if time.monotonic() >= max(self._fetched_at + self.min_refetch_interval, self._retry_at):
+            # The key set may have been rotated since the last fetch.
+            await self._refresh(self._generation)
+        return self._keys.get(kid)
+
+    def stats(self) -> dict:
+        snapshot = dict(self._stats)
+        snapshot.update({
+            "keys": len(self._keys),
+            "expires_in": round(max(0.0, self._expires_at - time.monotonic()), 3),
+        })
+        return snapshot
+
+    async def _refresh(self, seen_generation: int, raise_if_empty: bool = False):
+        """
+        Fetches the key set unless another caller already tried to while we waited
+        for the lock (single-flight). Every attempt, failed or not, advances the
+        generation, so the waiters reuse its outcome instead of fetching in turn.
+        """
+        async with self._fetch_lock:
+            if self._generation != seen_generation:
+                if raise_if_empty and not self._keys and self._last_error is not None:
+                    raise self._last_error
+                return
+
+            try:
+                jwks, max_age = await self._fetcher(self.url)
+                keys = {key["kid"]: key for key in jwks.get("keys", []) if "kid" in key}
+            except Exception as e:
+                self._stats["fetch_errors"] += 1
+                self._last_error = e
+                self._generation += 1
+                if not self._keys:
+                    self._retry_at = time.monotonic() + self.negative_ttl
+                    if raise_if_empty:
+                        raise
+                    return
+                # Serve stale keys and retry after a short back-off instead of on every call.
+                logger.warning(f"JWKS refresh from {self.url} failed, serving stale keys: {e}")
+                self._stats["stale_served"] += 1
+                self._retry_at = time.monotonic() + self.min_refetch_interval
+                self._expires_at = max(self._expires_at, self._retry_at)
+                return
+
+            now = time.monotonic()
+            self._stats["fetches"] += 1
+            self._keys = keys
+            self._last_error = None
+            self._fetched_at = now
+            self._expires_at = now + (max_age if max_age is not None else self.default_max_age)
+            self._generation += 1
+
+    def _start_background_refresh(self):
+        if self._background_refresh is not None and not self._background_refresh.done():
+            return
+        # Keep a reference, the event loop only holds tasks weakly.
+        self._background_refresh = asyncio.create_task(self._refresh(self._generation))
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from strawberry.fastapi import GraphQLRouter
+from strawberry.http.exceptions import HTTPException
+
+from app.utils.responses import JSONResponse
+
+
+class PersistedQueryError(Exception):
+    """
+    A persisted query request that cannot be served. Reported to the client as a
+    GraphQL error so that Apollo-style clients can react to its code (e.g. resend the
+    document after PERSISTED_QUERY_NOT_FOUND).
+    """
+
+    def __init__(self, message: str, code: str):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+class PersistedQueryStore:
+    """
+    Query documents by the SHA-256 hash of their text.
+
+    Documents loaded from a manifest are kept for the life of the process. Documents
+    registered by clients (automatic persisted queries) are kept in a bounded LRU, so
+    that clients cannot grow the store without limit.
+    """
+
+    def __init__(self, maxsize: int = 1000, documents: dict = None, allow_registration: bool = True):
+        """
+        :param maxsize: Maximum number of client-registered documents.
+        :param documents: Pinned documents, {sha256 hex digest: query}.
+        :param allow_registration: Accept documents registered by clients. When False
+            the router runs pinned documents only, sent by hash or in full.
+        """
+        self.maxsize = maxsize
+        self.allow_registration = allow_registration
+        self._pinned = {}
+        for digest, query in (documents or {}).items():
+            if self.digest(query) != digest.lower():
+                raise ValueError(f"Persisted query {digest} does not match its document")
+            self._pinned[digest.lower()] = query
+
+        self._registered = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "registered": 0, "evictions": 0}
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs):
+        """
+        Loads pinned documents from a JSON manifest of {sha256 hex digest: query}.
+        """
+        with open(path) as f:
+            return cls(documents=json.load(f), **kwargs)
+
+    @staticmethod
+    def digest(query: str) -> str:
+        return hashlib.sha256(query.encode()).hexdigest()
+
+    def get(self, digest: str):
+        """
+        Returns the document for `digest`, or None if it is not known.
+        """
+        digest = digest.lower()
+        query = self._pinned.get(digest)
+        if query is None:
+            with self._lock:
+                query = self._registered.get(digest)
+                if query is not None:
+                    self._registered.move_to_end(digest)
+        self._stats["hits" if query is not None else "misses"] += 1
+        return query
+
+    def register(self, digest: str, query: str):
+        """
+        Stores a client-sent document under its hash.
+        :raises PersistedQueryError: If the hash does not match the document, or
+            registration is disabled and the document is not pinned.
+        """
+        digest = digest.lower()
+        if self.digest(query) != digest:
+            raise PersistedQueryError("provided sha does not match query", "INVALID_PERSISTED_QUERY")
+        if digest in self._pinned:
+            return
+        if not self.allow_registration:
+            raise PersistedQueryError("PersistedQueryNotAllowed", "PERSISTED_QUERY_NOT_ALLOWED")
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            if digest not in self._registered:
+                self._stats["registered"] += 1
+            self._registered[digest] = query
+            self._registered.move_to_end(digest)
+            while len(self._registered) > self.maxsize:
+                self._registered.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def stats(self) -> dict:
+        snapshot = dict(self._stats)
+        snapshot.update({"pinned": len(self._pinned), "size": len(self._registered), "maxsize": self.maxsize})
+        return snapshot
+
+
+class PersistedQueryRouter(GraphQLRouter):
+    """
+    A GraphQLRouter that accepts automatic persisted queries (the Apollo APQ protocol):
+    a request may send `extensions.persistedQuery.sha256Hash` instead of the query
+    text. An unknown hash is answered with PersistedQueryNotFound, after which the
+    client sends the hash together with the query once to register it.
+
+    Requests without a persistedQuery extension are handled as usual, unless the
+    store only accepts pinned documents.
+    """
+
+    def __init__(self, schema, persisted_queries, **kwargs):
+        """
+        :param persisted_queries: A callable returning the PersistedQueryStore.
+        """
+        super().__init__(schema, **kwargs)
+        self.persisted_queries = persisted_queries
+
+    def should_render_graphql_ide(self, request) -> bool:
+        # A GET by hash has no query parameter, but is a query all the same.
+        return super().should_render_graphql_ide(request) and request.query_params.get("extensions") is None
+
+    async def parse_http_body(self, request):
+        request_data = await super().parse_http_body(request)
+
+        extensions = None
+        if request.method == "GET":
+            extensions = request.query_params.get("extensions")
+            if extensions:
+                extensions = self.parse_json(extensions)
+        elif "application/json" in (request.content_type or ""):
+            body = await request.get_body()
+            # Only documents sent by hash pay for looking at the extensions.
+            if b"persistedQuery" in body:
+                extensions = self.parse_json(body).get("extensions")
+
+        persisted = extensions.get("persistedQuery") if isinstance(extensions, dict) else None
+        store = self.persisted_queries()
+        if not persisted:
+            if not store.allow_registration and request_data.query is not None \
+                    and store.get(store.digest(request_data.query)) is None:
+                raise PersistedQueryError("PersistedQueryNotAllowed", "PERSISTED_QUERY_NOT_ALLOWED")
+            return request_data
+
+        digest = persisted.get("sha256Hash")
+        if persisted.get("version") != 1 or not isinstance(digest, str):
+            raise PersistedQueryError("PersistedQueryNotSupported", "PERSISTED_QUERY_NOT_SUPPORTED")
+
+        if request_data.query is None:
+            request_data.query = store.get(digest)
+            if request_data.query is None:
+                raise PersistedQueryError("PersistedQueryNotFound", "PERSISTED_QUERY_NOT_FOUND")
+        else:
+            store.register(digest, request_data.query)
+        return request_data
+
+    async def run(self, request, **kwargs):
+        try:
+            return await super().run(request, **kwargs)
+        except PersistedQueryError as e:
+            if e.code == "INVALID_PERSISTED_QUERY":
+                raise HTTPException(400, e.message) from e
+            return JSONResponse({"data": None, "errors": [{"message": e.message, "extensions": {"code": e.code}}]})
@@ -0,0 +1,136 @@
+from functools import lru_cache
+
+from graphql import (FieldNode, FragmentDefinitionNode, FragmentSpreadNode, GraphQLError, InlineFragmentNode,
+                     OperationDefinitionNode, ValidationRule)
+from strawberry.extensions import AddValidationRules
+
+
+class QueryCostLimiter(AddValidationRules):
+    """
+    Rejects GraphQL operations that nest deeper than `max_depth` or cost more than
+    `max_cost`, before they execute.
+
+    The cost of an operation is the sum of the costs of the fields it selects,
+    including those selected through fragments; fields that trigger a lookup (e.g.
+    getUserById) are given a cost in `field_costs`, everything else costs
+    `default_cost`. Aliasing a field does not make it cheaper, so a document with a
+    thousand aliased lookups costs a thousand. Introspection fields are free and do
+    not count towards the depth.
+
+    Fragments are measured once per document, so documents whose fragments spread
+    each other many times are measured in linear time, and the results are cached
+    per parsed document. `on_cost(root_fields, cost, rejected)` is called for every
+    operation that reaches validation, e.g. to record the cost in metrics.
+    """
+
+    def __init__(self, max_cost: int, max_depth: int = None, field_costs: dict = None, default_cost: int = 0,
+                 on_cost=None, cache_size: int = 256):
+        """
+        :param max_cost: The maximum cost of one operation.
+        :param max_depth: The maximum field nesting of one operation, or None for no limit.
+        :param field_costs: Cost per field name, e.g. {"getUserById": 1}.
+        :param default_cost: Cost of every other field.
+        :param on_cost: Optional callable(root_fields: str, cost: int, rejected: bool).
+        :param cache_size: Number of documents whose measurements are kept.
+        """
+        self.max_cost = max_cost
+        self.max_depth = max_depth
+        self.field_costs = field_costs or {}
+        self.default_cost = default_cost
+        self.on_cost = on_cost
+        self.measure = lru_cache(maxsize=cache_size)(self._measure_document)
+
+        limiter = self
+
+        class QueryLimitValidator(ValidationRule):
+            def __init__(self, context):
+                super().__init__(context)
+                for name, (cost, depth, _) in limiter.measure(context.document).items():
+                    name = name or "anonymous"
+                    if limiter.max_depth is not None and depth > limiter.max_depth:
+                        context.report_error(GraphQLError(
+                            f"'{name}' exceeds maximum operation depth of {limiter.max_depth}"))
+                    if cost > limiter.max_cost:
+                        context.report_error(GraphQLError(
+                            f"'{name}' has a cost of {cost}. Allowed: {limiter.max_cost}"))
+
+        super().__init__([QueryLimitValidator])
+
+    def on_validate(self):
+        yield
+        execution_context = self.execution_context
+        if self.on_cost is None or execution_context.graphql_document is None:
+            return
+        operations = self.measure(execution_context.graphql_document)
+        if execution_context.operation_name is not None:
+            operation = operations.get(execution_context.operation_name)
+        else:
+            operation = next(iter(operations.values())) if len(operations) == 1 else None
+        if operation is not None:
+            cost, _, root_fields = operation
+            # Rejected by any validation rule, not only by this one.
+            self.on_cost(root_fields, cost, bool(execution_context.errors))
+
+    def _measure_document(self, document) -> dict:
+        """
+        :return: {operation name or None: (cost, depth, comma-separated root field names)}.
+        """
+        fragments = {definition.name.value: definition for definition in document.definitions
+                     if isinstance(definition, FragmentDefinitionNode)}
+        measured_fragments = {}
+        operations = {}
+        for definition in document.definitions:
+            if isinstance(definition, OperationDefinitionNode):
+                name = definition.name.value if definition.name else None
+                cost, depth = self._measure(definition.selection_set, fragments, measured_fragments, frozenset())
+                root_fields = set()
+                self._root_fields(definition.selection_set, fragments, root_fields, set())
+                operations[name] = (cost, depth, ",".join(sorted(root_fields)))
+        return operations
+
+    def _measure(self, selection_set, fragments: dict, measured_fragments: dict, path: frozenset) -> tuple:
+        """
+        :return: (cost, depth) of a selection set.
+        """
+        cost, depth = 0, 0
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                if selection.name.value.startswith("__"):
+                    continue
+                cost += self.field_costs.get(selection.name.value, self.default_cost)
+                field_depth = 1
+                if selection.selection_set is not None:
+                    nested_cost, nested_depth = self._measure(selection.selection_set, fragments,
+                                                              measured_fragments, path)
+                    cost += nested_cost
+                    field_depth += nested_depth
+                depth = max(depth, field_depth)
+            elif isinstance(selection, InlineFragmentNode):
+                nested_cost, nested_depth = self._measure(selection.selection_set, fragments,
+                                                          measured_fragments, path)
+                cost += nested_cost
+                depth = max(depth, nested_depth)
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                if name not in measured_fragments:
+                    # Unknown and cyclic fragments are reported by the standard rules.
+                    if name not in fragments or name in path:
+                        continue
+                    measured_fragments[name] = self._measure(fragments[name].selection_set, fragments,
+                                                             measured_fragments, path | {name})
+                nested_cost, nested_depth = measured_fragments[name]
+                cost += nested_cost
+                depth = max(depth, nested_depth)
+        return cost, depth
+
+    def _root_fields(self, selection_set, fragments: dict, root_fields: set, visited: set):
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                root_fields.add(selection.name.value)
+            elif isinstance(selection, InlineFragmentNode):
+                self._root_fields(selection.selection_set, fragments, root_fields, visited)
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                if name in fragments and name not in visited:
+                    visited.add(name)
+                    self._root_fields(fragments[name].selection_set, fragments, root_fields, visited)
@@ -0,0 +1,41 @@
+import datetime
+import decimal
+
+import orjson
+from pydantic import BaseModel
+from starlette.responses import JSONResponse as StarletteJSONResponse
+
+
+def _default(value):
+    # orjson handles datetime, date, time, UUID and dataclasses itself. These are the
+    # other types the MySQL drivers return, for DECIMAL, TIME and binary columns.
+    if isinstance(value, decimal.Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", errors="replace")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    """
+    Serialises `content` to compact UTF-8 JSON with orjson.
+    """
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class JSONResponse(StarletteJSONResponse):
+    """
+    A drop-in replacement for starlette's JSONResponse that renders with orjson, several
+    times faster than the standard library encoder on profile rows and large lists.
+    Database values such as datetime and Decimal are encoded directly, without a
+    conversion pass over the content. Used as the application's default response class.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
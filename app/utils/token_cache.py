@@ -0,0 +1,77 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class VerifiedTokenCache:
+    """
+    A bounded LRU cache of verified JWT claims. Entries are keyed by a SHA-256 digest
+    of the token, so raw bearer tokens are never kept in memory as keys, and each
+    entry expires together with the token's `exp` claim.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        """
+        :param maxsize: Maximum number of cached tokens. 0 disables the cache.
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str):
+        """
+        Returns the cached claims for `token`, or None on a miss or if the token has expired.
+        """
+        if self.maxsize <= 0:
+            return None
+
+        digest = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+
+            claims, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[digest]
+                self._stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(digest)
+            self._stats["hits"] += 1
+            return claims
+
+    def put(self, token: str, claims: dict):
+        """
+        Caches verified claims until the token's `exp` claim.
+        """
+        if self.maxsize <= 0:
+            return
+
+        digest = self._digest(token)
+        with self._lock:
+            self._entries[digest] = (claims, claims.get("exp"))
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["size"] = len(self._entries)
+            snapshot["maxsize"] = self.maxsize
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_ratio"] = round(snapshot["hits"] / lookups, 4) if lookups else 0.0
+        return snapshot
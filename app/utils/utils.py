@@ -1,13 +1,36 @@
 import os
 from datetime import datetime, timedelta
+from functools import lru_cache
 
+import httpx
 import jwt
-import requests
 from fastapi import HTTPException, Request
+from starlette.responses import Response
 from authlib.jose import jwt as jose_awt
 from jwt import ExpiredSignatureError, InvalidTokenError
 
-from app.utils.constants import GOOGLE_CERTS_URL, ALGORITHM
+from app.services.service_factory import ServiceFactory
+from app.utils.constants import ALGORITHM
+from app.utils.responses import JSONResponse
+from framework.resources.base_resource import entity_tag
+from framework.services.http_client import CircuitOpenError
+
+
+@lru_cache(maxsize=None)
+def get_jwt_secret_key():
+    """
+    The JWT signing key, read from the environment once on first use (after .env is loaded).
+    """
+    return os.getenv('JWT_SECRET_KEY')
+
+
+@lru_cache(maxsize=None)
+def get_admin_emails():
+    """
+    The emails allowed to call the admin endpoints, read once on first use from the
+    comma-separated ADMIN_EMAILS variable. Empty (no admins) when it is not set.
+    """
+    return frozenset(email.strip().lower() for email in os.getenv('ADMIN_EMAILS', '').split(',') if email.strip())
 
 
 def extract_access_token_from_header(request: Request):
@@ -18,22 +41,21 @@ def extract_access_token_from_header(request: Request):
     return auth_header.split(" ")[1]
 
 
-def verify_google_access_token(access_token):
+async def verify_google_access_token(access_token):
     try:
-        jwks_url = GOOGLE_CERTS_URL
-        jwks = requests.get(jwks_url).json()
+        jwks_cache = ServiceFactory.get_service("GoogleJWKSCache")
         headers = jwt.get_unverified_header(access_token)
         rsa_key = {}
 
-        for key in jwks['keys']:
-            if key['kid'] == headers['kid']:
-                rsa_key = {
-                    'kty': key['kty'],
-                    'kid': key['kid'],
-                    'use': key['use'],
-                    'n': key['n'],
-                    'e': key['e']
-                }
+        key = await jwks_cache.get_key(headers['kid'])
+        if key:
+            rsa_key = {
+                'kty': key['kty'],
+                'kid': key['kid'],
+                'use': key['use'],
+                'n': key['n'],
+                'e': key['e']
+            }
         if not rsa_key:
             raise HTTPException(status_code=400, detail="Unable to find appropriate key.")
 
@@ -48,6 +70,9 @@ def verify_google_access_token(access_token):
 
         return user_info
 
+    except (CircuitOpenError, httpx.TransportError) as e:
+        # The client did nothing wrong; Google's certs endpoint is unreachable.
+        raise HTTPException(status_code=503, detail="Google certs endpoint unavailable: " + str(e))
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="ID token has expired.")
     except jwt.InvalidTokenError:
@@ -69,24 +94,112 @@ def generate_custom_jwt(user_info, profile):
             "exp": expiration_time,
             "iat": datetime.utcnow()
         },
-        key=os.getenv('JWT_SECRET_KEY'),
+        key=get_jwt_secret_key(),
         algorithm=ALGORITHM
     )
 
 
-def verify_custom_jwt(token, profile):
+def decode_custom_jwt(token):
     try:
-        decoded_token = jwt.decode(
+        return jwt.decode(
             token,
-            key=os.getenv('JWT_SECRET_KEY'),
+            key=get_jwt_secret_key(),
             algorithms=[ALGORITHM]
         )
-        if decoded_token.get('profile') != profile:
-            raise HTTPException(status_code=403, detail="Access denied.")
-
-        return decoded_token
 
     except ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="The auth token has expired")
     except InvalidTokenError:
         raise HTTPException(status_code=401, detail="The auth token is invalid")
+
+
+def _verified_claims(token):
+    # Verified claims are cached until the token expires; permissions are checked on every call.
+    token_cache = ServiceFactory.get_service("VerifiedTokenCache")
+    decoded_token = token_cache.get(token)
+    if decoded_token is None:
+        decoded_token = decode_custom_jwt(token)
+        token_cache.put(token, decoded_token)
+    return decoded_token
+
+
+def verify_custom_jwt(token, profile):
+    decoded_token = _verified_claims(token)
+
+    if decoded_token.get('profile') != profile:
+        raise HTTPException(status_code=403, detail="Access denied.")
+
+    return dict(decoded_token)
+
+
+def verify_admin_jwt(token):
+    """
+    Admins sign in like everyone else, as a user or an organiser. There is no admin
+    token: the admin endpoints accept the token of either profile whose email is
+    listed in ADMIN_EMAILS.
+    """
+    decoded_token = _verified_claims(token)
+
+    if str(decoded_token.get('email', '')).lower() not in get_admin_emails():
+        raise HTTPException(status_code=403, detail="Access denied.")
+
+    return dict(decoded_token)
+
+
+def parse_if_match(request: Request):
+    """
+    Reads the expected record version from the If-Match header, e.g. `"3"` or `W/"3"`.
+    Returns None when the header is missing or `*`.
+    """
+    value = request.headers.get('If-Match')
+    if value is None or value.strip() == '*':
+        return None
+    value = value.strip()
+    if value.startswith('W/'):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="If-Match must be a record version")
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Whether an If-None-Match header value matches `etag`, using the weak comparison
+    that RFC 9110 prescribes for it: `*`, or any listed tag with or without `W/`.
+    """
+    if if_none_match.strip() == '*':
+        return True
+    tag = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == tag:
+            return True
+    return False
+
+
+def conditional_response(request: Request, result: dict, version_field: str = None):
+    """
+    Renders a fetched record with an ETag, or a bodyless 304 Not Modified when the
+    request's If-None-Match already names that tag. The tag is taken from the result
+    when the resource cache has stored it, so a cached revalidation does no work
+    beyond the lookup.
+    """
+    etag = result.get('etag') or entity_tag(result['details'], version_field)
+    max_age = int(os.getenv('PROFILE_HTTP_MAX_AGE', 0))
+    headers = {
+        'ETag': etag,
+        # Profiles are per caller: shared caches must not store them, and the response
+        # varies with the bearer token, not only with the URL.
+        'Cache-Control': f'private, max-age={max_age}' if max_age > 0 else 'private, no-cache',
+        'Vary': 'Authorization',
+    }
+
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match is not None and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    content = {key: value for key, value in result.items() if key != 'etag'}
+    return JSONResponse(content=content, status_code=200, headers=headers)
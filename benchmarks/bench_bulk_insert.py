@@ -0,0 +1,65 @@
+"""
+Throughput of insert_data_objects (multi-row INSERT) against insert_data_object
+(one INSERT per row). Needs the MySQL instance configured in ServiceFactory and
+writes to, then cleans up, rows whose UID starts with "bench-".
+
+Run from the repository root:
+
+    python -m benchmarks.bench_bulk_insert [rows]
+"""
+import sys
+import time
+import uuid
+
+from app.models.user import User
+from app.services.service_factory import ServiceFactory
+
+DATABASE = "USER"
+COLLECTION = "user_tab"
+
+
+def make_users(count: int):
+    return [
+        User(UID=f"bench-{uuid.uuid4()}", Name="Bench User", Email=f"bench-{uuid.uuid4().hex[:12]}@example.com",
+             Pic_URL="example.com", PhoneNo="+1234567890", Address="123 Main St", Age=30)
+        for _ in range(count)
+    ]
+
+
+def cleanup(data_service):
+    connection = data_service._get_connection()
+    try:
+        connection.cursor().execute(f"DELETE FROM {DATABASE}.{COLLECTION} WHERE UID LIKE 'bench-%'")
+    finally:
+        data_service._release_connection(connection)
+
+
+def main(rows: int = 2000):
+    data_service = ServiceFactory.get_service("UserResourceDataService")
+    cleanup(data_service)
+
+    users = make_users(rows)
+    started = time.perf_counter()
+    for user in users:
+        result = data_service.insert_data_object(DATABASE, COLLECTION, user)
+        if result["error"] is not None:
+            raise RuntimeError(result["error"])
+    per_row = rows / (time.perf_counter() - started)
+    cleanup(data_service)
+
+    users = make_users(rows)
+    started = time.perf_counter()
+    result = data_service.insert_data_objects(DATABASE, COLLECTION, users)
+    if result["error"] is not None:
+        raise RuntimeError(result["error"])
+    bulk = rows / (time.perf_counter() - started)
+    cleanup(data_service)
+
+    print(f"{'insert_data_object':<22} {per_row:10.0f} rows/s")
+    print(f"{'insert_data_objects':<22} {bulk:10.0f} rows/s")
+    print(f"{'speed-up':<22} {bulk / per_row:10.1f}x")
+    data_service.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,76 @@
+"""
+Micro-benchmark for the response compression middleware in app/middleware/compression.py:
+the size of a list page and of a whole-table dump with each available coding, the time
+to compress them, and the time to serve them again from the compressed-body cache,
+which holds responses that carry a strong ETag.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_compression [iterations]
+"""
+import asyncio
+import sys
+import time
+
+from app.middleware.compression import CompressionMiddleware
+from app.utils.responses import dumps
+from benchmarks.bench_json_responses import profile
+
+
+def application(body: bytes):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json"),
+                                (b"content-length", str(len(body)).encode()),
+                                (b"etag", b'"3f0c6a7e0b5e4c1e"')]})
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+async def serve(middleware, encoding: str) -> int:
+    size = 0
+
+    async def send(message):
+        nonlocal size
+        size += len(message.get("body", b""))
+
+    await middleware({"type": "http", "method": "GET", "path": "/user/list", "query_string": b"",
+                      "headers": [(b"accept-encoding", encoding.encode())]}, None, send)
+    return size
+
+
+def measure(middleware, encoding: str, iterations: int) -> float:
+    loop = asyncio.new_event_loop()
+    try:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            loop.run_until_complete(serve(middleware, encoding))
+        return (time.perf_counter() - started) / iterations * 1e6
+    finally:
+        loop.close()
+
+
+def main(iterations: int = 200):
+    payloads = {
+        "list page of 50": dumps({"status": "fetched successfully", "details": [profile(i) for i in range(50)],
+                                  "next_cursor": "eyJhZnRlciI6ICI0OSJ9", "error": None}),
+        "table of 5000": dumps({"status": "fetched successfully", "details": [profile(i) for i in range(5000)],
+                                "error": None}),
+    }
+    for name, body in payloads.items():
+        number = max(1, iterations // (50 if "5000" in name else 1))
+        print(f"{name}: {len(body)} bytes")
+        for encoding in CompressionMiddleware(application(body), cache_bytes=0).codecs:
+            uncached = CompressionMiddleware(application(body), cache_bytes=0)
+            cached = CompressionMiddleware(application(body), cache_bytes=64 * 1024 * 1024)
+            size = asyncio.run(serve(uncached, encoding))
+            # Fills the cache, so that only hits are timed.
+            asyncio.run(serve(cached, encoding))
+            compress_us = measure(uncached, encoding, number)
+            cached_us = measure(cached, encoding, number)
+            print(f"  {encoding:<5} {size:9d} bytes ({len(body) / size:5.1f}x)   compress {compress_us:9.1f} us   "
+                  f"cached {cached_us:8.1f} us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
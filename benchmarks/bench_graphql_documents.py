@@ -0,0 +1,107 @@
+"""
+Micro-benchmark for the GraphQL parsed-document cache. Executes the getUserById and
+getOrganiserById documents against the schema with and without the parser and
+validation caches, over an in-memory resource, and reports the request body saved
+by sending a persisted query's hash instead of its text.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_graphql_documents [iterations]
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+import strawberry
+
+from app.routers.usergql import Query, create_resource_loader, schema
+from app.utils.persisted_queries import PersistedQueryStore
+from app.utils.utils import generate_custom_jwt
+
+DOCUMENTS = {
+    "getUserById": ("organiser", """
+        query GetUser($uid: String!) {
+          getUserById(uid: $uid) {
+            ... on UserType { UID Name Email PicURL PhoneNo Address Age }
+            ... on ErrorResponse { code message }
+          }
+        }
+    """, {"uid": "bench-user"}),
+    "getOrganiserById": ("user", """
+        query GetOrganiser($oid: String!) {
+          getOrganiserById(oid: $oid) {
+            ... on OrganiserType { OID Name Email PicURL PhoneNo Address Age }
+            ... on ErrorResponse { code message }
+          }
+        }
+    """, {"oid": "bench-organiser"}),
+}
+
+ROW = {"Name": "Bench", "Email": "bench@example.com", "Pic_URL": "example.com", "PhoneNo": "+1234567890",
+       "Address": "1 Bench Rd", "Age": 30}
+
+
+class InMemoryResource:
+
+    def __init__(self, key_field):
+        self.key_field = key_field
+
+    async def get_by_keys(self, keys):
+        return {"status": "fetched successfully", "error": None,
+                "details": [{"found": True, "details": {self.key_field: key, **ROW}} for key in keys]}
+
+
+class Request:
+
+    def __init__(self, token):
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+
+async def measure(target_schema, query, variables, request, iterations):
+    users, organisers = InMemoryResource("UID"), InMemoryResource("OID")
+
+    async def execute():
+        result = await target_schema.execute(query, variable_values=variables, context_value={
+            "request": request,
+            "user_loader": create_resource_loader(users),
+            "organiser_loader": create_resource_loader(organisers),
+        })
+        if result.errors:
+            raise AssertionError(result.errors)
+
+    await execute()
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await execute()
+        best = min(best, time.perf_counter() - started)
+    return best / iterations * 1e6
+
+
+async def main(iterations: int = 2000):
+    uncached = strawberry.Schema(query=Query)
+
+    for name, (profile, query, variables) in DOCUMENTS.items():
+        request = Request(generate_custom_jwt(
+            {"email": "bench@example.com", "name": "Bench", "picture": "example.com"}, profile))
+        before = await measure(uncached, query, variables, request, iterations)
+        after = await measure(schema, query, variables, request, iterations)
+
+        full_body = json.dumps({"query": query, "variables": variables})
+        hashed_body = json.dumps({"variables": variables, "extensions": {
+            "persistedQuery": {"version": 1, "sha256Hash": PersistedQueryStore.digest(query)}}})
+
+        print(f"{name}")
+        print(f"  {'parse + validate per request':<32} {before:8.1f} us/request")
+        print(f"  {'parser + validation cache':<32} {after:8.1f} us/request")
+        print(f"  {'saved':<32} {before - after:8.1f} us/request ({(1 - after / before) * 100:.0f}%)")
+        print(f"  {'request body, full / by hash':<32} {len(full_body):>5} / {len(hashed_body)} bytes")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -0,0 +1,69 @@
+"""
+Micro-benchmark for rendering JSON responses: starlette's JSONResponse (standard
+library json) against the orjson JSONResponse in app/utils/responses.py, for one
+profile, a batch lookup and a large list page. Rows with datetime and Decimal values
+need a jsonable_encoder pass before the standard library can encode them; orjson
+encodes them directly.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_json_responses [iterations]
+"""
+import datetime
+import decimal
+import sys
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse as StarletteJSONResponse
+
+from app.utils.responses import JSONResponse
+
+
+def profile(index: int, typed: bool = False) -> dict:
+    row = {"UID": f"3f0c6a7e-0b5e-4c1e-9d4a-{index:012d}", "Name": f"Jane Doe {index}",
+           "Email": f"jane.doe.{index}@example.com", "Pic_URL": "https://example.com/pictures/jane.png",
+           "PhoneNo": "+1234567890", "Address": "123 Main St, Springfield", "Age": 30 + index % 40, "Version": 1}
+    if typed:
+        row["Created"] = datetime.datetime(2024, 1, 1, 12, 0, 0) + datetime.timedelta(minutes=index)
+        row["Balance"] = decimal.Decimal("1234.56")
+    return row
+
+
+def payloads(typed: bool) -> dict:
+    return {
+        "single profile": {"status": "fetched successfully", "details": profile(0, typed), "error": None},
+        "batch of 100": {"status": "fetched successfully", "error": None,
+                         "details": [{"key": str(i), "found": True, "details": profile(i, typed)}
+                                     for i in range(100)]},
+        "list page of 5000": {"status": "fetched successfully", "details": [profile(i, typed) for i in range(5000)],
+                              "next": None, "error": None},
+    }
+
+
+def main(iterations: int = 200):
+    for typed in (False, True):
+        print("rows with datetime and Decimal columns" if typed else "rows with string and integer columns")
+        for name, content in payloads(typed).items():
+            if typed:
+                def standard():
+                    StarletteJSONResponse(content=jsonable_encoder(content))
+            else:
+                def standard():
+                    StarletteJSONResponse(content=content)
+
+            def fast():
+                JSONResponse(content=content)
+
+            number = max(1, iterations // (50 if "5000" in name else 1))
+            results = {}
+            for label, fn in (("json", standard), ("orjson", fast)):
+                fn()
+                results[label] = min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+            print(f"  {name:<18} json {results['json']:10.1f} us   orjson {results['orjson']:9.1f} us   "
+                  f"{results['json'] / results['orjson']:5.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
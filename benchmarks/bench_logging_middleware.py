@@ -0,0 +1,98 @@
+"""
+Throughput of a minimal app behind the previous BaseHTTPMiddleware-based request
+logger (two formatted log lines per request, written on the event loop) and behind
+the current pure ASGI LoggingMiddleware (one JSON record, written by a queue
+listener thread). Both write to os.devnull. Requests are driven straight through
+the ASGI interface, so no server or network is involved.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_logging_middleware [requests]
+"""
+import asyncio
+import logging
+import os
+import sys
+import time
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+import app.middleware.logging as logging_middleware
+
+devnull = open(os.devnull, "w")
+
+legacy_logger = logging.getLogger("benchmark_legacy_logger")
+legacy_logger.setLevel(logging.INFO)
+legacy_logger.propagate = False
+legacy_handler = logging.StreamHandler(devnull)
+legacy_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+legacy_logger.addHandler(legacy_handler)
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        start_time = time.time()
+        method = request.method
+        url = request.url.path
+        client_host = request.client.host
+
+        legacy_logger.info(f"Incoming request: {method} {url} from {client_host}")
+        response = await call_next(request)
+        process_time = (time.time() - start_time) * 1000
+        legacy_logger.info(f"Response: {response.status_code} for {method} {url} in {process_time:.2f}ms")
+        return response
+
+
+async def endpoint(request):
+    return JSONResponse({"status": "ok"})
+
+
+def build_app(middleware_class, **options):
+    return Starlette(routes=[Route("/user/{uid}", endpoint)], middleware=[Middleware(middleware_class, **options)])
+
+
+async def drive(app, requests: int, concurrency: int = 50) -> float:
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+             "scheme": "http", "path": "/user/U001", "raw_path": b"/user/U001", "query_string": b"",
+             "root_path": "", "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 50000),
+             "server": ("bench", 80)}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    async def worker(count):
+        for _ in range(count):
+            await app(dict(scope), receive, send)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+    return (requests // concurrency * concurrency) / (time.perf_counter() - started)
+
+
+def main(requests: int = 20000):
+    logging_middleware.console_handler.setStream(devnull)
+
+    cases = (
+        ("BaseHTTPMiddleware, 2 lines", build_app(LegacyLoggingMiddleware)),
+        ("ASGI + queue, JSON", build_app(logging_middleware.LoggingMiddleware, sample_rate=1.0)),
+        ("ASGI + queue, 10% sampled", build_app(logging_middleware.LoggingMiddleware, sample_rate=0.1)),
+    )
+    results = {}
+    for name, app in cases:
+        asyncio.run(drive(app, 1000))
+        results[name] = asyncio.run(drive(app, requests))
+
+    baseline = results[cases[0][0]]
+    for name, rps in results.items():
+        print(f"{name:<30} {rps:10.0f} req/s  {rps / baseline:5.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
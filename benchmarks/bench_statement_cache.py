@@ -0,0 +1,73 @@
+"""
+CPU cost of preparing the INSERT and SELECT statements of the data service, before
+(SQL rebuilt with f-strings and the model dumped up to three times per call) and
+after the statement cache (model dumped once, SQL text looked up). No database is
+needed: only the Python-side work that precedes cursor.execute() is measured.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_statement_cache [iterations]
+"""
+import sys
+import timeit
+
+from app.models.user import User
+from framework.services.data_access.StatementCache import StatementCache
+
+DATABASE = "USER"
+COLLECTION = "user_tab"
+
+
+def main(iterations: int = 50000):
+    user = User(UID="0d5c2a57-1f5e-4bd2-9a3a-0f3b8e6a1c11", Name="John Doe", Email="johndoe@example.com",
+                Pic_URL="example.com", PhoneNo="+1234567890", Address="123 Main St", Age=30)
+    statements = StatementCache()
+
+    def insert_before():
+        fields = ', '.join(user.model_dump().keys())
+        placeholders = ', '.join(['%s'] * len(user.model_dump()))
+        values = tuple(user.model_dump().values())
+        return f"INSERT INTO {DATABASE}.{COLLECTION} ({fields}) VALUES ({placeholders})", values
+
+    def insert_after():
+        data = user.model_dump()
+        return statements.insert(DATABASE, COLLECTION, tuple(data)), tuple(data.values())
+
+    def update_before():
+        set_clause = ", ".join([f"{key} = %s" for key in user.model_dump().keys()])
+        return f"UPDATE {DATABASE}.{COLLECTION} SET {set_clause} WHERE UID=%s", tuple(user.model_dump().values())
+
+    def update_after():
+        data = user.model_dump()
+        return statements.update(DATABASE, COLLECTION, tuple(data), "UID"), tuple(data.values())
+
+    keys = [f"uid-{index}" for index in range(128)]
+
+    def select_in_before():
+        placeholders = ', '.join(['%s'] * len(keys))
+        return f"SELECT * FROM {DATABASE}.{COLLECTION} " + f"where UID IN ({placeholders})", keys
+
+    def select_in_after():
+        return statements.select_in(DATABASE, COLLECTION, "UID", keys)
+
+    def select_before():
+        return f"SELECT * FROM {DATABASE}.{COLLECTION} " + f"where UID=%s"
+
+    def select_after():
+        return statements.select_by_key(DATABASE, COLLECTION, "UID")
+
+    cases = (("insert", insert_before, insert_after),
+             ("update", update_before, update_after),
+             ("select 128 keys", select_in_before, select_in_after),
+             ("select by key", select_before, select_after))
+    for name, before, after in cases:
+        if before() != after():
+            raise AssertionError(f"{name}: statements differ")
+        timings = [min(timeit.repeat(fn, number=iterations, repeat=5)) / iterations * 1e6 for fn in (before, after)]
+        print(f"{name:<16} before {timings[0]:7.2f} us  after {timings[1]:7.2f} us  "
+              f"saved {timings[0] - timings[1]:6.2f} us/request")
+    print(f"cache stats: {statements.stats()}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,44 @@
+"""
+Micro-benchmark for verify_custom_jwt with and without the verified-token cache.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_verify_custom_jwt [iterations]
+"""
+import os
+import sys
+import timeit
+
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+from app.services.service_factory import ServiceFactory
+from app.utils.utils import decode_custom_jwt, generate_custom_jwt, verify_custom_jwt
+
+
+def main(iterations: int = 20000):
+    token = generate_custom_jwt(
+        {"email": "johndoe@example.com", "name": "John Doe", "picture": "example.com"}, "user"
+    )
+
+    def uncached():
+        claims = decode_custom_jwt(token)
+        if claims.get("profile") != "user":
+            raise AssertionError("unexpected profile")
+
+    def cached():
+        verify_custom_jwt(token, profile="user")
+
+    results = {}
+    for name, fn in (("jwt.decode per request", uncached), ("verified-token cache", cached)):
+        fn()
+        seconds = min(timeit.repeat(fn, number=iterations, repeat=5))
+        results[name] = seconds / iterations * 1e6
+
+    for name, micros in results.items():
+        print(f"{name:<24} {micros:8.2f} us/request")
+    print(f"{'speed-up':<24} {results['jwt.decode per request'] / results['verified-token cache']:8.1f}x")
+    print(f"cache stats: {ServiceFactory.get_service('VerifiedTokenCache').stats()}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
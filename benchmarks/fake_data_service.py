@@ -0,0 +1,185 @@
+"""
+An in-memory stand-in for AsyncMySqlRdbDataService, used by the load test when no
+MySQL server is available. It keeps rows in dictionaries, compares keys
+case-insensitively like MySQL's default collation, and sleeps for a configurable
+latency on every call to model the database round trip.
+"""
+import asyncio
+import copy
+
+from pydantic import BaseModel
+
+from framework.services.data_access.BaseDataService import BaseDataService
+from framework.services.data_access.Instrumentation import instrumented
+from framework.services.data_access.StatementCache import StatementCache
+
+
+class FakeDataService(BaseDataService):
+
+    def __init__(self, context=None):
+        """
+        :param context: "latency" is the simulated round trip in seconds (default 0.0005).
+        """
+        super().__init__(context or {})
+
+        self.latency = self.context.get("latency", 0.0005)
+        self.statements = StatementCache()
+        self._tables = {}
+        self._indexes = {}
+        self._unique = set()
+        self._stats = {"calls": 0}
+
+    def _rows(self, database_name: str, collection_name: str) -> list:
+        return self._tables.setdefault(f"{database_name}.{collection_name}", [])
+
+    def _index(self, database_name: str, collection_name: str, field: str) -> dict:
+        key = (f"{database_name}.{collection_name}", field)
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = {}
+            for row in self._rows(database_name, collection_name):
+                index[str(row.get(field)).lower()] = row
+        return index
+
+    def _add(self, database_name: str, collection_name: str, row: dict):
+        table = f"{database_name}.{collection_name}"
+        for (indexed_table, field), index in self._indexes.items():
+            if indexed_table == table and (indexed_table, field) in self._unique \
+                    and str(row.get(field)).lower() in index:
+                raise ValueError(f"Duplicate entry '{row.get(field)}' for key '{field}'")
+        self._rows(database_name, collection_name).append(row)
+        for (indexed_table, field), index in self._indexes.items():
+            if indexed_table == table:
+                index[str(row.get(field)).lower()] = row
+
+    def _remove(self, database_name: str, collection_name: str, row: dict):
+        table = f"{database_name}.{collection_name}"
+        self._rows(database_name, collection_name).remove(row)
+        for (indexed_table, field), index in self._indexes.items():
+            if indexed_table == table:
+                index.pop(str(row.get(field)).lower(), None)
+
+    async def _round_trip(self):
+        self._stats["calls"] += 1
+        await asyncio.sleep(self.latency)
+
+    def seed(self, database_name: str, collection_name: str, key_field: str, rows: list):
+        """
+        Loads rows without simulated latency. The key field and Email are unique.
+        """
+        for field in (key_field, "Email"):
+            self._index(database_name, collection_name, field)
+            self._unique.add((f"{database_name}.{collection_name}", field))
+        for row in rows:
+            self._add(database_name, collection_name, dict(row))
+
+    def _get_connection(self):
+        return None
+
+    def pool_stats(self):
+        return {"in_use": 0, "max_size": 0, **self._stats}
+
+    async def close(self):
+        pass
+
+    async def check_connection(self, database_name: str, table_name: str):
+        await self._round_trip()
+        return {"status": "connection is live"}
+
+    async def ping(self):
+        await self._round_trip()
+        return {"status": "up", "error": None, "pool": self.pool_stats()}
+
+    @instrumented
+    async def get_data_object(self, database_name: str, collection_name: str, key_field: str, key_value: str):
+        await self._round_trip()
+        row = self._index(database_name, collection_name, key_field).get(str(key_value).lower())
+        if row is None:
+            return {"status": "bad request", "error": f"{key_field} does not exist"}
+        return {"status": "fetched successfully", "details": copy.copy(row), "error": None}
+
+    @instrumented
+    async def get_data_objects(self, database_name: str, collection_name: str, key_field: str, key_values: list):
+        await self._round_trip()
+        index = self._index(database_name, collection_name, key_field)
+        rows = [copy.copy(index[str(key).lower()]) for key in key_values if str(key).lower() in index]
+        return {"status": "fetched successfully", "details": rows, "error": None}
+
+    @instrumented
+    async def list_data_objects(self, database_name: str, collection_name: str, key_field: str,
+                                limit: int, after: str = None):
+        await self._round_trip()
+        rows = sorted(self._rows(database_name, collection_name), key=lambda row: row[key_field])
+        if after is not None:
+            rows = [row for row in rows if row[key_field] > after]
+        page = [copy.copy(row) for row in rows[:limit]]
+        next_key = page[-1][key_field] if len(rows) > limit else None
+        return {"status": "fetched successfully", "details": page, "next": next_key, "error": None}
+
+    @instrumented
+    async def stream_data_objects(self, database_name: str, collection_name: str, key_field: str):
+        await self._round_trip()
+        for row in sorted(self._rows(database_name, collection_name), key=lambda row: row[key_field]):
+            yield copy.copy(row)
+
+    @instrumented
+    async def insert_data_object(self, database_name: str, collection_name: str, data_model: BaseModel):
+        await self._round_trip()
+        try:
+            self._add(database_name, collection_name, data_model.model_dump())
+        except ValueError as e:
+            return {"status": "bad request", "error": str(e)}
+        return {"status": "inserted successfully", "error": None}
+
+    @instrumented
+    async def insert_data_objects(self, database_name: str, collection_name: str, data_models: list):
+        await self._round_trip()
+        details = []
+        for index, data_model in enumerate(data_models):
+            try:
+                self._add(database_name, collection_name, data_model.model_dump())
+                details.append({"index": index, "status": "inserted successfully", "error": None})
+            except ValueError as e:
+                details.append({"index": index, "status": "bad request", "error": str(e)})
+        failed = sum(1 for detail in details if detail["error"] is not None)
+        status = "inserted successfully" if failed == 0 else f"{failed} of {len(details)} rows failed"
+        return {"status": status, "details": details, "error": None}
+
+    async def modify_data_object(self, database_name: str, collection_name: str, data_model: BaseModel,
+                                 key_field=str, key_value=str):
+        return await self.update_data_object(database_name, collection_name, key_field, key_value,
+                                             data_model.model_dump())
+
+    @instrumented
+    async def update_data_object(self, database_name: str, collection_name: str, key_field: str, key_value: str,
+                                 changes: dict, version_field: str = None, expected_version: int = None):
+        if expected_version is not None and version_field is None:
+            return {"status": "bad request", "error": "Versioning is not enabled for this collection"}
+
+        await self._round_trip()
+        row = self._index(database_name, collection_name, key_field).get(str(key_value).lower())
+        if row is None:
+            return {"status": "bad request", "error": f"{key_field} does not exist"}
+        if expected_version is not None and row.get(version_field) != expected_version:
+            return {"status": "precondition failed", "error": f"{version_field} does not match",
+                    version_field: row.get(version_field)}
+
+        self._remove(database_name, collection_name, row)
+        row = {**row, **changes}
+        if version_field is not None:
+            row[version_field] = row.get(version_field, 1) + 1
+        self._add(database_name, collection_name, row)
+
+        result = {"status": "modification successful", "error": None}
+        if expected_version is not None:
+            result[version_field] = row[version_field]
+        return result
+
+    @instrumented
+    async def delete_data_object(self, database_name: str, collection_name: str, key_field: str, key_value: str):
+        await self._round_trip()
+        row = self._index(database_name, collection_name, key_field).get(str(key_value).lower())
+        if row is None:
+            return {"status": "bad request", "error": f"{key_field} does not exist"}
+        self._remove(database_name, collection_name, row)
+        return {"status": "deletion successful", "error": None}
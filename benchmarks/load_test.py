@@ -0,0 +1,324 @@
+"""
+Load test for the user management API. Starts the FastAPI app from app/main.py with
+its real middleware, auth, resources and caches, backed by either the in-memory
+FakeDataService (default, no database needed) or the configured MySQL instance, and
+drives a weighted mix of requests at a fixed concurrency:
+
+    get_user         GET /user (lookup by the caller's Email)
+    get_user_by_id   GET /user/{uid}
+    graphql          POST /GQL/getuser with several aliased getUserById lookups
+    create           POST /user
+    modify           PATCH /user
+    delete           DELETE /user (of a user created during the run)
+
+Latency percentiles (p50/p95/p99), throughput and status codes are reported per
+operation and overall, and can be saved as JSON and compared with an earlier run.
+
+Run from the repository root:
+
+    python -m benchmarks.load_test --requests 5000 --concurrency 50 --output results.json
+    python -m benchmarks.load_test --compare results.json
+    python -m benchmarks.load_test --transport http --backend mysql
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+DEFAULT_MIX = "get_user=40,get_user_by_id=20,graphql=15,create=10,modify=10,delete=5"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=5000, help="Measured requests.")
+    parser.add_argument("--warmup", type=int, default=200, help="Requests sent before measuring.")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Operation weights, e.g. get_user=80,modify=20.")
+    parser.add_argument("--users", type=int, default=1000, help="Users seeded before the run.")
+    parser.add_argument("--graphql-aliases", type=int, default=5, help="Lookups per GraphQL document.")
+    parser.add_argument("--backend", choices=("fake", "mysql"), default="fake")
+    parser.add_argument("--db-latency-ms", type=float, default=0.5, help="Round trip of the fake backend.")
+    parser.add_argument("--transport", choices=("asgi", "http"), default="asgi",
+                        help="asgi calls the app in process; http serves it with uvicorn on a local port.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="Print the change against the results in this JSON file.")
+    return parser.parse_args(argv)
+
+
+def percentile(ordered: list, fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def summarize(samples: list, duration: float) -> dict:
+    latencies = sorted(latency for latency, _ in samples)
+    statuses = {}
+    for _, status in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        "requests": len(samples),
+        "rps": round(len(samples) / duration, 1) if duration else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        "errors": sum(count for status, count in statuses.items() if int(status) >= 400),
+        "status_codes": statuses,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Workload:
+    """
+    Builds the requests of each operation. Tokens are generated up front so that the
+    client side does not sign JWTs while the server is being measured.
+    """
+
+    def __init__(self, args, rng: random.Random):
+        from app.utils.utils import generate_custom_jwt
+
+        self.rng = rng
+        self.aliases = args.graphql_aliases
+        self.graphql_document = "query GetUsers({}) {{ {} }}".format(
+            ", ".join(f"$u{index}: String!" for index in range(self.aliases)),
+            " ".join(f"u{index}: getUserById(uid: $u{index}) "
+                     "{ ... on UserType { UID Email } ... on ErrorResponse { code } }"
+                     for index in range(self.aliases)))
+        self.run_id = uuid.uuid4().hex[:8]
+        self.users = [
+            {"UID": f"bench-{self.run_id}-{index:06d}", "Name": f"Bench User {index}",
+             "Email": f"bench-{self.run_id}-{index}@example.com", "Pic_URL": "example.com",
+             "PhoneNo": "+1234567890", "Address": "123 Main St", "Age": 30}
+            for index in range(args.users)
+        ]
+        self.user_tokens = [
+            generate_custom_jwt({"email": user["Email"], "name": user["Name"], "picture": user["Pic_URL"]}, "user")
+            for user in self.users
+        ]
+        self.organiser_token = generate_custom_jwt(
+            {"email": f"bench-{self.run_id}-organiser@example.com", "name": "Bench Organiser",
+             "picture": "example.com"}, "organiser")
+
+        creates = args.requests + args.warmup + args.concurrency
+        self.create_tokens = [
+            generate_custom_jwt({"email": f"bench-{self.run_id}-new-{index}@example.com", "name": "New User",
+                                 "picture": "example.com"}, "user")
+            for index in range(creates)
+        ]
+        self.created = []
+        self.skipped = 0
+
+    @staticmethod
+    def _auth(token):
+        return {"Authorization": f"Bearer {token}"}
+
+    async def get_user(self, client):
+        return await client.get("/user", headers=self._auth(self.rng.choice(self.user_tokens)))
+
+    async def get_user_by_id(self, client):
+        uid = self.rng.choice(self.users)["UID"]
+        return await client.get(f"/user/{uid}", headers=self._auth(self.organiser_token))
+
+    async def graphql(self, client):
+        # Like real clients, send one document and vary only its variables.
+        variables = {f"u{index}": self.rng.choice(self.users)["UID"] for index in range(self.aliases)}
+        return await client.post("/GQL/getuser", json={"query": self.graphql_document, "variables": variables},
+                                  headers=self._auth(self.organiser_token))
+
+    async def create(self, client):
+        token = self.create_tokens.pop()
+        response = await client.post("/user", json={"PhoneNo": "+1234567890", "Address": "1 Bench Rd", "Age": 25},
+                                     headers=self._auth(token))
+        if response.status_code == 201:
+            self.created.append(token)
+        return response
+
+    async def modify(self, client):
+        return await client.patch("/user", json={"Age": self.rng.randint(18, 90)},
+                                  headers=self._auth(self.rng.choice(self.user_tokens)))
+
+    async def delete(self, client):
+        if not self.created:
+            self.skipped += 1
+            return None
+        return await client.delete("/user", headers=self._auth(self.created.pop()))
+
+
+async def seed(args, workload: Workload):
+    from app.models.user import User
+    from app.services.service_factory import ServiceFactory
+
+    if args.backend == "fake":
+        data_service = ServiceFactory.get_service("AsyncUserResourceDataService")
+        data_service.seed("USER", "user_tab", "UID", workload.users)
+        data_service.seed("ORGANISER", "org_tab", "OID", [])
+        return
+
+    result = await ServiceFactory.get_service("UserResource").bulk_insert_data(
+        [User.model_validate(user) for user in workload.users])
+    if result["error"] is not None:
+        raise RuntimeError(f"Seeding failed: {result['error']}")
+
+
+async def cleanup(args, workload: Workload):
+    from app.services.service_factory import ServiceFactory
+    from app.utils.utils import decode_custom_jwt
+
+    if args.backend == "fake":
+        return
+    resource = ServiceFactory.get_service("UserResource")
+    for user in workload.users:
+        await resource.delete_data_by_key(user["UID"])
+    for token in workload.created:
+        await resource.delete_data_by_custom_key("Email", decode_custom_jwt(token)["email"])
+
+
+async def drive(client, workload: Workload, operations: list, weights: list, count: int, concurrency: int,
+                samples: dict):
+    remaining = count
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            name = workload.rng.choices(operations, weights)[0]
+            started = time.perf_counter()
+            response = await getattr(workload, name)(client)
+            if response is not None:
+                samples.setdefault(name, []).append(((time.perf_counter() - started) * 1000, response.status_code))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started
+
+
+async def run(args) -> dict:
+    import httpx
+
+    import app.middleware.logging as logging_middleware
+    from app.main import app
+
+    # Keep the request log's cost, but not its output.
+    logging_middleware.console_handler.setStream(open(os.devnull, "w"))
+
+    operations, weights = [], []
+    for item in args.mix.split(","):
+        name, weight = item.split("=")
+        if not hasattr(Workload, name.strip()):
+            raise SystemExit(f"Unknown operation '{name}'")
+        operations.append(name.strip())
+        weights.append(float(weight))
+
+    rng = random.Random(args.seed)
+    workload = Workload(args, rng)
+
+    server = server_task = None
+    if args.transport == "http":
+        import uvicorn
+
+        server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning"))
+        server_task = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.05)
+        client = httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}",
+                                   limits=httpx.Limits(max_connections=args.concurrency))
+        lifespan = None
+    else:
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+        lifespan = app.router.lifespan_context(app)
+        await lifespan.__aenter__()
+
+    try:
+        await seed(args, workload)
+        async with client:
+            await drive(client, workload, operations, weights, args.warmup, args.concurrency, {})
+            samples = {}
+            duration = await drive(client, workload, operations, weights, args.requests, args.concurrency, samples)
+        await cleanup(args, workload)
+    finally:
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+        if server is not None:
+            server.should_exit = True
+            await server_task
+
+    everything = [sample for operation_samples in samples.values() for sample in operation_samples]
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")} | {
+            "data_access_mode": os.getenv("DATA_ACCESS_MODE", "async"),
+            "profile_cache_backend": os.getenv("PROFILE_CACHE_BACKEND", "memory"),
+        },
+        "duration_s": round(duration, 3),
+        "total": summarize(everything, duration),
+        "operations": {name: summarize(samples[name], duration) for name in operations if name in samples},
+        "skipped_deletes": workload.skipped,
+    }
+
+
+def report(results: dict, baseline: dict = None):
+    rows = [("total", results["total"])] + list(results["operations"].items())
+    print(f"{'operation':<16} {'requests':>8} {'rps':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name, stats in rows:
+        line = (f"{name:<16} {stats['requests']:>8} {stats['rps']:>9.1f} {stats['p50_ms']:>8.2f} "
+                f"{stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats['errors']:>7}")
+        if baseline is not None:
+            before = baseline["total"] if name == "total" else baseline["operations"].get(name)
+            if before and before["rps"] and before["p95_ms"]:
+                line += (f"   rps {(stats['rps'] / before['rps'] - 1) * 100:+6.1f}%"
+                         f"  p95 {(stats['p95_ms'] / before['p95_ms'] - 1) * 100:+6.1f}%")
+        print(line)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.backend == "fake":
+        # The fake backend implements the async data service interface only.
+        os.environ["DATA_ACCESS_MODE"] = "async"
+        os.environ.setdefault("SCHEMA_INDEX_POLICY", "off")
+
+        from app.services.service_factory import ServiceFactory, _build_data_service
+        from benchmarks.fake_data_service import FakeDataService
+
+        latency = args.db_latency_ms / 1000
+        ServiceFactory.register(
+            "AsyncUserResourceDataService",
+            lambda: _build_data_service(lambda context: FakeDataService({**context, "latency": latency})),
+            on_shutdown=lambda service: service.close())
+
+    results = asyncio.run(run(args))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    report(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,7 +1,75 @@
+import base64
+import hashlib
+import json
 from abc import ABC, abstractmethod
 from typing import Any
 
 
+def order_by_keys(result: dict, key_field: str, keys: list) -> dict:
+    """
+    Turns the result of a data service get_data_objects() call into one entry per
+    requested key, in request order. Keys that were not found get a not-found marker.
+    """
+    if result.get("error") is not None:
+        return result
+
+    # MySQL compares keys case-insensitively, so match them the same way.
+    rows = {str(row[key_field]).lower(): row for row in result["details"]}
+    details = []
+    for key in keys:
+        row = rows.get(str(key).lower())
+        if row is None:
+            details.append({"key": key, "found": False, "error": f"{key_field} does not exist"})
+        else:
+            details.append({"key": key, "found": True, "details": row})
+
+    return {"status": "fetched successfully", "details": details, "error": None}
+
+
+def encode_cursor(after: Any) -> str:
+    """
+    Encodes the last key of a page as an opaque cursor token for the next page.
+    """
+    if after is None:
+        return None
+    return base64.urlsafe_b64encode(json.dumps({"after": after}).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Any:
+    """
+    Decodes a cursor token produced by encode_cursor().
+    :raises ValueError: If the token is malformed.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))["after"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def paginate(result: dict) -> dict:
+    """
+    Replaces the raw next key of a data service list_data_objects() result with a cursor token.
+    """
+    if result.get("error") is not None:
+        return result
+    return {"status": result["status"], "details": result["details"],
+            "next_cursor": encode_cursor(result["next"]), "error": None}
+
+
+def entity_tag(details: dict, version_field: str = None) -> str:
+    """
+    Computes a strong entity tag for a record: its version, in the same form that
+    If-Match accepts, when the collection is versioned, otherwise a hash of its content.
+    """
+    if version_field is not None and details.get(version_field) is not None:
+        return f'"{details[version_field]}"'
+    content = json.dumps(details, sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha256(content.encode()).hexdigest()[:32] + '"'
+
+
 class BaseResource(ABC):
 
     def __init__(self, config):
@@ -15,12 +83,33 @@ class BaseResource(ABC):
     def get_by_custom_key(self, custom_key: str, value: Any) -> Any:
         raise NotImplementedError()
 
+    @abstractmethod
+    def get_by_keys(self, keys: list) -> Any:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def list_data(self, limit: int, cursor: str = None) -> Any:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def stream_data(self) -> Any:
+        raise NotImplementedError()
+
     @abstractmethod
     def insert_data(self, data_model: Any) -> Any:
         raise NotImplementedError()
 
     @abstractmethod
-    def modify_data(self, data_model: Any) -> Any:
+    def bulk_insert_data(self, data_models: list) -> Any:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def modify_data(self, data_model: Any, expected_version: int = None) -> Any:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def patch_data_by_custom_key(self, custom_key: str, value: Any, changes: dict,
+                                expected_version: int = None) -> Any:
         raise NotImplementedError()
 
     @abstractmethod
@@ -29,4 +118,61 @@ class BaseResource(ABC):
 
     @abstractmethod
     def delete_data_by_custom_key(self, custom_key: str, value: Any) -> Any:
-        raise NotImplementedError()
\ No newline at end of file
+        raise NotImplementedError()
+
+class AsyncBaseResource(ABC):
+    """
+    The asyncio counterpart of BaseResource. Every operation is a coroutine so that
+    route handlers can await it without blocking the event loop.
+    """
+
+    def __init__(self, config):
+        self.config = config
+
+    @abstractmethod
+    async def get_by_key(self, key: str) -> Any:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_by_custom_key(self, custom_key: str, value: Any) -> Any:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_by_keys(self, keys: list) -> Any:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def list_data(self, limit: int, cursor: str = None) -> Any:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def stream_data(self) -> Any:
+        """
+        Returns an async iterator over every record, ordered by the primary key.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def insert_data(self, data_model: Any) -> Any:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def bulk_insert_data(self, data_models: list) -> Any:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def modify_data(self, data_model: Any, expected_version: int = None) -> Any:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def patch_data_by_custom_key(self, custom_key: str, value: Any, changes: dict,
+                                      expected_version: int = None) -> Any:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def delete_data_by_key(self, key: str) -> Any:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def delete_data_by_custom_key(self, custom_key: str, value: Any) -> Any:
+        raise NotImplementedError()
@@ -0,0 +1,242 @@
+import threading
+from typing import Any
+
+from framework.resources.base_resource import AsyncBaseResource, entity_tag
+from framework.services.cache.base_cache import BaseCache
+
+
+class CachedResource(AsyncBaseResource):
+    """
+    A read-through cache in front of another AsyncBaseResource.
+
+    Lookups by the primary key and by the fields in `indexed_fields` (e.g. Email) are
+    cached. A found record is stored under every one of those forms, so a write can
+    find and invalidate all of them from any single one. Failed lookups (database
+    errors) are never cached; "does not exist" results are cached only when a
+    negative TTL is configured.
+
+    Found records are cached together with their entity tag, under "etag", so a
+    conditional GET that hits the cache is answered without reading the record again.
+    Callers get copies of cached results and may modify them.
+
+    A read that raced with a write does not cache what it read: every invalidation
+    advances a write epoch, and a read only keeps what it stored if the epoch is the
+    one it started with. Both the epoch and the invalidations are per process; with
+    several workers, use a shared backend (RedisCache), or a short ttl, since other
+    workers' in-memory caches are not told about a write.
+    """
+
+    def __init__(self,
+                 resource: AsyncBaseResource,
+                 cache: BaseCache,
+                 indexed_fields=("Email",),
+                 ttl: float = 300,
+                 negative_ttl: float = 0):
+        """
+        :param resource: The resource that actually talks to the data service.
+        :param cache: The cache backend.
+        :param indexed_fields: Unique fields, besides the primary key, that lookups are cached by.
+        :param ttl: Lifetime of cached records in seconds.
+        :param negative_ttl: Lifetime of cached "does not exist" results. 0 disables negative caching.
+        """
+        super().__init__(resource.config)
+
+        self.resource = resource
+        self.cache = cache
+        self.database = resource.database
+        self.collection = resource.collection
+        self.key_field = resource.key_field
+        self.version_field = getattr(resource, "version_field", None)
+        self.cached_fields = (self.key_field, *indexed_fields)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+        self._lock = threading.Lock()
+        self._write_epoch = 0
+        self._stats = {"hits": 0, "misses": 0, "negative_hits": 0, "invalidations": 0}
+
+    def _cache_key(self, field: str, value: Any) -> str:
+        # MySQL compares these columns case-insensitively, so the cache does too.
+        return f"{self.database}.{self.collection}:{field}:{str(value).lower()}"
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = dict(self._stats)
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_ratio"] = round(snapshot["hits"] / lookups, 4) if lookups else 0.0
+        return snapshot
+
+    @staticmethod
+    def _copy(result: dict) -> dict:
+        # Records are flat rows, so copying the result and its details is enough.
+        details = result.get("details")
+        return {**result, "details": dict(details)} if isinstance(details, dict) else dict(result)
+
+    async def _read_through(self, field: str, value: Any, load):
+        key = self._cache_key(field, value)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            self._count("hits")
+            if cached.get("details") is None:
+                self._count("negative_hits")
+            return self._copy(cached)
+
+        self._count("misses")
+        epoch = self._write_epoch
+        result = await load()
+
+        if result.get("error") is None and result.get("details"):
+            result = await self._store(result, epoch)
+        elif result.get("status") == "bad request" and self.negative_ttl > 0:
+            await self._set(epoch, {key: result}, self.negative_ttl)
+
+        return result
+
+    async def _store(self, result: dict, epoch: int) -> dict:
+        """
+        Caches a found record under each of its forms.
+        :param epoch: The write epoch from before the record was read.
+        :return: A copy of the result, with its entity tag.
+        """
+        details = result["details"]
+        result = {**result, "etag": entity_tag(details, self.version_field)}
+        entries = {self._cache_key(field, details[field]): result
+                   for field in self.cached_fields if details.get(field) is not None}
+        await self._set(epoch, entries, self.ttl)
+        return self._copy(result)
+
+    async def _set(self, epoch: int, entries: dict, ttl: float):
+        """
+        Caches read results unless a write was invalidated since the read began.
+        _invalidate() advances the epoch before it deletes, so entries set before
+        that are deleted by it, and those set after it are dropped here.
+        """
+        if self._write_epoch != epoch:
+            return
+        for key, result in entries.items():
+            await self.cache.set(key, result, ttl)
+        if self._write_epoch != epoch:
+            await self.cache.delete(*entries)
+
+    async def _invalidate(self, *forms):
+        """
+        Drop every cached form of the records identified by `forms`, a list of
+        (field, value) pairs. Cached records are read first to discover their other forms.
+        """
+        with self._lock:
+            self._write_epoch += 1
+
+        keys = set()
+        for field, value in forms:
+            if value is None:
+                continue
+            key = self._cache_key(field, value)
+            keys.add(key)
+            cached = await self.cache.get(key)
+            details = cached.get("details") if cached else None
+            if details:
+                for cached_field in self.cached_fields:
+                    if details.get(cached_field) is not None:
+                        keys.add(self._cache_key(cached_field, details[cached_field]))
+
+        if keys:
+            await self.cache.delete(*keys)
+            self._count("invalidations")
+
+    def _model_forms(self, data_model: Any):
+        return [(field, getattr(data_model, field, None)) for field in self.cached_fields]
+
+    async def get_by_key(self, key: str) -> Any:
+        return await self._read_through(self.key_field, key, lambda: self.resource.get_by_key(key))
+
+    async def get_by_custom_key(self, custom_key: str, value: Any) -> Any:
+        if custom_key not in self.cached_fields:
+            return await self.resource.get_by_custom_key(custom_key, value)
+        return await self._read_through(
+            custom_key, value, lambda: self.resource.get_by_custom_key(custom_key, value)
+        )
+
+    async def get_by_keys(self, keys: list) -> Any:
+        results = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            cached = await self.cache.get(self._cache_key(self.key_field, key))
+            if cached is None:
+                missing.append(key)
+            else:
+                results[key] = cached
+        self._count("hits", len(results))
+        self._count("misses", len(missing))
+
+        if missing:
+            epoch = self._write_epoch
+            fetched = await self.resource.get_by_keys(missing)
+            if fetched.get("error") is not None:
+                return fetched
+
+            for entry in fetched["details"]:
+                if entry["found"]:
+                    result = {"status": "fetched successfully", "details": entry["details"], "error": None}
+                    await self._store(result, epoch)
+                else:
+                    result = {"status": "bad request", "error": entry["error"]}
+                    if self.negative_ttl > 0:
+                        await self._set(epoch, {self._cache_key(self.key_field, entry["key"]): result},
+                                        self.negative_ttl)
+                results[entry["key"]] = result
+
+        details = []
+        for key in keys:
+            result = results[key]
+            if result.get("details"):
+                details.append({"key": key, "found": True, "details": dict(result["details"])})
+            else:
+                details.append({"key": key, "found": False, "error": result["error"]})
+
+        return {"status": "fetched successfully", "details": details, "error": None}
+
+    async def list_data(self, limit: int, cursor: str = None) -> Any:
+        return await self.resource.list_data(limit, cursor)
+
+    def stream_data(self) -> Any:
+        return self.resource.stream_data()
+
+    async def insert_data(self, data_model: Any) -> Any:
+        result = await self.resource.insert_data(data_model)
+        # Clears negative entries for the new record's keys.
+        await self._invalidate(*self._model_forms(data_model))
+        return result
+
+    async def bulk_insert_data(self, data_models: list) -> Any:
+        result = await self.resource.bulk_insert_data(data_models)
+        # New records can only be cached as misses, so there is nothing to drop
+        # unless negative caching is on.
+        if self.negative_ttl > 0:
+            for data_model in data_models:
+                await self._invalidate(*self._model_forms(data_model))
+        return result
+
+    async def modify_data(self, data_model: Any, expected_version: int = None) -> Any:
+        result = await self.resource.modify_data(data_model, expected_version)
+        await self._invalidate(*self._model_forms(data_model))
+        return result
+
+    async def patch_data_by_custom_key(self, custom_key: str, value: Any, changes: dict,
+                                      expected_version: int = None) -> Any:
+        result = await self.resource.patch_data_by_custom_key(custom_key, value, changes, expected_version)
+        await self._invalidate((custom_key, value), *[(field, changes.get(field)) for field in self.cached_fields])
+        return result
+
+    async def delete_data_by_key(self, key: str) -> Any:
+        result = await self.resource.delete_data_by_key(key)
+        await self._invalidate((self.key_field, key))
+        return result
+
+    async def delete_data_by_custom_key(self, custom_key: str, value: Any) -> Any:
+        result = await self.resource.delete_data_by_custom_key(custom_key, value)
+        await self._invalidate((custom_key, value))
+        return result
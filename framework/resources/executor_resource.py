@@ -0,0 +1,71 @@
+from itertools import islice
+from typing import Any
+
+from framework.resources.base_resource import AsyncBaseResource, BaseResource
+from framework.services.executor import BoundedExecutor
+
+
+class ExecutorResource(AsyncBaseResource):
+    """
+    Adapts a synchronous BaseResource to the AsyncBaseResource interface by running
+    every call on a bounded executor. This keeps the event loop free while the
+    resource still talks to the database through a blocking driver.
+    """
+
+    def __init__(self, resource: BaseResource, executor: BoundedExecutor):
+        super().__init__(resource.config)
+
+        self.resource = resource
+        self.executor = executor
+        self.database = resource.database
+        self.collection = resource.collection
+        self.key_field = resource.key_field
+        self.version_field = getattr(resource, "version_field", None)
+
+    async def get_by_key(self, key: str) -> Any:
+        return await self.executor.run(self.resource.get_by_key, key)
+
+    async def get_by_custom_key(self, custom_key: str, value: Any) -> Any:
+        return await self.executor.run(self.resource.get_by_custom_key, custom_key, value)
+
+    async def get_by_keys(self, keys: list) -> Any:
+        return await self.executor.run(self.resource.get_by_keys, keys)
+
+    async def list_data(self, limit: int, cursor: str = None) -> Any:
+        return await self.executor.run(self.resource.list_data, limit, cursor)
+
+    async def stream_data(self, batch_size: int = 500):
+        # The blocking iterator is advanced on the executor one batch at a time.
+        iterator = iter(self.resource.stream_data())
+        try:
+            while True:
+                rows = await self.executor.run(lambda: list(islice(iterator, batch_size)))
+                if not rows:
+                    break
+                for row in rows:
+                    yield row
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                # Never rejected, or the dedicated streaming connection would leak.
+                await self.executor.run_cleanup(close)
+
+    async def insert_data(self, data_model: Any) -> Any:
+        return await self.executor.run(self.resource.insert_data, data_model)
+
+    async def bulk_insert_data(self, data_models: list) -> Any:
+        return await self.executor.run(self.resource.bulk_insert_data, data_models)
+
+    async def modify_data(self, data_model: Any, expected_version: int = None) -> Any:
+        return await self.executor.run(self.resource.modify_data, data_model, expected_version)
+
+    async def patch_data_by_custom_key(self, custom_key: str, value: Any, changes: dict,
+                                      expected_version: int = None) -> Any:
+        return await self.executor.run(self.resource.patch_data_by_custom_key, custom_key, value, changes,
+                                       expected_version)
+
+    async def delete_data_by_key(self, key: str) -> Any:
+        return await self.executor.run(self.resource.delete_data_by_key, key)
+
+    async def delete_data_by_custom_key(self, custom_key: str, value: Any) -> Any:
+        return await self.executor.run(self.resource.delete_data_by_custom_key, custom_key, value)
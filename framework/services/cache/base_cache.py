@@ -0,0 +1,42 @@
+from abc import ABC, abstractmethod
+from typing import Any
+
+
+class BaseCache(ABC):
+    """
+    Abstract base class for key/value cache backends used by the resource layer.
+    Operations are coroutines so that network backends do not block the event loop.
+    """
+
+    def __init__(self, context):
+        """
+        :param context: Backend configuration (sizes, TTLs, connection URLs, ...).
+        """
+        self.context = context
+
+    @abstractmethod
+    async def get(self, key: str) -> Any:
+        """
+        :return: The cached value, or None if the key is missing or expired.
+        """
+        raise NotImplementedError('Abstract method get()')
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float = None):
+        """
+        Store a value. A ttl of None uses the backend default.
+        """
+        raise NotImplementedError('Abstract method set()')
+
+    @abstractmethod
+    async def delete(self, *keys: str):
+        """
+        Remove keys from the cache. Missing keys are ignored.
+        """
+        raise NotImplementedError('Abstract method delete()')
+
+    async def close(self):
+        """
+        Release backend resources. Called on application shutdown.
+        """
+        pass
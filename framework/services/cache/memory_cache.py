@@ -0,0 +1,49 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from .base_cache import BaseCache
+
+
+class InMemoryTTLCache(BaseCache):
+    """
+    A process-local cache with a per-entry TTL and LRU eviction once maxsize entries
+    are stored. Expired entries are dropped lazily when they are read or evicted.
+    """
+
+    def __init__(self, context):
+        super().__init__(context)
+
+        self.maxsize = self.context.get("maxsize", 10000)
+        self.default_ttl = self.context.get("ttl", 300)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: Any, ttl: float = None):
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
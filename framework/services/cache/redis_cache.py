@@ -0,0 +1,42 @@
+import json
+from typing import Any
+
+from .base_cache import BaseCache
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:  # pragma: no cover - optional dependency
+    redis_asyncio = None
+
+
+class RedisCache(BaseCache):
+    """
+    A cache backend for Redis (or any server speaking the Redis protocol). Values are
+    stored as JSON so that they can be shared between worker processes.
+    Requires the optional `redis` package.
+    """
+
+    def __init__(self, context):
+        super().__init__(context)
+
+        if redis_asyncio is None:
+            raise ImportError("RedisCache requires the 'redis' package (pip install redis)")
+
+        self.default_ttl = self.context.get("ttl", 300)
+        self.prefix = self.context.get("prefix", "usermgmt:")
+        self._client = redis_asyncio.from_url(self.context.get("url", "redis://localhost:6379/0"))
+
+    async def get(self, key: str) -> Any:
+        data = await self._client.get(self.prefix + key)
+        return None if data is None else json.loads(data)
+
+    async def set(self, key: str, value: Any, ttl: float = None):
+        ttl = self.default_ttl if ttl is None else ttl
+        await self._client.set(self.prefix + key, json.dumps(value, default=str), px=int(ttl * 1000))
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self._client.delete(*[self.prefix + key for key in keys])
+
+    async def close(self):
+        await self._client.aclose()
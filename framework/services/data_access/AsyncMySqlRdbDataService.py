@@ -0,0 +1,604 @@
+import asyncio
+import time
+
+import aiomysql
+import pymysql
+from pydantic import BaseModel
+from pymysql import MySQLError
+
+from .BaseDataService import BaseDataService
+from .Instrumentation import instrumented, report_checkout
+from .StatementCache import StatementCache
+
+
+class AsyncMySqlRdbDataService(BaseDataService):
+    """
+    An asyncio data service for MySQL databases built on aiomysql. It implements the
+    BaseDataService contract with coroutines so that FastAPI handlers can await
+    queries instead of blocking the event loop. The connection pool is created
+    lazily on first use, inside the running loop.
+    """
+
+    def __init__(self, context):
+        super().__init__(context)
+
+        self.statements = StatementCache(self.context.get("statement_cache_size", 256))
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time_ms": 0.0,
+            "timeouts": 0,
+        }
+
+    async def _get_pool(self):
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    self._pool = await aiomysql.create_pool(
+                        host=self.context["host"],
+                        port=self.context["port"],
+                        user=self.context["user"],
+                        password=self.context["password"],
+                        cursorclass=aiomysql.DictCursor,
+                        client_flag=pymysql.constants.CLIENT.FOUND_ROWS,
+                        autocommit=True,
+                        minsize=self.context.get("pool_min_size", 0),
+                        maxsize=self.context.get("pool_max_size", 10),
+                        pool_recycle=self.context.get("pool_max_lifetime", 3600)
+                    )
+        return self._pool
+
+    async def _get_connection(self):
+        """
+        Check a connection out of the pool. Callers must hand it back with
+        _release_connection() once they are done with it.
+        """
+        checkout_started = time.perf_counter()
+        pool = await self._get_pool()
+        saturated = pool.freesize == 0 and pool.size >= pool.maxsize
+        if saturated:
+            self._stats["waits"] += 1
+        started = time.monotonic()
+
+        try:
+            connection = await asyncio.wait_for(
+                pool.acquire(), timeout=self.context.get("pool_checkout_timeout", 10.0)
+            )
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            raise asyncio.TimeoutError(
+                f"Timed out waiting for a connection (max_size={pool.maxsize})"
+            )
+
+        if saturated:
+            self._stats["wait_time_ms"] += (time.monotonic() - started) * 1000
+        self._stats["checkouts"] += 1
+        if self.instruments:
+            report_checkout(self, checkout_started)
+        return connection
+
+    async def _release_connection(self, connection, error: Exception = None, discard: bool = False):
+        """
+        Return a connection to the pool. Connections that failed with a driver-level
+        error, or that `discard` is set for, are closed so that the pool replaces them.
+        Queries cancelled part-way (e.g. by a client disconnect) discard their
+        connection: it may still hold unread result packets for the next borrower.
+        """
+        if connection is None:
+            return
+        if discard or isinstance(error, (pymysql.err.OperationalError, pymysql.err.InterfaceError)):
+            connection.close()
+        self._pool.release(connection)
+
+    def pool_stats(self):
+        """
+        Returns a snapshot of the connection pool counters (in use, idle, waits, wait time, ...).
+        """
+        snapshot = dict(self._stats)
+        snapshot["wait_time_ms"] = round(snapshot["wait_time_ms"], 3)
+        if self._pool is None:
+            snapshot.update({"in_use": 0, "idle": 0, "size": 0,
+                             "max_size": self.context.get("pool_max_size", 10)})
+        else:
+            snapshot.update({
+                "in_use": self._pool.size - self._pool.freesize,
+                "idle": self._pool.freesize,
+                "size": self._pool.size,
+                "min_size": self._pool.minsize,
+                "max_size": self._pool.maxsize,
+            })
+        return snapshot
+
+    async def close(self):
+        """
+        Close the pooled connections. Called on application shutdown.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+            self._pool = None
+
+    async def check_connection(self, database_name: str, table_name: str):
+        """
+        See MySqlRdbDataService.check_connection().
+        """
+        connection = None
+        try:
+            connection = await self._get_connection()
+            async with connection.cursor() as cursor:
+                query = f"SELECT 1 FROM {database_name}.{table_name} LIMIT 1"
+                await cursor.execute(query)
+                await cursor.fetchall()
+
+            return {"status": "connection is live"}
+
+        except (MySQLError, asyncio.TimeoutError) as e:
+            await self._release_connection(connection, e)
+            connection = None
+            return {"status": "connection failed"}
+
+        except BaseException:
+            await self._release_connection(connection, discard=True)
+            connection = None
+            raise
+
+        finally:
+            await self._release_connection(connection)
+
+    async def ping(self):
+        """
+        See MySqlRdbDataService.ping().
+        """
+        started = time.perf_counter()
+        connection = None
+        try:
+            connection = await self._get_connection()
+            checkout_ms = (time.perf_counter() - started) * 1000
+            async with connection.cursor() as cursor:
+                await cursor.execute("SELECT 1")
+                await cursor.fetchall()
+            result = {"status": "up", "checkout_ms": round(checkout_ms, 3), "error": None}
+
+        except Exception as e:
+            await self._release_connection(connection, e)
+            connection = None
+            result = {"status": "down", "error": str(e)}
+
+        except BaseException:
+            await self._release_connection(connection, discard=True)
+            connection = None
+            raise
+
+        finally:
+            await self._release_connection(connection)
+
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        result["pool"] = self.pool_stats()
+        return result
+
+    @instrumented
+    async def insert_data_object(
+        self,
+        database_name: str,
+        collection_name: str,
+        data_model: BaseModel
+    ):
+        """
+        See base class for comments.
+        """
+
+        connection = None
+        try:
+            # Dump the model once; its field order is the statement's column order
+            data = data_model.model_dump()
+            sql_statement = self.statements.insert(database_name, collection_name, tuple(data))
+            values = tuple(data.values())
+
+            connection = await self._get_connection()
+            async with connection.cursor() as cursor:
+                await cursor.execute(sql_statement, values)
+
+            return {"status": "inserted successfully", "error": None}
+
+        except Exception as e:
+            if connection is None:
+                result = {"status": "internal server error ", "error": str(e)}
+            else:
+                result = {"status": "bad request", "error": str(e)}
+
+            await self._release_connection(connection, e)
+            connection = None
+
+            return result
+
+        except BaseException:
+            await self._release_connection(connection, discard=True)
+            connection = None
+            raise
+
+        finally:
+            await self._release_connection(connection)
+
+    @instrumented
+    async def insert_data_objects(
+        self,
+        database_name: str,
+        collection_name: str,
+        data_models: list
+    ):
+        """
+        See base class for comments.
+
+        Rows are written in chunks of `max_rows_per_insert` with one multi-row INSERT
+        per chunk, each chunk in its own transaction. If a chunk fails (e.g. a duplicate
+        key), it is rolled back and its rows are retried one by one so that every row
+        gets its own result and the valid rows are still written.
+        """
+
+        connection = None
+        # Set while a chunk's transaction is open. A connection left in a transaction
+        # (by an unexpected error or a cancellation) is discarded, never pooled.
+        in_transaction = False
+        # Set by a driver-level error such as a lost connection; no further rows are tried.
+        lost = None
+        try:
+            rows = [data_model.model_dump() for data_model in data_models]
+            details = [None] * len(rows)
+            if not rows:
+                return {"status": "inserted successfully", "details": details, "error": None}
+
+            fields = tuple(rows[0])
+            chunk_size = self.context.get("max_rows_per_insert", 500)
+
+            connection = await self._get_connection()
+            async with connection.cursor() as cursor:
+                for start in range(0, len(rows), chunk_size):
+                    chunk = rows[start:start + chunk_size]
+                    values = [row[field] for row in chunk for field in fields]
+                    sql_statement = self.statements.insert(database_name, collection_name, fields, len(chunk))
+                    try:
+                        await connection.begin()
+                        in_transaction = True
+                        await cursor.execute(sql_statement, values)
+                        await connection.commit()
+                        in_transaction = False
+                        for index in range(start, start + len(chunk)):
+                            details[index] = {"index": index, "status": "inserted successfully", "error": None}
+                    except MySQLError as e:
+                        if isinstance(e, (pymysql.err.OperationalError, pymysql.err.InterfaceError)):
+                            lost = e
+                            break
+                        await connection.rollback()
+                        in_transaction = False
+                        for offset, row in enumerate(chunk):
+                            index = start + offset
+                            try:
+                                await cursor.execute(self.statements.insert(database_name, collection_name, fields),
+                                                     [row[field] for field in fields])
+                                details[index] = {"index": index, "status": "inserted successfully", "error": None}
+                            except (pymysql.err.OperationalError, pymysql.err.InterfaceError) as e:
+                                lost = e
+                                break
+                            except MySQLError as e:
+                                details[index] = {"index": index, "status": "bad request", "error": str(e)}
+                        if lost is not None:
+                            break
+
+            # The rows that were not written when the connection failed get its error.
+            for index, detail in enumerate(details):
+                if detail is None:
+                    details[index] = {"index": index, "status": "failed", "error": str(lost)}
+
+            failed = sum(1 for detail in details if detail["error"] is not None)
+            status = "inserted successfully" if failed == 0 else f"{failed} of {len(details)} rows failed"
+            return {"status": status, "details": details, "error": None}
+
+        except Exception as e:
+            if connection is None:
+                result = {"status": "internal server error ", "error": str(e)}
+            else:
+                result = {"status": "bad request", "error": str(e)}
+
+            await self._release_connection(connection, e, discard=in_transaction)
+            connection = None
+
+            return result
+
+        except BaseException:
+            await self._release_connection(connection, discard=True)
+            connection = None
+            raise
+
+        finally:
+            await self._release_connection(connection, discard=in_transaction or lost is not None)
+
+    @instrumented
+    async def get_data_object(
+        self,
+        database_name: str,
+        collection_name: str,
+        key_field: str,
+        key_value: str
+    ):
+        """
+        See base class for comments.
+        """
+
+        connection = None
+        try:
+            sql_statement = self.statements.select_by_key(database_name, collection_name, key_field)
+            connection = await self._get_connection()
+            async with connection.cursor() as cursor:
+                await cursor.execute(sql_statement, [key_value])
+                result = await cursor.fetchone()
+
+            if result is None:
+                return {"status": "bad request", "error": f"{key_field} does not exist"}
+            else:
+                return {"status": "fetched successfully", "details": result, "error": None}
+
+        except Exception as e:
+            await self._release_connection(connection, e)
+            connection = None
+            result = {"status": "failed", "error": str(e)}
+
+        except BaseException:
+            await self._release_connection(connection, discard=True)
+            connection = None
+            raise
+
+        finally:
+            await self._release_connection(connection)
+
+        return result
+
+    @instrumented
+    async def get_data_objects(
+        self,
+        database_name: str,
+        collection_name: str,
+        key_field: str,
+        key_values: list
+    ):
+        """
+        See base class for comments.
+        """
+
+        connection = None
+        try:
+            chunk_size = self.context.get("max_keys_per_query", 1000)
+            rows = []
+            connection = await self._get_connection()
+            async with connection.cursor() as cursor:
+                for start in range(0, len(key_values), chunk_size):
+                    chunk = key_values[start:start + chunk_size]
+                    sql_statement, parameters = self.statements.select_in(database_name, collection_name, key_field, chunk)
+                    await cursor.execute(sql_statement, parameters)
+                    rows.extend(await cursor.fetchall())
+            result = {"status": "fetched successfully", "details": rows, "error": None}
+
+        except Exception as e:
+            await self._release_connection(connection, e)
+            connection = None
+            result = {"status": "failed", "error": str(e)}
+
+        except BaseException:
+            await self._release_connection(connection, discard=True)
+            connection = None
+            raise
+
+        finally:
+            await self._release_connection(connection)
+
+        return result
+
+    @instrumented
+    async def list_data_objects(
+        self,
+        database_name: str,
+        collection_name: str,
+        key_field: str,
+        limit: int,
+        after: str = None
+    ):
+        """
+        See base class for comments.
+        """
+
+        connection = None
+        try:
+            # One extra row tells whether there is a next page.
+            sql_statement = self.statements.select_page(database_name, collection_name, key_field, after is not None)
+            args = [limit + 1] if after is None else [after, limit + 1]
+
+            connection = await self._get_connection()
+            async with connection.cursor() as cursor:
+                await cursor.execute(sql_statement, args)
+                rows = await cursor.fetchall()
+
+            next_key = rows[limit - 1][key_field] if len(rows) > limit else None
+            result = {"status": "fetched successfully", "details": list(rows[:limit]),
+                      "next": next_key, "error": None}
+
+        except Exception as e:
+            await self._release_connection(connection, e)
+            connection = None
+            result = {"status": "failed", "error": str(e)}
+
+        except BaseException:
+            await self._release_connection(connection, discard=True)
+            connection = None
+            raise
+
+        finally:
+            await self._release_connection(connection)
+
+        return result
+
+    @instrumented
+    async def stream_data_objects(
+        self,
+        database_name: str,
+        collection_name: str,
+        key_field: str
+    ):
+        """
+        See base class for comments.
+
+        Uses an unbuffered (server-side) cursor on a dedicated connection so that a long
+        export neither holds a pooled connection nor buffers the result set in memory.
+        """
+
+        connection = await aiomysql.connect(
+            host=self.context["host"],
+            port=self.context["port"],
+            user=self.context["user"],
+            password=self.context["password"],
+            autocommit=True
+        )
+        try:
+            cursor = await connection.cursor(aiomysql.SSDictCursor)
+            await cursor.execute(self.statements.select_all(database_name, collection_name, key_field))
+            batch_size = self.context.get("stream_batch_size", 500)
+            while True:
+                rows = await cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row
+            # Only close the cursor once it is drained; closing the connection is enough
+            # to abandon an unfinished result set.
+            await cursor.close()
+        finally:
+            connection.close()
+
+    async def modify_data_object(
+            self,
+            database_name: str,
+            collection_name: str,
+            data_model: BaseModel,
+            key_field=str,
+            key_value=str
+    ):
+        """
+        See base class for comments.
+
+        Writes every field of the model; see update_data_object() for partial updates.
+        """
+
+        return await self.update_data_object(database_name, collection_name, key_field, key_value,
+                                             data_model.model_dump())
+
+    @instrumented
+    async def update_data_object(
+            self,
+            database_name: str,
+            collection_name: str,
+            key_field: str,
+            key_value: str,
+            changes: dict,
+            version_field: str = None,
+            expected_version: int = None
+    ):
+        """
+        See base class for comments.
+        """
+
+        if expected_version is not None and version_field is None:
+            return {"status": "bad request", "error": "Versioning is not enabled for this collection"}
+
+        connection = None
+        try:
+            check_version = expected_version is not None
+            sql_statement = self.statements.update(database_name, collection_name, tuple(changes), key_field,
+                                                   version_field, check_version)
+            args = [*changes.values(), key_value]
+            if check_version:
+                args.append(expected_version)
+
+            connection = await self._get_connection()
+            async with connection.cursor() as cursor:
+                await cursor.execute(sql_statement, args)
+                # Connections report matched rather than changed rows, so 0 means no row matched.
+                if cursor.rowcount > 0:
+                    result = {"status": "modification successful", "error": None}
+                    if check_version:
+                        result[version_field] = expected_version + 1
+                    return result
+
+                if not check_version:
+                    return {"status": "bad request", "error": f"{key_field} does not exist"}
+
+                # Tell a missing row from a stale version; only paid for on a failed update.
+                await cursor.execute(self.statements.select_by_key(database_name, collection_name, key_field),
+                                     [key_value])
+                current = await cursor.fetchone()
+
+            if current is None:
+                return {"status": "bad request", "error": f"{key_field} does not exist"}
+            return {"status": "precondition failed", "error": f"{version_field} does not match",
+                    version_field: current[version_field]}
+
+        except Exception as e:
+            if connection is None:
+                result = {"status": "internal server error ", "error": str(e)}
+            else:
+                result = {"status": "bad request", "error": str(e)}
+
+            await self._release_connection(connection, e)
+            connection = None
+
+            return result
+
+        except BaseException:
+            await self._release_connection(connection, discard=True)
+            connection = None
+            raise
+
+        finally:
+            await self._release_connection(connection)
+
+    @instrumented
+    async def delete_data_object(
+            self,
+            database_name: str,
+            collection_name: str,
+            key_field: str,
+            key_value: str
+    ):
+
+        connection = None
+        try:
+            sql_statement = self.statements.delete(database_name, collection_name, key_field)
+            connection = await self._get_connection()
+            async with connection.cursor() as cursor:
+                await cursor.execute(sql_statement, [key_value])
+                deleted_count = cursor.rowcount
+
+            if deleted_count == 0:
+                result = {"status": "bad request", "error": f"{key_field} does not exist"}
+            else:
+                result = {"status": "deletion successful", "error": None}
+
+            return result
+
+        except Exception as e:
+            if connection is None:
+                result = {"status": "internal server error", "error": str(e)}
+            else:
+                result = {"status": "bad request", "error": str(e)}
+
+            await self._release_connection(connection, e)
+            connection = None
+
+            return result
+
+        except BaseException:
+            await self._release_connection(connection, discard=True)
+            connection = None
+            raise
+
+        finally:
+            await self._release_connection(connection)
@@ -20,6 +20,21 @@ class BaseDataService(ABC):
         :param context:
         """
         self.context = context
+        self.instruments = []
+        self.resource_tags = {}
+
+    def add_instrument(self, instrument):
+        """
+        Register a QueryInstrument. Its hooks are called around every operation and
+        connection checkout of this data service.
+        """
+        self.instruments.append(instrument)
+
+    def tag_resource(self, database_name: str, collection_name: str, resource_name: str):
+        """
+        Attribute measurements on a table to the resource that owns it, e.g. "UserResource".
+        """
+        self.resource_tags[f"{database_name}.{collection_name}"] = resource_name
 
     @abstractmethod
     def _get_connection(self):
@@ -47,6 +62,61 @@ class BaseDataService(ABC):
         """
         raise NotImplementedError('Abstract method get_data_object()')
 
+    @abstractmethod
+    def get_data_objects(self,
+                    database_name: str,
+                    collection_name: str,
+                    key_field: str,
+                    key_values: list):
+        """
+        Gets the data objects whose unique key is one of `key_values`, using as few
+        queries as possible (large key sets are split into chunks).
+
+        :param database_name: Name of the database or similar abstraction.
+        :param collection_name: The name of the collection, table, etc. in the database.
+        :param key_field: A single column, field, ... that is a unique key/identifier.
+        :param key_values: The values for the column, field, ... to fetch.
+        :return: The objects that were found, in no particular order.
+        """
+        raise NotImplementedError('Abstract method get_data_objects()')
+
+    @abstractmethod
+    def list_data_objects(self,
+                    database_name: str,
+                    collection_name: str,
+                    key_field: str,
+                    limit: int,
+                    after: str = None):
+        """
+        Gets one page of data objects ordered by a unique key, using keyset (seek)
+        pagination: the page starts right after the key `after` instead of at an offset,
+        so every page costs the same no matter how deep it is.
+
+        :param database_name: Name of the database or similar abstraction.
+        :param collection_name: The name of the collection, table, etc. in the database.
+        :param key_field: The unique key the objects are ordered and paged by.
+        :param limit: Maximum number of objects in the page.
+        :param after: The last key of the previous page, or None for the first page.
+        :return: The page of objects and the key to continue after (None on the last page).
+        """
+        raise NotImplementedError('Abstract method list_data_objects()')
+
+    @abstractmethod
+    def stream_data_objects(self,
+                    database_name: str,
+                    collection_name: str,
+                    key_field: str):
+        """
+        Iterates over every data object in a collection, ordered by a unique key,
+        without loading the whole collection in memory (e.g. with a server-side cursor).
+
+        :param database_name: Name of the database or similar abstraction.
+        :param collection_name: The name of the collection, table, etc. in the database.
+        :param key_field: The unique key the objects are ordered by.
+        :return: An iterator over the objects.
+        """
+        raise NotImplementedError('Abstract method stream_data_objects()')
+
     @abstractmethod
     def insert_data_object(self,
                         database_name: str,
@@ -63,6 +133,23 @@ class BaseDataService(ABC):
         """
         raise NotImplementedError('Abstract method get_data_object()')
 
+    @abstractmethod
+    def insert_data_objects(self,
+                        database_name: str,
+                        collection_name: str,
+                        data_models: list):
+        """
+        Persist many data objects of the same type into a table in a database, using
+        multi-row inserts. Collection is an abstraction of a table in the relational
+        model, collection in MongoDB, etc.
+
+        :param data_models: The data objects (tuples) to be added to the table
+        :param database_name: Name of the database or similar abstraction.
+        :param collection_name: The name of the collection, table, etc. in the database.
+        :return: Appropriate message, with one result per data object in input order
+        """
+        raise NotImplementedError('Abstract method insert_data_objects()')
+
     @abstractmethod
     def modify_data_object(self,
                            database_name: str,
@@ -79,6 +166,30 @@ class BaseDataService(ABC):
         """
         raise NotImplementedError('Abstract method get_data_object()')
 
+    @abstractmethod
+    def update_data_object(self,
+                           database_name: str,
+                           collection_name: str,
+                           key_field: str,
+                           key_value: str,
+                           changes: dict,
+                           version_field: str = None,
+                           expected_version: int = None):
+        """
+        Write only the given fields of a single data object. If `version_field` is set, the
+        version is incremented with the update; if `expected_version` is also set, the
+        update only applies while the stored version still matches (optimistic concurrency).
+
+        :param key_field: A single column, field, ... that is a unique key/identifier.
+        :param key_value: The value for the column, field, ... ...
+        :param changes: Mapping of field name to new value. Only these fields are written.
+        :param version_field: The version column, or None if the collection is not versioned.
+        :param expected_version: The version the caller last read, or None to skip the check.
+        :return: Appropriate message. "precondition failed" with the current version if the
+            stored version no longer matches.
+        """
+        raise NotImplementedError('Abstract method update_data_object()')
+
     @abstractmethod
     def delete_data_object(self,
                            database_name: str,
@@ -0,0 +1,331 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class PoolTimeoutError(Exception):
+    """
+    Raised when a connection could not be checked out of the pool before the
+    checkout timeout expired.
+    """
+    pass
+
+
+class PoolClosedError(Exception):
+    """
+    Raised when a connection is requested from a pool that has been closed.
+    """
+    pass
+
+
+class ConnectionPool:
+    """
+    A bounded, thread-safe pool of database connections. The pool does not know
+    anything about a specific driver. It is given a factory that creates a new
+    connection, a health check that validates a connection on checkout and a
+    closer that disposes of one.
+
+    Idle connections are reused in LIFO order so that a small working set stays
+    warm while the rest age out through idle eviction.
+    """
+
+    def __init__(self,
+                 factory,
+                 min_size: int = 0,
+                 max_size: int = 10,
+                 checkout_timeout: float = 10.0,
+                 idle_timeout: float = 300.0,
+                 max_lifetime: float = 3600.0,
+                 health_check=None,
+                 closer=None):
+        """
+        :param factory: A callable that returns a new, open connection.
+        :param min_size: Number of connections kept open even when idle.
+        :param max_size: Upper bound on open connections (idle + in use).
+        :param checkout_timeout: Seconds to wait for a free connection before raising PoolTimeoutError.
+        :param idle_timeout: Seconds an idle connection may sit in the pool before it is closed.
+        :param max_lifetime: Seconds after creation when a connection is retired, whatever its state.
+        :param health_check: A callable(connection) that raises or returns False if the connection is unusable.
+        :param closer: A callable(connection) that closes a connection. Defaults to connection.close().
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+
+        self._factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self._health_check = health_check
+        self._closer = closer
+
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+
+        # Idle entries are (connection, created_at, returned_at).
+        self._idle = deque()
+        # Connections currently checked out, keyed by id(), value is created_at.
+        self._in_use = {}
+        # Connections being opened outside the lock, counted against max_size.
+        self._opening = 0
+        self._closed = False
+
+        self._stats = {
+            "created": 0,
+            "destroyed": 0,
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time_ms": 0.0,
+            "timeouts": 0,
+            "failed_health_checks": 0,
+            "evicted_idle": 0,
+            "evicted_lifetime": 0,
+        }
+
+        self._fill_min()
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    def acquire(self, timeout: float = None):
+        """
+        Check a connection out of the pool, opening a new one if the pool has
+        spare capacity. Blocks up to `timeout` (defaults to checkout_timeout).
+        :return: An open connection that must be given back with release().
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited = False
+        wait_started = None
+
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise PoolClosedError("Connection pool is closed")
+                expired = self._evict_expired_locked()
+
+            # Expired connections are closed outside the lock, so a slow close does not stall other threads.
+            for connection in expired:
+                self._dispose(connection)
+
+            with self._lock:
+                if self._closed:
+                    raise PoolClosedError("Connection pool is closed")
+
+                entry = None
+                must_open = False
+                while True:
+                    if self._idle:
+                        entry = self._idle.pop()
+                        # Counted as checked out while it is health checked outside the lock,
+                        # so that other threads do not see its slot as free capacity.
+                        self._in_use[id(entry[0])] = entry[1]
+                        break
+                    if self._size_locked() < self.max_size:
+                        self._opening += 1
+                        must_open = True
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeoutError(
+                            f"Timed out after {timeout:.2f}s waiting for a connection "
+                            f"(max_size={self.max_size})"
+                        )
+                    if not waited:
+                        waited = True
+                        wait_started = time.monotonic()
+                        self._stats["waits"] += 1
+                    self._available.wait(remaining)
+                    if self._closed:
+                        raise PoolClosedError("Connection pool is closed")
+
+                if waited:
+                    self._stats["wait_time_ms"] += (time.monotonic() - wait_started) * 1000
+                    waited = False
+
+            if must_open:
+                connection, created_at = self._open()
+                with self._lock:
+                    self._in_use[id(connection)] = created_at
+                    self._stats["checkouts"] += 1
+                return connection
+
+            connection = entry[0]
+            if self._is_healthy(connection):
+                with self._lock:
+                    self._stats["checkouts"] += 1
+                return connection
+
+            # The idle connection went bad; drop it, free its slot and try again.
+            with self._lock:
+                self._in_use.pop(id(connection), None)
+                self._stats["failed_health_checks"] += 1
+                self._available.notify()
+            self._dispose(connection)
+
+    def release(self, connection, discard: bool = False):
+        """
+        Give a connection back to the pool. Connections that are broken, past
+        their lifetime or returned to a closed pool are closed instead.
+        :param connection: A connection previously returned by acquire().
+        :param discard: Close the connection rather than returning it to the pool.
+        """
+        now = time.monotonic()
+        with self._lock:
+            created_at = self._in_use.pop(id(connection), None)
+            if created_at is None:
+                return
+
+            expired = self.max_lifetime is not None and now - created_at >= self.max_lifetime
+            if expired:
+                self._stats["evicted_lifetime"] += 1
+
+            if discard or expired or self._closed or not getattr(connection, "open", True):
+                keep = False
+            else:
+                self._idle.append((connection, created_at, now))
+                keep = True
+            self._available.notify()
+
+        if not keep:
+            self._dispose(connection)
+            self._fill_min()
+
+    @contextmanager
+    def connection(self, timeout: float = None):
+        """
+        Context manager that checks a connection out and always gives it back.
+        A connection that the driver left closed is discarded on release.
+        """
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """
+        Close every idle connection and refuse further checkouts. Connections still
+        checked out are closed when they are released.
+        """
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._available.notify_all()
+
+        for connection, _, _ in idle:
+            self._dispose(connection)
+
+    def stats(self) -> dict:
+        """
+        A snapshot of pool usage counters.
+        """
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot.update({
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+                "size": self._size_locked(),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "closed": self._closed,
+            })
+        snapshot["wait_time_ms"] = round(snapshot["wait_time_ms"], 3)
+        return snapshot
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+
+    def _size_locked(self):
+        return len(self._idle) + len(self._in_use) + self._opening
+
+    def _open(self):
+        try:
+            connection = self._factory()
+        except Exception:
+            with self._lock:
+                self._opening -= 1
+                self._available.notify()
+            raise
+
+        with self._lock:
+            self._opening -= 1
+            self._stats["created"] += 1
+        return connection, time.monotonic()
+
+    def _is_healthy(self, connection):
+        if not getattr(connection, "open", True):
+            return False
+        if self._health_check is None:
+            return True
+        try:
+            return self._health_check(connection) is not False
+        except Exception:
+            return False
+
+    def _dispose(self, connection):
+        try:
+            if self._closer is not None:
+                self._closer(connection)
+            else:
+                connection.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._stats["destroyed"] += 1
+
+    def _evict_expired_locked(self):
+        """
+        Drop idle connections that exceeded idle_timeout or max_lifetime. The
+        min_size floor is honoured for idle eviction but not for lifetime.
+        Must be called with the lock held.
+        :return: The dropped connections, for the caller to close once the lock is released.
+        """
+        if not self._idle:
+            return []
+
+        now = time.monotonic()
+        keep = deque()
+        expired = []
+        size = self._size_locked()
+
+        # Oldest returns are at the left of the deque.
+        for connection, created_at, returned_at in self._idle:
+            if self.max_lifetime is not None and now - created_at >= self.max_lifetime:
+                expired.append(connection)
+                self._stats["evicted_lifetime"] += 1
+                size -= 1
+            elif (self.idle_timeout is not None and now - returned_at >= self.idle_timeout
+                  and size > self.min_size):
+                expired.append(connection)
+                self._stats["evicted_idle"] += 1
+                size -= 1
+            else:
+                keep.append((connection, created_at, returned_at))
+
+        self._idle = keep
+        return expired
+
+    def _fill_min(self):
+        while True:
+            with self._lock:
+                if self._closed or self._size_locked() >= self.min_size:
+                    return
+                self._opening += 1
+            try:
+                connection, created_at = self._open()
+            except Exception:
+                # The next checkout will retry and surface the error.
+                return
+            with self._lock:
+                self._idle.appendleft((connection, created_at, time.monotonic()))
+                self._available.notify()
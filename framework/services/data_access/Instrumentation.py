@@ -0,0 +1,228 @@
+import functools
+import inspect
+import logging
+import time
+from contextvars import ContextVar
+
+try:
+    from prometheus_client import Counter, Histogram
+except ImportError:  # pragma: no cover - optional dependency
+    Counter = Histogram = None
+
+
+class QueryInstrument:
+    """
+    Receives a callback before and after every data service operation. Subclass and
+    override either hook; both default to doing nothing. Hooks run on the calling
+    thread or event loop, so they should be cheap and must not raise.
+
+    `operation` is the data service method (or "checkout" for taking a connection
+    from the pool), `table` is "database.collection" and `resource` is the name of
+    the resource that owns the table, or None.
+    """
+
+    def before_query(self, operation: str, table: str, resource: str):
+        pass
+
+    def after_query(self, operation: str, table: str, resource: str,
+                    duration: float, rowcount: int, error: str):
+        """
+        :param duration: Seconds the operation took.
+        :param rowcount: Rows returned or written.
+        :param error: The error message, or None if the operation succeeded.
+        """
+        pass
+
+
+class PrometheusQueryInstrument(QueryInstrument):
+    """
+    Exports query latency, row counts and errors, and connection checkout latency, as
+    Prometheus metrics. Requires the optional `prometheus_client` package.
+
+    Metrics are created once per registry and shared by every instance, so the
+    instrument can be rebuilt (e.g. on an application restart within one process).
+    """
+
+    _metrics = {}
+
+    def __init__(self, registry=None, buckets=(.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5)):
+        if Histogram is None:
+            raise ImportError("PrometheusQueryInstrument requires the 'prometheus_client' package "
+                              "(pip install prometheus-client)")
+
+        metrics = self._metrics.get(id(registry))
+        if metrics is None:
+            kwargs = {} if registry is None else {"registry": registry}
+            labels = ("operation", "table", "resource")
+            metrics = self._metrics[id(registry)] = (
+                Histogram("db_query_duration_seconds", "Data service operation latency.",
+                          labels + ("outcome",), buckets=buckets, **kwargs),
+                Counter("db_query_rows_total", "Rows returned or written by data service operations.",
+                        labels, **kwargs),
+                Counter("db_query_errors_total", "Failed data service operations.", labels, **kwargs),
+                Histogram("db_connection_checkout_seconds", "Time to take a connection from the pool.",
+                          ("table", "resource"), buckets=buckets, **kwargs),
+            )
+        self.duration, self.rows, self.errors, self.checkout = metrics
+
+    def after_query(self, operation, table, resource, duration, rowcount, error):
+        resource = resource or ""
+        if operation == "checkout":
+            self.checkout.labels(table or "", resource).observe(duration)
+            return
+
+        outcome = "error" if error is not None else "ok"
+        self.duration.labels(operation, table, resource, outcome).observe(duration)
+        if rowcount:
+            self.rows.labels(operation, table, resource).inc(rowcount)
+        if error is not None:
+            self.errors.labels(operation, table, resource).inc()
+
+
+class SlowQueryLogger(QueryInstrument):
+    """
+    Logs a warning for every operation slower than its threshold.
+    """
+
+    def __init__(self, threshold_ms: float = 200, thresholds: dict = None, logger: logging.Logger = None):
+        """
+        :param threshold_ms: Default threshold in milliseconds.
+        :param thresholds: Per-operation thresholds in milliseconds, e.g. {"stream_data_objects": 60000}.
+        :param logger: Defaults to the service logger.
+        """
+        self.threshold_ms = threshold_ms
+        self.thresholds = thresholds or {}
+        self.logger = logger or logging.getLogger("microservice_logger")
+
+    def after_query(self, operation, table, resource, duration, rowcount, error):
+        duration_ms = duration * 1000
+        if duration_ms >= self.thresholds.get(operation, self.threshold_ms):
+            self.logger.warning(
+                f"Slow {operation} on {table} ({resource}): {duration_ms:.1f} ms, "
+                f"{rowcount} rows, error={error}"
+            )
+
+
+# (table, resource) of the operation running in this thread or task, for checkout reports.
+current_query = ContextVar("current_query", default=(None, None))
+
+
+def report_checkout(service, started: float):
+    """
+    Reports the time taken to check a connection out of the pool, attributed to the
+    operation that asked for it. `started` is a time.perf_counter() value.
+    """
+    duration = time.perf_counter() - started
+    table, resource = current_query.get()
+    for instrument in service.instruments:
+        instrument.after_query("checkout", table, resource, duration, 0, None)
+
+
+def count_rows(result) -> int:
+    """
+    Rows touched by a data service operation, derived from its result dictionary.
+    """
+    if not isinstance(result, dict) or result.get("error") is not None:
+        return 0
+    details = result.get("details")
+    if isinstance(details, list):
+        return sum(1 for detail in details if not (isinstance(detail, dict) and detail.get("error")))
+    return 1
+
+
+def instrumented(fn):
+    """
+    Reports a data service method to the service's instruments. The method must take
+    the database and collection names as its first two arguments. Costs one attribute
+    check per call when no instrument is registered.
+    """
+    def begin(service, args, kwargs):
+        database = args[0] if len(args) > 0 else kwargs.get("database_name")
+        collection = args[1] if len(args) > 1 else kwargs.get("collection_name")
+        table = f"{database}.{collection}"
+        resource = service.resource_tags.get(table)
+        for instrument in service.instruments:
+            instrument.before_query(fn.__name__, table, resource)
+        return table, resource, time.perf_counter()
+
+    def end(service, table, resource, started, rowcount, error):
+        duration = time.perf_counter() - started
+        for instrument in service.instruments:
+            instrument.after_query(fn.__name__, table, resource, duration, rowcount, error)
+
+    if inspect.isasyncgenfunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(self, *args, **kwargs):
+            rows = fn(self, *args, **kwargs)
+            measured = bool(self.instruments)
+            if measured:
+                table, resource, started = begin(self, args, kwargs)
+            count, error = 0, None
+            try:
+                async for row in rows:
+                    count += 1
+                    yield row
+            except Exception as e:
+                error = str(e)
+                raise
+            finally:
+                # Close the inner stream right away when the consumer stops early.
+                await rows.aclose()
+                if measured:
+                    end(self, table, resource, started, count, error)
+
+    elif inspect.isgeneratorfunction(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            rows = fn(self, *args, **kwargs)
+            measured = bool(self.instruments)
+            if measured:
+                table, resource, started = begin(self, args, kwargs)
+            count, error = 0, None
+            try:
+                for row in rows:
+                    count += 1
+                    yield row
+            except Exception as e:
+                error = str(e)
+                raise
+            finally:
+                rows.close()
+                if measured:
+                    end(self, table, resource, started, count, error)
+
+    elif inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(self, *args, **kwargs):
+            if not self.instruments:
+                return await fn(self, *args, **kwargs)
+            table, resource, started = begin(self, args, kwargs)
+            token = current_query.set((table, resource))
+            try:
+                result = await fn(self, *args, **kwargs)
+            except Exception as e:
+                end(self, table, resource, started, 0, str(e))
+                raise
+            finally:
+                current_query.reset(token)
+            end(self, table, resource, started, count_rows(result), result.get("error"))
+            return result
+
+    else:
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            if not self.instruments:
+                return fn(self, *args, **kwargs)
+            table, resource, started = begin(self, args, kwargs)
+            token = current_query.set((table, resource))
+            try:
+                result = fn(self, *args, **kwargs)
+            except Exception as e:
+                end(self, table, resource, started, 0, str(e))
+                raise
+            finally:
+                current_query.reset(token)
+            end(self, table, resource, started, count_rows(result), result.get("error"))
+            return result
+
+    return wrapper
@@ -1,8 +1,13 @@
+import time
+
 import pymysql
 from pydantic import BaseModel
 from pymysql import MySQLError
 
 from .BaseDataService import BaseDataService
+from .ConnectionPool import ConnectionPool
+from .Instrumentation import instrumented, report_checkout
+from .StatementCache import StatementCache
 
 
 class MySqlRdbDataService(BaseDataService):
@@ -15,56 +20,152 @@ class MySqlRdbDataService(BaseDataService):
     def __init__(self, context):
         super().__init__(context)
 
-    def _get_connection(self):
+        self.statements = StatementCache(self.context.get("statement_cache_size", 256))
+        self.pool = ConnectionPool(
+            factory=self._create_connection,
+            min_size=self.context.get("pool_min_size", 0),
+            max_size=self.context.get("pool_max_size", 10),
+            checkout_timeout=self.context.get("pool_checkout_timeout", 10.0),
+            idle_timeout=self.context.get("pool_idle_timeout", 300.0),
+            max_lifetime=self.context.get("pool_max_lifetime", 3600.0),
+            health_check=lambda connection: connection.ping(reconnect=False)
+        )
+
+    def _create_connection(self):
         connection = pymysql.connect(
             host = self.context["host"],
             port = self.context["port"],
             user = self.context["user"],
             password = self.context["password"],
             cursorclass = pymysql.cursors.DictCursor,
+            client_flag = pymysql.constants.CLIENT.FOUND_ROWS,
             autocommit = True
         )
         return connection
 
+    def _get_connection(self):
+        """
+        Check a connection out of the pool. Callers must hand it back with
+        _release_connection() once they are done with it.
+        """
+        if not self.instruments:
+            return self.pool.acquire()
+
+        started = time.perf_counter()
+        connection = self.pool.acquire()
+        report_checkout(self, started)
+        return connection
+
+    def _release_connection(self, connection, error: Exception = None, discard: bool = False):
+        """
+        Return a connection to the pool. Connections that failed with a driver-level
+        error, or that `discard` is set for, are discarded so that the next checkout
+        gets a fresh one.
+        """
+        if connection is None:
+            return
+        discard = discard or isinstance(error, (pymysql.err.OperationalError, pymysql.err.InterfaceError))
+        self.pool.release(connection, discard=discard)
+
+    def pool_stats(self):
+        """
+        Returns a snapshot of the connection pool counters (in use, idle, waits, wait time, ...).
+        """
+        return self.pool.stats()
+
+    def close(self):
+        """
+        Close the pooled connections. Called on application shutdown.
+        """
+        self.pool.close()
+
     def check_connection(self, database_name: str, table_name: str):
         """
-        Check if the connection to the database is successful by selecting all data
-        from a specific table.
+        Check if the connection to the database is successful and the table is
+        reachable. At most one constant row is read, never the table contents.
         Args:
             - database_name: Name of the database to query.
-            - table_name: Name of the table to fetch all records from.
+            - table_name: Name of the table to check.
         Returns:
-            - A dictionary with connection status and result of the query (all rows).
+            - A dictionary with the connection status.
         Raises:
-            - Exception if the connection or query execution fails.
+            - Exception if the connection cannot be checked out of the pool.
         """
         connection = None
         try:
             # Establish a connection
             connection = self._get_connection()
 
-            # Create a cursor and execute a query to select all rows from the given table
+            # Touch the table without reading any of its rows
             cursor = connection.cursor()
-            query = f"SELECT * FROM {database_name}.{table_name}"
+            query = f"SELECT 1 FROM {database_name}.{table_name} LIMIT 1"
             cursor.execute(query)
-
-            # Fetch all the results (each row will be a dictionary)
-            result = cursor.fetchall()
+            cursor.fetchall()
 
             # Return the result
             if connection.open:
-                return {"status": "connection is live", 'data': result }
+                return {"status": "connection is live"}
             else:
                 return {"status": "connection failed"}
 
-        except MySQLError:
+        except MySQLError as e:
+            self._release_connection(connection, e)
+            connection = None
             return {"status": "connection failed"}
 
         finally:
-            # Ensure the connection is closed after the check
-            if connection and connection.open:
-                connection.close()
+            # Ensure the connection goes back to the pool after the check
+            self._release_connection(connection)
 
+    def ping(self):
+        """
+        Readiness check: check a connection out of the pool and run SELECT 1.
+        :return: A dictionary with the status, the round-trip latency and the pool counters.
+        """
+        started = time.perf_counter()
+        connection = None
+        try:
+            connection = self._get_connection()
+            checkout_ms = (time.perf_counter() - started) * 1000
+            cursor = connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            result = {"status": "up", "checkout_ms": round(checkout_ms, 3), "error": None}
+
+        except Exception as e:
+            self._release_connection(connection, e)
+            connection = None
+            result = {"status": "down", "error": str(e)}
+
+        finally:
+            self._release_connection(connection)
+
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        result["pool"] = self.pool_stats()
+        return result
+
+    def execute_statement(self, sql_statement: str, args=None):
+        """
+        Run a single statement on a pooled connection and return the rows it produced.
+        Meant for administrative work such as DDL and EXPLAIN, not for request handling.
+        Raises:
+            - MySQLError if the statement fails.
+        """
+        connection = self._get_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(sql_statement, args)
+            return cursor.fetchall()
+
+        except Exception as e:
+            self._release_connection(connection, e)
+            connection = None
+            raise
+
+        finally:
+            self._release_connection(connection)
+
+    @instrumented
     def insert_data_object(
         self,
         database_name: str,
@@ -77,13 +178,10 @@ class MySqlRdbDataService(BaseDataService):
 
         connection = None
         try:
-            # Extract field names and values from the BaseModel
-            fields = ', '.join(data_model.model_dump().keys())
-            placeholders = ', '.join(['%s'] * len(data_model.model_dump()))
-            values = tuple(data_model.model_dump().values())
-
-            # Dynamically construct the SQL query
-            sql_statement = f"INSERT INTO {database_name}.{collection_name} ({fields}) VALUES ({placeholders})"
+            # Dump the model once; its field order is the statement's column order
+            data = data_model.model_dump()
+            sql_statement = self.statements.insert(database_name, collection_name, tuple(data))
+            values = tuple(data.values())
 
             connection = self._get_connection()
             cursor = connection.cursor()
@@ -97,11 +195,103 @@ class MySqlRdbDataService(BaseDataService):
             else:
                 result = {"status": "bad request", "error": str(e)}
 
-            if connection and connection.open:
-                connection.close()
+            self._release_connection(connection, e)
+            connection = None
 
             return result
 
+        finally:
+            self._release_connection(connection)
+
+    @instrumented
+    def insert_data_objects(
+        self,
+        database_name: str,
+        collection_name: str,
+        data_models: list
+    ):
+        """
+        See base class for comments.
+
+        Rows are written in chunks of `max_rows_per_insert` with one multi-row INSERT
+        per chunk, each chunk in its own transaction. If a chunk fails (e.g. a duplicate
+        key), it is rolled back and its rows are retried one by one so that every row
+        gets its own result and the valid rows are still written.
+        """
+
+        connection = None
+        # Set while a chunk's transaction is open. A connection left in a transaction
+        # (by an unexpected error or a cancellation) is discarded, never pooled.
+        in_transaction = False
+        # Set by a driver-level error such as a lost connection; no further rows are tried.
+        lost = None
+        try:
+            rows = [data_model.model_dump() for data_model in data_models]
+            details = [None] * len(rows)
+            if not rows:
+                return {"status": "inserted successfully", "details": details, "error": None}
+
+            fields = tuple(rows[0])
+            chunk_size = self.context.get("max_rows_per_insert", 500)
+
+            connection = self._get_connection()
+            cursor = connection.cursor()
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                values = [row[field] for row in chunk for field in fields]
+                sql_statement = self.statements.insert(database_name, collection_name, fields, len(chunk))
+                try:
+                    connection.begin()
+                    in_transaction = True
+                    cursor.execute(sql_statement, values)
+                    connection.commit()
+                    in_transaction = False
+                    for index in range(start, start + len(chunk)):
+                        details[index] = {"index": index, "status": "inserted successfully", "error": None}
+                except MySQLError as e:
+                    if isinstance(e, (pymysql.err.OperationalError, pymysql.err.InterfaceError)):
+                        lost = e
+                        break
+                    connection.rollback()
+                    in_transaction = False
+                    for offset, row in enumerate(chunk):
+                        index = start + offset
+                        try:
+                            cursor.execute(self.statements.insert(database_name, collection_name, fields),
+                                           [row[field] for field in fields])
+                            details[index] = {"index": index, "status": "inserted successfully", "error": None}
+                        except (pymysql.err.OperationalError, pymysql.err.InterfaceError) as e:
+                            lost = e
+                            break
+                        except MySQLError as e:
+                            details[index] = {"index": index, "status": "bad request", "error": str(e)}
+                    if lost is not None:
+                        break
+
+            # The rows that were not written when the connection failed get its error.
+            for index, detail in enumerate(details):
+                if detail is None:
+                    details[index] = {"index": index, "status": "failed", "error": str(lost)}
+
+            failed = sum(1 for detail in details if detail["error"] is not None)
+            status = "inserted successfully" if failed == 0 else f"{failed} of {len(details)} rows failed"
+            return {"status": status, "details": details, "error": None}
+
+        except Exception as e:
+            if connection is None:
+                result = {"status": "internal server error ", "error": str(e)}
+            else:
+                result = {"status": "bad request", "error": str(e)}
+
+            self._release_connection(connection, e, discard=in_transaction)
+            connection = None
+
+            return result
+
+        finally:
+            self._release_connection(connection, discard=in_transaction or lost is not None)
+
+    @instrumented
     def get_data_object(
         self,
         database_name: str,
@@ -115,8 +305,7 @@ class MySqlRdbDataService(BaseDataService):
 
         connection = None
         try:
-            sql_statement = f"SELECT * FROM {database_name}.{collection_name} " + \
-                        f"where {key_field}=%s"
+            sql_statement = self.statements.select_by_key(database_name, collection_name, key_field)
             connection = self._get_connection()
             cursor = connection.cursor()
             cursor.execute(sql_statement, [key_value])
@@ -127,12 +316,114 @@ class MySqlRdbDataService(BaseDataService):
                 return {"status": "fetched successfully", "details": result, "error": None}
 
         except Exception as e:
-            if connection and connection.open:
-                connection.close()
+            self._release_connection(connection, e)
+            connection = None
             result = {"status": "failed", "error": str(e)}
 
+        finally:
+            self._release_connection(connection)
+
         return result
 
+    @instrumented
+    def get_data_objects(
+        self,
+        database_name: str,
+        collection_name: str,
+        key_field: str,
+        key_values: list
+    ):
+        """
+        See base class for comments.
+        """
+
+        connection = None
+        try:
+            chunk_size = self.context.get("max_keys_per_query", 1000)
+            rows = []
+            connection = self._get_connection()
+            cursor = connection.cursor()
+            for start in range(0, len(key_values), chunk_size):
+                chunk = key_values[start:start + chunk_size]
+                sql_statement, parameters = self.statements.select_in(database_name, collection_name, key_field, chunk)
+                cursor.execute(sql_statement, parameters)
+                rows.extend(cursor.fetchall())
+            result = {"status": "fetched successfully", "details": rows, "error": None}
+
+        except Exception as e:
+            self._release_connection(connection, e)
+            connection = None
+            result = {"status": "failed", "error": str(e)}
+
+        finally:
+            self._release_connection(connection)
+
+        return result
+
+    @instrumented
+    def list_data_objects(
+        self,
+        database_name: str,
+        collection_name: str,
+        key_field: str,
+        limit: int,
+        after: str = None
+    ):
+        """
+        See base class for comments.
+        """
+
+        connection = None
+        try:
+            # One extra row tells whether there is a next page.
+            sql_statement = self.statements.select_page(database_name, collection_name, key_field, after is not None)
+            args = [limit + 1] if after is None else [after, limit + 1]
+
+            connection = self._get_connection()
+            cursor = connection.cursor()
+            cursor.execute(sql_statement, args)
+            rows = cursor.fetchall()
+
+            next_key = rows[limit - 1][key_field] if len(rows) > limit else None
+            result = {"status": "fetched successfully", "details": list(rows[:limit]),
+                      "next": next_key, "error": None}
+
+        except Exception as e:
+            self._release_connection(connection, e)
+            connection = None
+            result = {"status": "failed", "error": str(e)}
+
+        finally:
+            self._release_connection(connection)
+
+        return result
+
+    @instrumented
+    def stream_data_objects(
+        self,
+        database_name: str,
+        collection_name: str,
+        key_field: str
+    ):
+        """
+        See base class for comments.
+
+        Uses an unbuffered (server-side) cursor on a dedicated connection so that a long
+        export neither holds a pooled connection nor buffers the result set in memory.
+        """
+
+        connection = self._create_connection()
+        try:
+            cursor = connection.cursor(pymysql.cursors.SSDictCursor)
+            cursor.execute(self.statements.select_all(database_name, collection_name, key_field))
+            for row in cursor:
+                yield row
+            # Only close the cursor once it is drained; closing the connection is enough
+            # to abandon an unfinished result set.
+            cursor.close()
+        finally:
+            connection.close()
+
     def modify_data_object(
             self,
             database_name: str,
@@ -141,21 +432,62 @@ class MySqlRdbDataService(BaseDataService):
             key_field=str,
             key_value=str
     ):
+        """
+        See base class for comments.
+
+        Writes every field of the model; see update_data_object() for partial updates.
+        """
+
+        return self.update_data_object(database_name, collection_name, key_field, key_value,
+                                       data_model.model_dump())
+
+    @instrumented
+    def update_data_object(
+            self,
+            database_name: str,
+            collection_name: str,
+            key_field: str,
+            key_value: str,
+            changes: dict,
+            version_field: str = None,
+            expected_version: int = None
+    ):
+        """
+        See base class for comments.
+        """
+
+        if expected_version is not None and version_field is None:
+            return {"status": "bad request", "error": "Versioning is not enabled for this collection"}
 
         connection = None
         try:
-            set_clause = ", ".join([f"{key} = '{value}'" for key, value in data_model.model_dump().items()])
-            sql_statement = f"UPDATE {database_name}.{collection_name} SET {set_clause} WHERE {key_field}=%s"
+            check_version = expected_version is not None
+            sql_statement = self.statements.update(database_name, collection_name, tuple(changes), key_field,
+                                                   version_field, check_version)
+            args = [*changes.values(), key_value]
+            if check_version:
+                args.append(expected_version)
+
             connection = self._get_connection()
             cursor = connection.cursor()
-            cursor.execute(sql_statement, [key_value])  # not throwing error
-            updated_count = cursor.rowcount
-            if updated_count == 0:
-                result =  {"status": "bad request", "error": f"{key_field} does not exist"}
-            else:
-                result =  {"status": "modification successful", "error": None}
+            cursor.execute(sql_statement, args)
+            # Connections report matched rather than changed rows, so 0 means no row matched.
+            if cursor.rowcount > 0:
+                result = {"status": "modification successful", "error": None}
+                if check_version:
+                    result[version_field] = expected_version + 1
+                return result
+
+            if not check_version:
+                return {"status": "bad request", "error": f"{key_field} does not exist"}
 
-            return result
+            # Tell a missing row from a stale version; only paid for on a failed update.
+            cursor.execute(self.statements.select_by_key(database_name, collection_name, key_field), [key_value])
+            current = cursor.fetchone()
+            if current is None:
+                return {"status": "bad request", "error": f"{key_field} does not exist"}
+            return {"status": "precondition failed", "error": f"{version_field} does not match",
+                    version_field: current[version_field]}
 
         except Exception as e:
             if connection is None:
@@ -163,11 +495,15 @@ class MySqlRdbDataService(BaseDataService):
             else:
                 result = {"status": "bad request", "error": str(e)}
 
-            if connection and connection.open:
-                connection.close()
+            self._release_connection(connection, e)
+            connection = None
 
             return result
 
+        finally:
+            self._release_connection(connection)
+
+    @instrumented
     def delete_data_object(
             self,
             database_name: str,
@@ -178,7 +514,7 @@ class MySqlRdbDataService(BaseDataService):
 
         connection = None
         try:
-            sql_statement = f"DELETE FROM {database_name}.{collection_name} WHERE {key_field}=%s"
+            sql_statement = self.statements.delete(database_name, collection_name, key_field)
             connection = self._get_connection()
             cursor = connection.cursor()
             cursor.execute(sql_statement, [key_value])
@@ -197,11 +533,10 @@ class MySqlRdbDataService(BaseDataService):
             else:
                 result = {"status": "bad request", "error": str(e)}
 
-            if connection and connection.open:
-                connection.close()
+            self._release_connection(connection, e)
+            connection = None
 
             return result
 
-
-
-
+        finally:
+            self._release_connection(connection)
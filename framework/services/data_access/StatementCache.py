@@ -0,0 +1,133 @@
+import threading
+from collections import OrderedDict
+
+
+class StatementCache:
+    """
+    A bounded cache of the SQL text used by the MySQL data services.
+
+    Statements are keyed by (operation, database, collection, fields, ...), so the
+    string building for a given shape of query runs once and every later call is a
+    dictionary lookup. The field tuple in the key also fixes the column order, so
+    callers pass values in the same order they passed the fields.
+
+    Only table, column and key names that come from the application (never request
+    values) end up in the SQL text; values always go through placeholders.
+
+    IN-list lookups are padded to a power of two keys, so a batch of any size uses one
+    of a few statements per table rather than one per key count.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        """
+        :param maxsize: Maximum number of cached statements. 0 disables the cache.
+        """
+        self.maxsize = maxsize
+        self._statements = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"misses": 0, "evictions": 0}
+
+    def get(self, key: tuple, build, *args) -> str:
+        """
+        Returns the statement for `key`, calling `build(*args)` to create it on a miss.
+        Hits do not take the lock, so they stay cheaper than the string building they
+        replace. Once full, the least recently used statement is evicted.
+        """
+        statement = self._statements.get(key)
+        if statement is not None:
+            try:
+                # OrderedDict operations are atomic under the GIL; the key may have just been evicted.
+                self._statements.move_to_end(key)
+            except KeyError:
+                pass
+            return statement
+
+        statement = build(*args)
+        with self._lock:
+            self._stats["misses"] += 1
+            if self.maxsize > 0 and key not in self._statements:
+                if len(self._statements) >= self.maxsize:
+                    self._statements.popitem(last=False)
+                    self._stats["evictions"] += 1
+                self._statements[key] = statement
+        return statement
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["size"] = len(self._statements)
+            snapshot["maxsize"] = self.maxsize
+        return snapshot
+
+    def insert(self, database_name: str, collection_name: str, fields: tuple, rows: int = 1) -> str:
+        return self.get(("insert", database_name, collection_name, fields, rows),
+                        _build_insert, database_name, collection_name, fields, rows)
+
+    def select_by_key(self, database_name: str, collection_name: str, key_field: str) -> str:
+        return self.get(("select", database_name, collection_name, key_field),
+                        _build_select_by_key, database_name, collection_name, key_field)
+
+    def select_in(self, database_name: str, collection_name: str, key_field: str, key_values: list) -> tuple:
+        """
+        :return: (statement, parameters) selecting the rows whose `key_field` is one of
+            `key_values`. The parameters repeat the last key up to the next power of two,
+            which does not change the rows selected.
+        """
+        count = 1 << max(len(key_values) - 1, 0).bit_length()
+        parameters = list(key_values) + [key_values[-1]] * (count - len(key_values))
+        return self.get(("select_in", database_name, collection_name, key_field, count),
+                        _build_select_in, database_name, collection_name, key_field, count), parameters
+
+    def select_page(self, database_name: str, collection_name: str, key_field: str, after: bool) -> str:
+        return self.get(("select_page", database_name, collection_name, key_field, after),
+                        _build_select_page, database_name, collection_name, key_field, after)
+
+    def select_all(self, database_name: str, collection_name: str, key_field: str) -> str:
+        return self.get(("select_all", database_name, collection_name, key_field),
+                        _build_select_all, database_name, collection_name, key_field)
+
+    def update(self, database_name: str, collection_name: str, fields: tuple, key_field: str,
+               version_field: str = None, check_version: bool = False) -> str:
+        return self.get(("update", database_name, collection_name, fields, key_field, version_field, check_version),
+                        _build_update, database_name, collection_name, fields, key_field, version_field, check_version)
+
+    def delete(self, database_name: str, collection_name: str, key_field: str) -> str:
+        return self.get(("delete", database_name, collection_name, key_field),
+                        _build_delete, database_name, collection_name, key_field)
+
+
+def _build_insert(database_name, collection_name, fields, rows):
+    row_placeholder = "(" + ', '.join(['%s'] * len(fields)) + ")"
+    return f"INSERT INTO {database_name}.{collection_name} ({', '.join(fields)}) VALUES " + \
+        ', '.join([row_placeholder] * rows)
+
+
+def _build_select_by_key(database_name, collection_name, key_field):
+    return f"SELECT * FROM {database_name}.{collection_name} where {key_field}=%s"
+
+
+def _build_select_in(database_name, collection_name, key_field, count):
+    return f"SELECT * FROM {database_name}.{collection_name} where {key_field} IN ({', '.join(['%s'] * count)})"
+
+
+def _build_select_page(database_name, collection_name, key_field, after):
+    where = f"where {key_field} > %s " if after else ""
+    return f"SELECT * FROM {database_name}.{collection_name} {where}ORDER BY {key_field} LIMIT %s"
+
+
+def _build_select_all(database_name, collection_name, key_field):
+    return f"SELECT * FROM {database_name}.{collection_name} ORDER BY {key_field}"
+
+
+def _build_update(database_name, collection_name, fields, key_field, version_field, check_version):
+    assignments = [f"{field} = %s" for field in fields]
+    where = f"{key_field}=%s"
+    if version_field is not None:
+        assignments.append(f"{version_field} = {version_field} + 1")
+        if check_version:
+            where += f" AND {version_field}=%s"
+    return f"UPDATE {database_name}.{collection_name} SET {', '.join(assignments)} WHERE {where}"
+
+
+def _build_delete(database_name, collection_name, key_field):
+    return f"DELETE FROM {database_name}.{collection_name} WHERE {key_field}=%s"
@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ExecutorSaturatedError(Exception):
+    """
+    Raised when a blocking call is rejected because the executor queue is full.
+    """
+    pass
+
+
+class BoundedExecutor:
+    """
+    A ThreadPoolExecutor with a bounded queue, used to run blocking data-access
+    calls off the event loop. Calls beyond max_workers + max_queue are rejected
+    immediately instead of piling up behind a saturated database.
+
+    The counters make it visible whether time is spent waiting for a worker
+    (queue wait) or inside the call itself (run time).
+    """
+
+    def __init__(self, max_workers: int, max_queue: int = 100, thread_name_prefix: str = "data-access"):
+        """
+        :param max_workers: Number of worker threads. Size it to the database pool.
+        :param max_queue: Number of calls allowed to wait for a free worker.
+        :param thread_name_prefix: Prefix for the worker thread names.
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "queue_wait_ms": 0.0,
+            "run_time_ms": 0.0,
+            "max_queue_depth": 0,
+        }
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) on a worker thread and await its result.
+        :raises ExecutorSaturatedError: If every worker is busy and the queue is full.
+        """
+        return await self._submit(fn, args, kwargs, bounded=True)
+
+    async def run_cleanup(self, fn, *args, **kwargs):
+        """
+        Like run(), but never rejected: for cleanup such as closing a connection, which
+        would leak if a saturated executor turned it away.
+        """
+        return await self._submit(fn, args, kwargs, bounded=False)
+
+    async def _submit(self, fn, args, kwargs, bounded: bool):
+        with self._lock:
+            if bounded and self._queued + self._running >= self.max_workers + self.max_queue:
+                self._stats["rejected"] += 1
+                raise ExecutorSaturatedError(
+                    f"Data access executor saturated ({self.max_workers} workers, {self.max_queue} queued)"
+                )
+            self._queued += 1
+            self._stats["submitted"] += 1
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self._queued)
+
+        future = self._executor.submit(self._call, time.perf_counter(), fn, args, kwargs)
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _on_done(self, future):
+        # A call cancelled while still queued never reaches _call().
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def _call(self, submitted_at, fn, args, kwargs):
+        started_at = time.perf_counter()
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._stats["queue_wait_ms"] += (started_at - submitted_at) * 1000
+
+        failed = False
+        try:
+            return fn(*args, **kwargs)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._stats["run_time_ms"] += (time.perf_counter() - started_at) * 1000
+                self._stats["failed" if failed else "completed"] += 1
+
+    def stats(self) -> dict:
+        """
+        A snapshot of the executor counters, including average queue wait and run time per call.
+        """
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot.update({
+                "queue_depth": self._queued,
+                "running": self._running,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+            })
+
+        finished = snapshot["completed"] + snapshot["failed"]
+        snapshot["avg_queue_wait_ms"] = round(snapshot["queue_wait_ms"] / finished, 3) if finished else 0.0
+        snapshot["avg_run_time_ms"] = round(snapshot["run_time_ms"] / finished, 3) if finished else 0.0
+        snapshot["queue_wait_ms"] = round(snapshot["queue_wait_ms"], 3)
+        snapshot["run_time_ms"] = round(snapshot["run_time_ms"], 3)
+        return snapshot
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
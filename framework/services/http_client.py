@@ -0,0 +1,183 @@
+import asyncio
+import random
+import time
+from urllib.parse import urlsplit
+
+import httpx
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request while the circuit for its host is open.
+    """
+    pass
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a failing dependency for a while instead of letting every request
+    wait for it to time out.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls fail
+    fast. Once `reset_timeout` has passed one trial call is let through (half-open):
+    its success closes the circuit, its failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self.state = "half-open"
+        if self.state == "half-open" and not self._trial_running:
+            self._trial_running = True
+            return True
+        return False
+
+    def record_success(self):
+        self.state = "closed"
+        self._failures = 0
+        self._trial_running = False
+
+    def record_failure(self):
+        self._failures += 1
+        self._trial_running = False
+        if self.state == "half-open" or self._failures >= self.failure_threshold:
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+    def release_trial(self):
+        """
+        Ends a call that neither succeeded nor failed (e.g. it was cancelled) without
+        counting it, so a half-open circuit lets the next call through as its trial.
+        """
+        self._trial_running = False
+
+    def retry_in(self) -> float:
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+
+class ResilientHttpClient:
+    """
+    A shared httpx.AsyncClient for calls to external services, with keep-alive
+    pooling, timeouts, retries with exponential backoff and one circuit breaker
+    per host. Create it once for the application and close() it on shutdown.
+
+    Connection errors, timeouts and 429/502/503/504 responses are retried; other
+    responses, including 4xx errors, are returned to the caller as they are.
+    Transport errors and 5xx responses count as failures of the host's circuit.
+    """
+
+    RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+    def __init__(self,
+                 timeout: float = 5.0,
+                 retries: int = 2,
+                 backoff: float = 0.2,
+                 max_backoff: float = 2.0,
+                 failure_threshold: int = 5,
+                 reset_timeout: float = 30,
+                 max_connections: int = 20,
+                 transport: httpx.AsyncBaseTransport = None):
+        """
+        :param timeout: Connect, read and write timeout per attempt, in seconds.
+        :param retries: Attempts after the first one.
+        :param backoff: Delay before the first retry; doubled on each retry, with jitter.
+        :param max_backoff: Upper bound for one delay, including a server's Retry-After.
+        :param failure_threshold: Consecutive failures that open a host's circuit.
+        :param reset_timeout: Seconds an open circuit waits before a trial call.
+        :param max_connections: Size of the connection pool.
+        :param transport: Replaces the network transport, e.g. httpx.MockTransport in tests.
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport,
+        )
+
+        self._breakers = {}
+        self._stats = {"requests": 0, "retries": 0, "failures": 0, "rejected": 0}
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return breaker
+
+    def _delay(self, attempt: int, response: httpx.Response = None) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return min(self.backoff * 2 ** attempt, self.max_backoff) * random.uniform(0.5, 1.0)
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Sends a request through the pool, retrying transient failures.
+        :raises CircuitOpenError: If the host's circuit is open.
+        :raises httpx.TransportError: If the last attempt failed to connect or timed out.
+        """
+        breaker = self.breaker(url)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                self._stats["rejected"] += 1
+                raise CircuitOpenError(f"Circuit for {urlsplit(url).netloc} is open, "
+                                       f"retrying in {breaker.retry_in():.0f}s")
+
+            self._stats["requests"] += 1
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                breaker.record_failure()
+                self._stats["failures"] += 1
+                # No point retrying once this failure has opened the circuit.
+                if attempt >= self.retries or breaker.state == "open":
+                    raise
+                response = None
+            except BaseException:
+                # A cancellation or a bug says nothing about the host's health, but the
+                # call is over: free the trial so that a half-open circuit is not stuck.
+                breaker.release_trial()
+                raise
+            else:
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                    self._stats["failures"] += 1
+                else:
+                    breaker.record_success()
+                if response.status_code not in self.RETRY_STATUSES or attempt >= self.retries \
+                        or breaker.state == "open":
+                    return response
+
+            await asyncio.sleep(self._delay(attempt, response))
+            if response is not None:
+                await response.aclose()
+            attempt += 1
+            self._stats["retries"] += 1
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    def stats(self) -> dict:
+        snapshot = dict(self._stats)
+        snapshot["circuits"] = {host: breaker.state for host, breaker in self._breakers.items()}
+        return snapshot
+
+    async def close(self):
+        await self.client.aclose()
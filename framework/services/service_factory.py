@@ -1,9 +1,23 @@
 #
-# Placeholder for implementing the service factory and service locator patterns.
+# Service factory and service locator.
 #
 # https://medium.com/javarevisited/service-locator-factory-pattern-7bb9e835b709
 #
-from abc import ABC, abstractmethod
+# Services are registered by name with a builder. They are built lazily on first
+# use and then shared for the lifetime of the process. Services that own external
+# resources (connection pools, executors, HTTP clients, ...) register a shutdown
+# hook, and the application calls startup()/shutdown() from its lifespan.
+#
+import inspect
+import threading
+from abc import ABC
+
+
+class ServiceNotFoundError(KeyError):
+    """
+    Raised when a service name has not been registered with the factory.
+    """
+    pass
 
 
 class BaseServiceFactory(ABC):
@@ -11,7 +25,86 @@ class BaseServiceFactory(ABC):
     def __init__(self):
         pass
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Each concrete factory keeps its own registry and singletons.
+        cls._registry = {}
+        cls._instances = {}
+        cls._build_order = []
+        cls._lock = threading.RLock()
+
+    @classmethod
+    def register(cls, service_name, builder, on_startup=None, on_shutdown=None, eager=False):
+        """
+        Register a service with the factory.
+        :param service_name: The name the service is looked up by.
+        :param builder: A callable with no arguments that builds the service.
+        :param on_startup: Optional callable(service), sync or async, run by startup().
+        :param on_shutdown: Optional callable(service), sync or async, run by shutdown().
+        :param eager: Build the service in startup() instead of on first use.
+        """
+        with cls._lock:
+            cls._registry[service_name] = {
+                "builder": builder,
+                "on_startup": on_startup,
+                "on_shutdown": on_shutdown,
+                "eager": eager,
+            }
+
     @classmethod
-    @abstractmethod
     def get_service(cls, service_name):
-        raise NotImplementedError()
\ No newline at end of file
+        """
+        Returns the shared instance of a registered service, building it on first use.
+        """
+        service = cls._instances.get(service_name)
+        if service is not None:
+            return service
+
+        with cls._lock:
+            service = cls._instances.get(service_name)
+            if service is None:
+                registration = cls._registry.get(service_name)
+                if registration is None:
+                    raise ServiceNotFoundError(service_name)
+                service = registration["builder"]()
+                cls._instances[service_name] = service
+                cls._build_order.append(service_name)
+        return service
+
+    @classmethod
+    def is_registered(cls, service_name) -> bool:
+        return service_name in cls._registry
+
+    @classmethod
+    async def startup(cls):
+        """
+        Build eager services and run their startup hooks. Called from the application lifespan.
+        """
+        for service_name, registration in list(cls._registry.items()):
+            if not registration["eager"]:
+                continue
+            service = cls.get_service(service_name)
+            if registration["on_startup"] is not None:
+                await _maybe_await(registration["on_startup"](service))
+
+    @classmethod
+    async def shutdown(cls):
+        """
+        Run shutdown hooks in reverse build order and forget every instance, so that a
+        later startup() builds fresh services.
+        """
+        with cls._lock:
+            built = [(name, cls._instances[name]) for name in reversed(cls._build_order)]
+            cls._instances.clear()
+            cls._build_order.clear()
+
+        for service_name, service in built:
+            on_shutdown = cls._registry[service_name]["on_shutdown"]
+            if on_shutdown is not None:
+                await _maybe_await(on_shutdown(service))
+
+
+async def _maybe_await(value):
+    if inspect.isawaitable(value):
+        return await value
+    return value
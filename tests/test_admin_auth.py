@@ -0,0 +1,39 @@
+import pytest
+from fastapi import HTTPException
+
+from app.utils.utils import generate_custom_jwt, get_admin_emails, get_jwt_secret_key, verify_admin_jwt
+
+
+@pytest.fixture(autouse=True)
+def environment(monkeypatch):
+    monkeypatch.setenv("JWT_SECRET_KEY", "test-secret")
+    monkeypatch.setenv("ADMIN_EMAILS", "Admin@example.com, ops@example.com")
+    get_jwt_secret_key.cache_clear()
+    get_admin_emails.cache_clear()
+    yield
+    get_jwt_secret_key.cache_clear()
+    get_admin_emails.cache_clear()
+
+
+def token(email: str, profile: str) -> str:
+    return generate_custom_jwt({"email": email, "name": "Name", "picture": "p"}, profile)
+
+
+@pytest.mark.parametrize("profile", ["user", "organiser"])
+def test_listed_email_is_admin_with_either_profile(profile):
+    assert verify_admin_jwt(token("admin@example.com", profile))["email"] == "admin@example.com"
+
+
+def test_unlisted_email_is_rejected():
+    with pytest.raises(HTTPException) as error:
+        verify_admin_jwt(token("someone@example.com", "organiser"))
+    assert error.value.status_code == 403
+
+
+def test_no_admins_without_admin_emails(monkeypatch):
+    monkeypatch.delenv("ADMIN_EMAILS")
+    get_admin_emails.cache_clear()
+
+    with pytest.raises(HTTPException) as error:
+        verify_admin_jwt(token("admin@example.com", "user"))
+    assert error.value.status_code == 403
@@ -0,0 +1,72 @@
+import asyncio
+
+from framework.resources.cached_resource import CachedResource
+from framework.services.cache.memory_cache import InMemoryTTLCache
+
+
+class SlowResource:
+    """
+    A one-row resource whose reads can be held until `gate` is set.
+    """
+
+    config = None
+    database = "USER"
+    collection = "user_tab"
+    key_field = "UID"
+
+    def __init__(self):
+        self.row = {"UID": "u1", "Email": "jane@example.com", "Name": "Jane"}
+        self.gate = None
+        self.reads = 0
+
+    async def get_by_key(self, key):
+        self.reads += 1
+        row = dict(self.row)
+        if self.gate is not None:
+            await self.gate.wait()
+        return {"status": "fetched successfully", "details": row, "error": None}
+
+    async def patch_data_by_custom_key(self, custom_key, value, changes, expected_version=None):
+        self.row.update(changes)
+        return {"status": "modification successful", "error": None}
+
+
+def test_read_racing_a_write_is_not_cached():
+    resource = SlowResource()
+    cached = CachedResource(resource, InMemoryTTLCache(context={"ttl": 60}))
+
+    async def scenario():
+        # The read fetches the row, then the row is patched before the read stores it.
+        resource.gate = asyncio.Event()
+        read = asyncio.ensure_future(cached.get_by_key("u1"))
+        await asyncio.sleep(0)
+        await cached.patch_data_by_custom_key("UID", "u1", {"Name": "Janet"})
+        resource.gate.set()
+        assert (await read)["details"]["Name"] == "Jane"
+        resource.gate = None
+
+        assert (await cached.get_by_key("u1"))["details"]["Name"] == "Janet"
+        assert (await cached.get_by_key("u1"))["details"]["Name"] == "Janet"
+
+    asyncio.run(scenario())
+    assert resource.reads == 2
+
+
+def test_callers_get_copies_of_cached_results():
+    resource = SlowResource()
+    cached = CachedResource(resource, InMemoryTTLCache(context={"ttl": 60}))
+
+    async def scenario():
+        result = await cached.get_by_key("u1")
+        result.pop("etag")
+        result["details"]["Name"] = "changed"
+
+        again = await cached.get_by_key("u1")
+        assert "etag" in again
+        assert again["details"]["Name"] == "Jane"
+        again.pop("etag")
+
+        assert "etag" in await cached.get_by_key("u1")
+
+    asyncio.run(scenario())
+    assert resource.reads == 1
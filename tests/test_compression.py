@@ -0,0 +1,45 @@
+import asyncio
+import gzip
+
+from app.middleware.compression import CompressionMiddleware
+
+
+def application(scope, receive, send):
+    # A per-caller body with a version ETag, as the profile routes send it.
+    caller = dict(scope["headers"]).get(b"authorization", b"")
+    body = b'{"details": "' + caller * 200 + b'"}'
+
+    async def respond():
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+                                (b"etag", b'"1"'), (b"vary", b"Authorization")]})
+        await send({"type": "http.response.body", "body": body})
+
+    return respond()
+
+
+def get(middleware, token: bytes) -> tuple:
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/user", "query_string": b"",
+             "headers": [(b"accept-encoding", b"gzip"), (b"authorization", b"Bearer " + token)]}
+    asyncio.run(middleware(scope, None, send))
+    return dict(messages[0]["headers"]), gzip.decompress(messages[1]["body"])
+
+
+def test_cached_bodies_are_kept_per_caller_without_their_tokens():
+    middleware = CompressionMiddleware(application, minimum_size=0, cache_bytes=1024 * 1024)
+
+    for _ in range(2):
+        for token in (b"token-a", b"token-b"):
+            headers, body = get(middleware, token)
+            assert body.count(token) == 200
+            assert headers[b"etag"] == b'W/"1"'
+            assert headers[b"vary"] == b"Authorization, Accept-Encoding"
+
+    stats = middleware.cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 2, 2)
+    assert not any(b"token" in repr(key).encode() for key in middleware.cache._entries)
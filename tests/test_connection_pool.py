@@ -0,0 +1,184 @@
+import threading
+import time
+
+import pytest
+
+from framework.services.data_access.ConnectionPool import ConnectionPool, PoolClosedError, PoolTimeoutError
+
+
+class FakeConnection:
+    def __init__(self, factory):
+        self.factory = factory
+        self.open = True
+
+    def close(self):
+        self.open = False
+        self.factory.closed()
+
+
+class FakeFactory:
+    """
+    Creates FakeConnections and tracks how many are open at once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.live = 0
+        self.peak = 0
+        self.created = 0
+
+    def __call__(self):
+        with self._lock:
+            self.live += 1
+            self.created += 1
+            self.peak = max(self.peak, self.live)
+        return FakeConnection(self)
+
+    def closed(self):
+        with self._lock:
+            self.live -= 1
+
+
+def test_max_size_is_enforced_under_concurrency():
+    factory = FakeFactory()
+    # A slow health check widens the window between taking an idle connection and handing it out.
+    pool = ConnectionPool(factory, max_size=2, checkout_timeout=5,
+                          health_check=lambda connection: time.sleep(0.01))
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(10):
+                with pool.connection():
+                    assert pool.stats()["size"] <= 2
+                    time.sleep(0.001)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert factory.peak <= 2
+    stats = pool.stats()
+    assert stats["size"] <= 2
+    assert stats["in_use"] == 0
+    assert stats["checkouts"] == 80
+
+
+def test_acquire_times_out_when_pool_is_exhausted():
+    pool = ConnectionPool(FakeFactory(), max_size=1)
+    connection = pool.acquire()
+
+    started = time.monotonic()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire(timeout=0.05)
+    assert time.monotonic() - started >= 0.05
+    assert pool.stats()["timeouts"] == 1
+
+    pool.release(connection)
+    assert pool.acquire(timeout=0.05) is connection
+
+
+def test_failed_health_check_frees_the_slot():
+    factory = FakeFactory()
+    healthy = threading.Event()
+    pool = ConnectionPool(factory, max_size=1, health_check=lambda connection: healthy.is_set())
+    stale = pool.acquire()
+    pool.release(stale)
+
+    # The idle connection fails its check, so it is closed and a new one takes its slot.
+    connection = pool.acquire(timeout=0.5)
+    assert connection is not stale
+    assert not stale.open
+    stats = pool.stats()
+    assert stats["failed_health_checks"] == 1
+    assert (stats["size"], stats["in_use"], stats["idle"]) == (1, 1, 0)
+    pool.release(connection)
+
+
+def test_idle_connections_are_evicted_outside_the_lock():
+    factory = FakeFactory()
+    pool = None
+    lock_free_on_close = []
+
+    def closer(connection):
+        acquired = pool._lock.acquire(blocking=False)
+        if acquired:
+            pool._lock.release()
+        lock_free_on_close.append(acquired)
+        connection.close()
+
+    pool = ConnectionPool(factory, max_size=2, idle_timeout=0.05, closer=closer)
+    pool.release(pool.acquire())
+    time.sleep(0.1)
+
+    connection = pool.acquire()
+    stats = pool.stats()
+    assert stats["evicted_idle"] == 1
+    assert stats["destroyed"] == 1
+    assert factory.created == 2
+    assert lock_free_on_close == [True]
+    pool.release(connection)
+
+
+def test_idle_eviction_keeps_min_size():
+    factory = FakeFactory()
+    pool = ConnectionPool(factory, min_size=1, max_size=2, idle_timeout=0.05)
+    assert pool.stats()["idle"] == 1
+
+    time.sleep(0.1)
+    connection = pool.acquire()
+    assert pool.stats()["evicted_idle"] == 0
+    assert factory.created == 1
+    pool.release(connection)
+
+
+def test_connections_are_retired_after_their_lifetime():
+    factory = FakeFactory()
+    pool = ConnectionPool(factory, max_size=2, max_lifetime=0.05)
+
+    # Retired when given back after its lifetime...
+    connection = pool.acquire()
+    time.sleep(0.1)
+    pool.release(connection)
+    assert not connection.open
+    assert pool.stats()["evicted_lifetime"] == 1
+
+    # ...and when it expires while idle.
+    connection = pool.acquire()
+    pool.release(connection)
+    time.sleep(0.1)
+    assert pool.acquire() is not connection
+    assert not connection.open
+    assert pool.stats()["evicted_lifetime"] == 2
+
+
+def test_stats_and_close():
+    factory = FakeFactory()
+    pool = ConnectionPool(factory, min_size=1, max_size=3)
+    first = pool.acquire()
+    second = pool.acquire()
+
+    stats = pool.stats()
+    assert stats["in_use"] == 2
+    assert stats["idle"] == 0
+    assert stats["size"] == 2
+    assert stats["created"] == 2
+    assert stats["checkouts"] == 2
+    assert (stats["min_size"], stats["max_size"], stats["closed"]) == (1, 3, False)
+
+    pool.release(first)
+    pool.close()
+    assert pool.stats()["closed"] is True
+    assert not first.open
+    with pytest.raises(PoolClosedError):
+        pool.acquire()
+
+    # Connections still checked out are closed when they come back.
+    pool.release(second)
+    assert not second.open
+    assert factory.live == 0
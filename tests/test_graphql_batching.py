@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from starlette.requests import Request
+
+from app.resources.user_resource import AsyncUserResource
+from app.routers.usergql import create_resource_loader, schema
+from app.services.service_factory import ServiceFactory
+from app.utils.utils import generate_custom_jwt, get_jwt_secret_key
+from benchmarks.fake_data_service import FakeDataService
+from framework.resources.cached_resource import CachedResource
+from framework.services.cache.memory_cache import InMemoryTTLCache
+
+ALIASES = 20
+
+
+@pytest.fixture
+def data_service(monkeypatch):
+    monkeypatch.setenv("JWT_SECRET_KEY", "test-secret")
+    get_jwt_secret_key.cache_clear()
+
+    service = FakeDataService({"latency": 0})
+    service.seed("USER", "user_tab", "UID", [
+        {"UID": f"u{i}", "Email": f"user{i}@example.com", "Name": "Jane", "Pic_URL": "https://example.com/p.png",
+         "PhoneNo": "+1234567890", "Address": "123 Main St", "Age": 30}
+        for i in range(ALIASES)
+    ])
+    monkeypatch.setitem(ServiceFactory._registry, "AsyncUserResourceDataService",
+                        {"builder": lambda: service, "on_startup": None, "on_shutdown": None, "eager": False})
+    monkeypatch.setitem(ServiceFactory._instances, "AsyncUserResourceDataService", service)
+
+    calls = {"get_data_object": 0, "get_data_objects": 0}
+    for name in calls:
+        method = getattr(service, name)
+
+        def counted(*args, _method=method, _name=name, **kwargs):
+            calls[_name] += 1
+            return _method(*args, **kwargs)
+
+        monkeypatch.setattr(service, name, counted)
+    service.calls = calls
+
+    yield service
+    get_jwt_secret_key.cache_clear()
+
+
+def execute(resource) -> dict:
+    # Every alias looks up a different user, plus a repeated key and one that does not exist.
+    uids = [f"u{i}" for i in range(ALIASES)] + ["u0", "missing"]
+    document = "{ " + " ".join(
+        f'a{index}: getUserById(uid: "{uid}") {{ ... on UserType {{ UID }} ... on ErrorResponse {{ code }} }}'
+        for index, uid in enumerate(uids)
+    ) + " }"
+
+    token = generate_custom_jwt({"email": "org@example.com", "name": "Org", "picture": "p"}, "organiser")
+    request = Request({"type": "http", "headers": [(b"authorization", f"Bearer {token}".encode())]})
+    context = {"request": request, "user_loader": create_resource_loader(resource),
+               "organiser_loader": create_resource_loader(resource)}
+
+    result = asyncio.run(schema.execute(document, context_value=context))
+    assert result.errors is None
+    assert result.data[f"a{ALIASES}"] == {"UID": "u0"}
+    assert result.data[f"a{ALIASES + 1}"] == {"code": 404}
+    assert [result.data[f"a{i}"]["UID"] for i in range(ALIASES)] == uids[:ALIASES]
+    return result.data
+
+
+def test_aliases_are_fetched_with_one_query_without_cache(data_service):
+    resource = AsyncUserResource(None)
+
+    execute(resource)
+
+    assert data_service.calls == {"get_data_object": 0, "get_data_objects": 1}
+
+
+def test_aliases_are_fetched_with_one_query_with_cache(data_service):
+    resource = CachedResource(AsyncUserResource(None), InMemoryTTLCache(context={"ttl": 60}))
+
+    execute(resource)
+    assert data_service.calls == {"get_data_object": 0, "get_data_objects": 1}
+
+    # Found users are now cached; only the missing one is looked up again, in one query.
+    execute(resource)
+    assert data_service.calls == {"get_data_object": 0, "get_data_objects": 2}
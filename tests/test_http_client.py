@@ -0,0 +1,203 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from framework.services import http_client
+from framework.services.http_client import CircuitOpenError, ResilientHttpClient
+
+URL = "https://oauth2.example.com/token"
+
+
+class Endpoint:
+    """
+    A stub host behind httpx.MockTransport. Answers with `responses` in turn, the
+    last one for every further request, and counts the requests it gets.
+    """
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = 0
+
+    def __call__(self, request: httpx.Request):
+        self.requests += 1
+        response = self.responses[0] if len(self.responses) == 1 else self.responses.pop(0)
+        if isinstance(response, int):
+            return httpx.Response(response)
+        return response
+
+
+def create_client(endpoint, **kwargs) -> ResilientHttpClient:
+    kwargs.setdefault("backoff", 0.001)
+    return ResilientHttpClient(transport=httpx.MockTransport(endpoint), **kwargs)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """
+    Records the retry delays instead of waiting for them.
+    """
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(http_client.asyncio, "sleep", sleep)
+    return delays
+
+
+def test_retries_502_and_503(sleeps):
+    endpoint = Endpoint(502, 503, 200)
+    client = create_client(endpoint, retries=2)
+
+    response = asyncio.run(client.get(URL))
+
+    assert response.status_code == 200
+    assert endpoint.requests == 3
+    assert len(sleeps) == 2
+    assert client.stats()["retries"] == 2
+
+
+def test_gives_up_after_the_last_retry(sleeps):
+    endpoint = Endpoint(503)
+    client = create_client(endpoint, retries=2)
+
+    assert asyncio.run(client.get(URL)).status_code == 503
+    assert endpoint.requests == 3
+
+
+def test_client_errors_are_not_retried(sleeps):
+    endpoint = Endpoint(400)
+    client = create_client(endpoint, retries=2)
+
+    assert asyncio.run(client.get(URL)).status_code == 400
+    assert endpoint.requests == 1
+    assert sleeps == []
+
+
+def test_retry_after_is_honoured_up_to_max_backoff(sleeps):
+    endpoint = Endpoint(httpx.Response(429, headers={"Retry-After": "1"}),
+                        httpx.Response(503, headers={"Retry-After": "120"}),
+                        200)
+    client = create_client(endpoint, retries=2, max_backoff=5)
+
+    assert asyncio.run(client.get(URL)).status_code == 200
+    assert sleeps == [1.0, 5.0]
+
+
+def test_circuit_opens_at_the_failure_threshold(sleeps):
+    endpoint = Endpoint(500)
+    client = create_client(endpoint, retries=0, failure_threshold=3)
+
+    async def scenario():
+        for _ in range(3):
+            assert (await client.get(URL)).status_code == 500
+        with pytest.raises(CircuitOpenError):
+            await client.get(URL)
+
+    asyncio.run(scenario())
+    assert endpoint.requests == 3
+    assert client.stats()["rejected"] == 1
+    assert client.stats()["circuits"] == {"oauth2.example.com": "open"}
+
+
+def test_transport_errors_open_the_circuit(sleeps):
+    def unreachable(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    client = ResilientHttpClient(transport=httpx.MockTransport(unreachable), retries=5, failure_threshold=2)
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(client.get(URL))
+    # The retry loop stops once the circuit has opened.
+    assert client.stats()["requests"] == 2
+    assert client.breaker(URL).state == "open"
+
+
+def open_circuit(client: ResilientHttpClient):
+    breaker = client.breaker(URL)
+    for _ in range(client.failure_threshold):
+        breaker.record_failure()
+    assert breaker.state == "open"
+    time.sleep(client.reset_timeout)
+    return breaker
+
+
+def test_successful_half_open_trial_closes_the_circuit():
+    endpoint = Endpoint(200)
+    client = create_client(endpoint, retries=0, failure_threshold=2, reset_timeout=0.01)
+    breaker = open_circuit(client)
+
+    assert asyncio.run(client.get(URL)).status_code == 200
+    assert breaker.state == "closed"
+
+
+def test_failed_half_open_trial_opens_the_circuit_again():
+    endpoint = Endpoint(500)
+    client = create_client(endpoint, retries=0, failure_threshold=2, reset_timeout=0.01)
+    breaker = open_circuit(client)
+
+    async def scenario():
+        assert (await client.get(URL)).status_code == 500
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            await client.get(URL)
+
+    asyncio.run(scenario())
+    assert endpoint.requests == 1
+
+
+def hanging_endpoint(hangs: int):
+    """
+    A stub host that never answers its first `hangs` requests, and then answers 200.
+    """
+    requests = []
+
+    async def handler(request):
+        requests.append(request)
+        if len(requests) <= hangs:
+            await asyncio.Event().wait()
+        return httpx.Response(200)
+
+    return handler, requests
+
+
+def test_cancelled_trial_is_released_without_a_failure():
+    handler, requests = hanging_endpoint(hangs=1)
+    client = ResilientHttpClient(transport=httpx.MockTransport(handler), retries=0, failure_threshold=2,
+                                 reset_timeout=0.01)
+    breaker = open_circuit(client)
+
+    async def scenario():
+        trial = asyncio.ensure_future(client.get(URL))
+        await asyncio.sleep(0.01)
+        assert breaker.state == "half-open"
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+        # The next call is let through as the trial instead of being rejected.
+        assert (await client.get(URL)).status_code == 200
+
+    asyncio.run(scenario())
+    assert len(requests) == 2
+    assert breaker.state == "closed"
+
+
+def test_cancellations_do_not_open_the_circuit():
+    handler, requests = hanging_endpoint(hangs=5)
+    client = ResilientHttpClient(transport=httpx.MockTransport(handler), retries=0, failure_threshold=2)
+
+    async def scenario():
+        for _ in range(5):
+            call = asyncio.ensure_future(client.get(URL))
+            await asyncio.sleep(0)
+            call.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await call
+
+    asyncio.run(scenario())
+    assert len(requests) == 5
+    assert client.breaker(URL).state == "closed"
+    assert client.stats()["failures"] == 0
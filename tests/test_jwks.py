@@ -0,0 +1,100 @@
+import asyncio
+import functools
+
+import httpx
+import pytest
+
+from app.utils.jwks import JWKSCache, fetch_jwks
+from framework.services.http_client import ResilientHttpClient
+
+CERTS_URL = "https://certs.example.com/oauth2/v3/certs"
+
+
+class CertsEndpoint:
+    """
+    A stub JWKS endpoint behind httpx.MockTransport that counts its requests.
+    """
+
+    def __init__(self, kids):
+        self.kids = list(kids)
+        self.status = 200
+        self.requests = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.status != 200:
+            return httpx.Response(self.status)
+        return httpx.Response(200, headers={"Cache-Control": "public, max-age=600"},
+                              json={"keys": [{"kid": kid, "kty": "RSA", "n": "n", "e": "AQAB"} for kid in self.kids]})
+
+
+def create_cache(endpoint: CertsEndpoint, **kwargs) -> JWKSCache:
+    client = ResilientHttpClient(retries=0, transport=httpx.MockTransport(endpoint))
+    return JWKSCache(CERTS_URL, functools.partial(fetch_jwks, client=client), **kwargs)
+
+
+def test_unknown_kid_triggers_exactly_one_refetch():
+    endpoint = CertsEndpoint(["a"])
+    cache = create_cache(endpoint, min_refetch_interval=0)
+
+    async def scenario():
+        assert (await cache.get_key("a"))["kid"] == "a"
+        assert endpoint.requests == 1
+
+        # The keys were rotated: concurrent lookups of the new kid share one refetch.
+        endpoint.kids = ["a", "b"]
+        keys = await asyncio.gather(*(cache.get_key("b") for _ in range(10)))
+        assert [key["kid"] for key in keys] == ["b"] * 10
+        assert endpoint.requests == 2
+
+        assert (await cache.get_key("b"))["kid"] == "b"
+        assert endpoint.requests == 2
+
+    asyncio.run(scenario())
+    assert cache.stats()["fetches"] == 2
+
+
+def test_unknown_kid_refetch_is_rate_limited():
+    endpoint = CertsEndpoint(["a"])
+    cache = create_cache(endpoint, min_refetch_interval=30)
+
+    async def scenario():
+        await cache.get_key("a")
+        assert await cache.get_key("forged") is None
+        assert await cache.get_key("forged") is None
+
+    asyncio.run(scenario())
+    assert endpoint.requests == 1
+
+
+def test_failed_fetch_is_shared_by_waiters():
+    endpoint = CertsEndpoint(["a"])
+    endpoint.status = 500
+    cache = create_cache(endpoint, negative_ttl=60)
+
+    async def scenario():
+        results = await asyncio.gather(*(cache.get_key("a") for _ in range(10)), return_exceptions=True)
+        assert all(isinstance(result, httpx.HTTPStatusError) for result in results)
+        # Within the negative TTL the failure is re-raised without another fetch.
+        with pytest.raises(httpx.HTTPStatusError):
+            await cache.get_key("a")
+
+    asyncio.run(scenario())
+    assert endpoint.requests == 1
+    assert cache.stats()["fetch_errors"] == 1
+
+
+def test_stale_keys_are_served_when_refresh_fails():
+    endpoint = CertsEndpoint(["a"])
+    cache = create_cache(endpoint)
+
+    async def scenario():
+        await cache.get_key("a")
+        endpoint.status = 503
+        cache._expires_at = 0.0
+        assert (await cache.get_key("a"))["kid"] == "a"
+        assert (await cache.get_key("a"))["kid"] == "a"
+
+    asyncio.run(scenario())
+    assert endpoint.requests == 2
+    assert cache.stats()["stale_served"] == 1
@@ -0,0 +1,65 @@
+import pytest
+
+from app.services.schema import TABLES, SchemaManager, SchemaVerificationError
+from framework.services.data_access.MySqlRdbDataService import MySqlRdbDataService
+
+
+class FakeCursor:
+    """
+    Answers every EXPLAIN with `plan`, after checking that the arguments fill the
+    statement's placeholders the way pymysql would.
+    """
+
+    def __init__(self, executed: list, plan: dict):
+        self.executed = executed
+        self.plan = plan
+
+    def execute(self, sql_statement, args=None):
+        assert sql_statement.startswith("EXPLAIN ")
+        assert sql_statement.count("%s") == len(args)
+        self.executed.append((sql_statement, list(args)))
+
+    def fetchall(self):
+        return [self.plan]
+
+
+class FakeConnection:
+    def __init__(self, executed: list, plan: dict):
+        self.executed = executed
+        self.plan = plan
+
+    def cursor(self):
+        return FakeCursor(self.executed, self.plan)
+
+    def ping(self, reconnect=False):
+        pass
+
+    def close(self):
+        pass
+
+
+def create_manager(monkeypatch, plan: dict, policy: str = "warn"):
+    executed = []
+    monkeypatch.setattr(MySqlRdbDataService, "_create_connection", lambda self: FakeConnection(executed, plan))
+    data_service = MySqlRdbDataService({"host": "localhost", "port": 3306, "user": "test", "password": "test"})
+    return SchemaManager(data_service, policy=policy), executed
+
+
+def test_verify_explains_every_lookup(monkeypatch):
+    manager, executed = create_manager(monkeypatch, {"type": "const", "key": "PRIMARY"})
+
+    report = manager.verify()
+
+    # By key, by Email, by many keys and a keyset page, for each table.
+    assert len(report) == len(executed) == 4 * len(TABLES)
+    assert not any(entry["scan"] for entry in report)
+    in_lists = [args for sql_statement, args in executed if " IN (" in sql_statement]
+    assert in_lists == [["probe-1", "probe-2"]] * len(TABLES)
+
+
+def test_run_fails_on_a_table_scan_with_the_fail_policy(monkeypatch):
+    manager, _ = create_manager(monkeypatch, {"type": "ALL", "key": None}, policy="fail")
+
+    with pytest.raises(SchemaVerificationError):
+        manager.run()
+    assert all(entry["scan"] for entry in manager.report)